@@ -0,0 +1,71 @@
+"""Benchmark restart time of the durable presentation store.
+
+Usage::
+
+    python -m benchmarks.bench_durable [SIZE ...]
+
+For each catalogue size the store is filled, snapshotted, then given a log
+tail of ``TAIL`` further writes. Reopening loads the snapshot and replays
+only that tail; the replay-only column shows what reopening costs without
+a snapshot.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.bench_store import build_store
+from ppt_wrapper.durable_store import DurablePresentationStore
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+TAIL = 1_000
+
+
+def _fill(directory: str, size: int, snapshot: bool) -> None:
+    store = DurablePresentationStore(directory, sync="none", snapshot_every=0)
+    for record in build_store(size):
+        store.add(dict(record))
+    if snapshot:
+        store.snapshot()
+    for n in range(TAIL):
+        store.update(f"ppt_{n % size + 1:07d}", {"status": "completed"})
+    store.close()
+
+
+def _reopen_ms(directory: str) -> float:
+    start = time.perf_counter()
+    store = DurablePresentationStore(directory, sync="none", snapshot_every=0)
+    elapsed = (time.perf_counter() - start) * 1000
+    store.close()
+    return elapsed
+
+
+def bench_size(size: int) -> Dict[str, float]:
+    """Time reopening a store of ``size`` records with and without a snapshot."""
+    results: Dict[str, float] = {"size": size}
+    for label, snapshot in (("snapshot_ms", True), ("replay_ms", False)):
+        directory = tempfile.mkdtemp(prefix="bench_durable_")
+        try:
+            _fill(directory, size, snapshot)
+            results[label] = _reopen_ms(directory)
+        finally:
+            shutil.rmtree(directory)
+    return results
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmark for each requested size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(f"{'records':>10} {'snapshot+tail ms':>17} {'replay-only ms':>15}")
+    for size in sizes:
+        result = bench_size(size)
+        print(
+            f"{result['size']:>10} {result['snapshot_ms']:>17.1f} "
+            f"{result['replay_ms']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
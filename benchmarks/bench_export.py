@@ -0,0 +1,74 @@
+"""Benchmark ``.pptx`` export as decks grow.
+
+Usage::
+
+    python -m benchmarks.bench_export [SLIDES ...]
+
+Exports a deck of ``SLIDES`` generated slides three times through a
+``PPTXExporter``: cold (every slide rendered), warm (every slide part
+cached) and after editing one slide (one part re-rendered). Reports the
+time of each export and the size of the package.
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from gen_ai_gateway.src.export import PPTXExporter
+from ppt_wrapper import PPTWrapper
+
+DEFAULT_SIZES = [10, 50, 200]
+WORKERS = 2
+
+
+async def _export(exporter: PPTXExporter, presentation: Dict[str, Any], slides: List[Any]):
+    start = time.perf_counter()
+    size = 0
+    async for chunk in exporter.export(presentation, slides):
+        size += len(chunk)
+    return (time.perf_counter() - start) * 1000, size
+
+
+async def bench_size(exporter: PPTXExporter, count: int) -> Dict[str, float]:
+    """Time cold, warm and edited exports of a ``count``-slide deck."""
+    wrapper = PPTWrapper()
+    presentation = wrapper.get_presentation_by_id("ppt_001")
+    slides = [wrapper.generate_slide_content(f"Topic {count}-{n}") for n in range(count)]
+    cold_ms, size = await _export(exporter, presentation, slides)
+    warm_ms, _ = await _export(exporter, presentation, slides)
+    slides[0] = dict(slides[0], title="Edited")
+    edited_ms, _ = await _export(exporter, presentation, slides)
+    return {
+        "slides": count,
+        "cold_ms": cold_ms,
+        "warm_ms": warm_ms,
+        "edited_ms": edited_ms,
+        "kb": size / 1024,
+    }
+
+
+async def run(sizes: List[int]) -> None:
+    """Run the benchmark for each size and print a table."""
+    exporter = PPTXExporter(workers=WORKERS)
+    # Start the worker processes before timing anything.
+    await _export(exporter, PPTWrapper().get_presentation_by_id("ppt_002"), [])
+    print(f"{'slides':>7} {'cold ms':>8} {'warm ms':>8} {'edited ms':>10} {'KB':>8}")
+    try:
+        for count in sizes:
+            result = await bench_size(exporter, count)
+            print(
+                f"{result['slides']:>7} {result['cold_ms']:>8.1f} {result['warm_ms']:>8.1f} "
+                f"{result['edited_ms']:>10.1f} {result['kb']:>8.1f}"
+            )
+    finally:
+        exporter.close()
+
+
+def main(argv: List[str]) -> None:
+    """Parse slide counts from ``argv`` and run the benchmark."""
+    asyncio.run(run([int(arg) for arg in argv] or DEFAULT_SIZES))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
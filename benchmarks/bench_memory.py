@@ -0,0 +1,99 @@
+"""Benchmark the memory taken per presentation by the in-memory store.
+
+Usage::
+
+    python -m benchmarks.bench_memory [SIZE ...]
+
+Builds ``SIZE`` presentations shaped like the mock catalogue (title,
+author, status, template, timestamps and nested content), as freshly
+decoded JSON would produce them, and reports the bytes allocated per
+presentation for:
+
+* plain dict records held in a dict by ID, the layout the store used
+  before compact rows;
+* a complete ``InMemoryPresentationStore``, including its ID map and
+  secondary indexes.
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+from ppt_wrapper.store import InMemoryPresentationStore
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+AUTHORS = 1_000
+TOPICS = [
+    "Machine Learning",
+    "Medical Imaging",
+    "Drug Discovery",
+    "Sustainability",
+    "Smart Infrastructure",
+    "Renewable Energy",
+    "Carbon Capture",
+    "Policy Changes",
+]
+AUDIENCES = ["Healthcare professionals", "Urban planners and engineers", "General audience"]
+
+
+def _fresh(text: str) -> str:
+    return (text + " ")[:-1]
+
+
+def records(size: int) -> Iterator[Dict[str, Any]]:
+    """Yield ``size`` records with unshared strings, as JSON decoding gives."""
+    for n in range(size):
+        yield {
+            "id": f"ppt_{n + 1:07d}",
+            "title": f"Presentation number {n}",
+            "author": f"Author {n % AUTHORS}",
+            "created_at": f"2024-01-{n % 28 + 1:02d}T10:30:00Z",
+            "slides_count": n % 40,
+            "status": "completed" if n % 3 else "draft",
+            "template_id": f"template_{n % 3 + 1:03d}",
+            "content": {
+                "summary": f"Overview of presentation {n}",
+                "key_topics": [_fresh(TOPICS[(n + k) % len(TOPICS)]) for k in range(3)],
+                "audience": _fresh(AUDIENCES[n % len(AUDIENCES)]),
+            },
+        }
+
+
+def _dict_records(size: int) -> Any:
+    return {record["id"]: record for record in records(size)}
+
+
+def _compact_store(size: int) -> Any:
+    store = InMemoryPresentationStore()
+    for record in records(size):
+        store.add(record)
+    return store
+
+
+def measure(build: Callable[[int], Any], size: int) -> float:
+    """Return the bytes per presentation retained by ``build(size)``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build(size)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del held
+    return used / size
+
+
+def main(argv: List[str]) -> None:
+    """Measure both layouts at each requested size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(f"{'records':>9} {'dict B/rec':>11} {'compact B/rec':>14} {'saving':>7}")
+    for size in sizes:
+        dicts = measure(_dict_records, size)
+        compact = measure(_compact_store, size)
+        print(f"{size:>9} {dicts:>11.0f} {compact:>14.0f} {1 - compact / dicts:>7.0%}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
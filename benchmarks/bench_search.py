@@ -0,0 +1,76 @@
+"""Benchmark full-text search as the catalogue grows.
+
+Usage::
+
+    python -m benchmarks.bench_search [SIZE ...]
+
+Indexes ``SIZE`` synthetic presentations whose words follow a Zipf-like
+distribution over a fixed vocabulary, then times a mix of one-, two- and
+three-term queries. Reports query latency percentiles, indexing throughput
+and the size of the posting arrays.
+"""
+
+import random
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.harness import summarize
+from ppt_wrapper.search import SearchIndex
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+VOCABULARY = 20_000
+QUERIES = 300
+
+
+def _words(rng: random.Random, count: int) -> str:
+    # Lower-numbered words are much more frequent, as in natural text.
+    return " ".join(f"w{int(VOCABULARY ** rng.random())}" for _ in range(count))
+
+
+def bench_size(size: int) -> Dict[str, float]:
+    """Index ``size`` presentations and time a query mix against them."""
+    rng = random.Random(size)
+    index = SearchIndex()
+    start = time.perf_counter()
+    for n in range(size):
+        index.index(
+            {
+                "id": f"ppt_{n + 1:07d}",
+                "title": _words(rng, 4),
+                "content": {"summary": _words(rng, 10), "key_topics": [_words(rng, 2)]},
+            }
+        )
+    index_seconds = time.perf_counter() - start
+
+    timings = []
+    for n in range(QUERIES):
+        query = _words(rng, n % 3 + 1)
+        start = time.perf_counter()
+        index.search(query, 10)
+        timings.append(time.perf_counter() - start)
+    summary = summarize(timings, sum(timings))
+    stats = index.stats()
+    return {
+        "size": size,
+        "docs_per_second": size / index_seconds,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "posting_mb": stats["posting_bytes"] / 1e6,
+    }
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmark for each requested size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(f"{'docs':>10} {'index docs/s':>13} {'p50 ms':>8} {'p99 ms':>8} {'postings MB':>12}")
+    for size in sizes:
+        result = bench_size(size)
+        print(
+            f"{result['size']:>10} {result['docs_per_second']:>13.0f} "
+            f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['posting_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+"""Benchmark semantic cache lookups as the number of cached topics grows.
+
+Usage::
+
+    python -m benchmarks.bench_semantic [SIZE ...]
+
+Fills a ``SemanticCache`` with ``SIZE`` synthetic topics, then looks up a
+mix of reordered copies of cached topics (which should hit) and unseen
+topics (which should miss). Reports lookup latency percentiles, the hit
+rate on each half of the mix and the size of the vector matrix.
+"""
+
+import random
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.harness import summarize
+from gen_ai_gateway.src.semantic import SemanticCache
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+LOOKUPS = 500
+WORDS = [f"{stem}{n}" for stem in ("alpha", "beta", "gamma", "delta") for n in range(500)]
+SCOPE = "bench:1:content"
+
+
+def _topic(rng: random.Random) -> List[str]:
+    return rng.sample(WORDS, 3)
+
+
+def bench_size(size: int) -> Dict[str, float]:
+    """Time lookups against a cache holding ``size`` topics."""
+    rng = random.Random(size)
+    cache = SemanticCache(threshold=0.9, max_entries=size)
+    topics = []
+    start = time.perf_counter()
+    for n in range(size):
+        words = _topic(rng)
+        topics.append(words)
+        cache.add(" ".join(words), SCOPE, {"n": n})
+    add_us = (time.perf_counter() - start) / size * 1e6
+
+    timings = []
+    repeat_hits = unseen_hits = 0
+    for n in range(LOOKUPS):
+        repeat = n % 2 == 0
+        words = list(rng.choice(topics)) if repeat else _topic(rng)
+        rng.shuffle(words)
+        start = time.perf_counter()
+        hit = cache.get(" ".join(words), SCOPE) is not None
+        timings.append(time.perf_counter() - start)
+        if repeat:
+            repeat_hits += hit
+        else:
+            unseen_hits += hit
+    summary = summarize(timings, sum(timings))
+    return {
+        "size": size,
+        "add_us": add_us,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "repeat_hit_rate": repeat_hits / (LOOKUPS // 2),
+        "unseen_hit_rate": unseen_hits / (LOOKUPS - LOOKUPS // 2),
+        "matrix_mb": size * cache.vectorizer.dimensions * 4 / 1e6,
+    }
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmark for each requested size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(
+        f"{'topics':>8} {'add us':>7} {'p50 ms':>7} {'p99 ms':>7} "
+        f"{'repeat hits':>12} {'unseen hits':>12} {'matrix MB':>10}"
+    )
+    for size in sizes:
+        result = bench_size(size)
+        print(
+            f"{result['size']:>8} {result['add_us']:>7.1f} {result['p50_ms']:>7.2f} "
+            f"{result['p99_ms']:>7.2f} {result['repeat_hit_rate']:>12.1%} "
+            f"{result['unseen_hit_rate']:>12.1%} {result['matrix_mb']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+"""Benchmark the per-presentation cost of serializing API responses.
+
+Usage::
+
+    python -m benchmarks.bench_serialization [PAGE_SIZE ...]
+
+Compares three ways of producing a ``/presentations`` page body:
+
+- ``response_model``: the previous handler path. Each record is built into
+  a ``PresentationResponse``, then FastAPI dumps, re-validates and encodes
+  the list again for ``response_model=List[PresentationResponse]``.
+- ``encoded cold``: the service's encoded JSON cache on first use, which
+  validates and serializes each record once.
+- ``encoded warm``: the same cache once every record version is encoded,
+  which only joins stored bytes.
+"""
+
+import json
+import sys
+import time
+from typing import Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from benchmarks.micro import build_wrapper
+from gen_ai_gateway.src.models import PresentationResponse
+from gen_ai_gateway.src.responses import EncodedRecordCache
+
+DEFAULT_PAGE_SIZES = [1, 100, 1000]
+ROUNDS = 50
+
+_page_adapter = TypeAdapter(List[PresentationResponse])
+
+
+def response_model_path(records: List[Dict]) -> bytes:
+    """Encode a page the way the handler and ``response_model`` used to."""
+    models = [PresentationResponse(**record) for record in records]
+    content = [model.model_dump() for model in models]
+    validated = _page_adapter.validate_python(content)
+    return json.dumps(_page_adapter.dump_python(validated, mode="json")).encode()
+
+
+def _per_record_us(fn: Callable[[], bytes], count: int, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / (rounds * count) * 1e6
+
+
+def bench_page(page_size: int) -> Dict[str, float]:
+    """Time each serialization path for one page size, per presentation."""
+    wrapper = build_wrapper(page_size)
+    records = wrapper.list_presentations(page_size)["items"]
+    count = len(records)
+    old_us = _per_record_us(lambda: response_model_path(records), count, ROUNDS)
+
+    cold_total = 0.0
+    for _ in range(ROUNDS):
+        cache = EncodedRecordCache(PresentationResponse, max_entries=page_size)
+        start = time.perf_counter()
+        cache.encode_many(records)
+        cold_total += time.perf_counter() - start
+    cold_us = cold_total / (ROUNDS * count) * 1e6
+
+    warm_us = _per_record_us(lambda: cache.encode_many(records), count, ROUNDS)
+    return {
+        "page_size": count,
+        "response_model_us": old_us,
+        "encoded_cold_us": cold_us,
+        "encoded_warm_us": warm_us,
+    }
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmark for each requested page size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_PAGE_SIZES
+    print("microseconds per presentation")
+    print(f"{'page':>6} {'response_model':>15} {'encoded cold':>13} {'encoded warm':>13}")
+    for size in sizes:
+        result = bench_page(size)
+        print(
+            f"{result['page_size']:>6} {result['response_model_us']:>15.2f} "
+            f"{result['encoded_cold_us']:>13.2f} {result['encoded_warm_us']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,100 @@
+"""Benchmark gateway cold start: import time and time to first request.
+
+Usage::
+
+    python -m benchmarks.bench_startup [RUNS]
+
+Each run starts a fresh interpreter. The import column times
+``import gen_ai_gateway.apps.main`` alone. The server columns start
+``run.py --production`` on a free port and time, from process launch, the
+first response of any kind (the port is listening), the first ``200`` from
+``GET /`` (the catalogue is loaded and warm) and the first ``200`` from
+``GET /presentations``. ``GATEWAY_*`` variables are passed through, so
+``GATEWAY_STORE=durable`` measures loading a durable catalogue.
+"""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import gen_ai_gateway.apps.main; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+TIMEOUT_SECONDS = 60.0
+
+
+def import_ms() -> float:
+    """Time importing the app module in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, check=True, text=True
+    )
+    return float(output.stdout.strip())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _first_status(client: httpx.Client, path: str) -> Optional[int]:
+    try:
+        return client.get(path).status_code
+    except httpx.TransportError:
+        return None
+
+
+def server_ms() -> Dict[str, float]:
+    """Start a production server and time its first responses."""
+    port = _free_port()
+    command = [
+        sys.executable, "run.py", "--production", "--host", "127.0.0.1", "--port", str(port)
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=dict(os.environ)
+    )
+    results: Dict[str, float] = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while "first_request_ms" not in results:
+                if time.perf_counter() - start > TIMEOUT_SECONDS:
+                    raise RuntimeError("Server did not become ready")
+                status = _first_status(client, "/")
+                now = (time.perf_counter() - start) * 1000
+                if status is not None:
+                    results.setdefault("listening_ms", now)
+                if status == 200:
+                    results.setdefault("ready_ms", now)
+                    if _first_status(client, "/presentations") == 200:
+                        results["first_request_ms"] = (time.perf_counter() - start) * 1000
+                else:
+                    time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+    return results
+
+
+def main(argv: List[str]) -> None:
+    """Run ``RUNS`` cold starts (default 5) and print the medians."""
+    runs = int(argv[0]) if argv else 5
+    imports = [import_ms() for _ in range(runs)]
+    servers = [server_ms() for _ in range(runs)]
+    print(f"{'phase':>18} {'median ms':>10} {'max ms':>8}")
+    print(f"{'import':>18} {statistics.median(imports):>10.1f} {max(imports):>8.1f}")
+    for phase in ("listening_ms", "ready_ms", "first_request_ms"):
+        values = [server[phase] for server in servers]
+        label = phase[: -len("_ms")]
+        print(f"{label:>18} {statistics.median(values):>10.1f} {max(values):>8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
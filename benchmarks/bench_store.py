@@ -0,0 +1,77 @@
+"""Benchmark presentation lookups as the catalogue grows.
+
+Usage::
+
+    python -m benchmarks.bench_store [SIZE ...]
+
+Point lookups through the ``id`` hash index and filtered listings through
+the secondary indexes should stay flat as the store grows from 1k to 1M
+records.
+"""
+
+import random
+import sys
+import time
+from typing import Dict, List
+
+from ppt_wrapper.store import InMemoryPresentationStore
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LOOKUPS = 100_000
+AUTHORS = 1_000
+
+
+def build_store(size: int) -> InMemoryPresentationStore:
+    """Build a store holding ``size`` lightweight presentation records."""
+    store = InMemoryPresentationStore()
+    for n in range(size):
+        store.add(
+            {
+                "id": f"ppt_{n + 1:07d}",
+                "title": f"Deck {n}",
+                "author": f"author_{n % AUTHORS}",
+                "status": "completed" if n % 3 else "draft",
+                "template_id": f"template_{n % 3 + 1:03d}",
+                "slides_count": n % 40,
+            }
+        )
+    return store
+
+
+def bench_size(size: int) -> Dict[str, float]:
+    """Time point lookups and an indexed filter at one catalogue size."""
+    store = build_store(size)
+    rng = random.Random(size)
+    ids = [f"ppt_{rng.randrange(size) + 1:07d}" for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    for presentation_id in ids:
+        store.get(presentation_id)
+    lookup_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+
+    start = time.perf_counter()
+    matches = store.find(author="author_7", status="draft")
+    find_us = (time.perf_counter() - start) * 1e6
+
+    return {
+        "size": size,
+        "lookup_ns": lookup_ns,
+        "find_us": find_us,
+        "find_matches": len(matches),
+    }
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmark for each requested size and print a table."""
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(f"{'records':>10} {'get ns/op':>10} {'find us':>10} {'matches':>8}")
+    for size in sizes:
+        result = bench_size(size)
+        print(
+            f"{result['size']:>10} {result['lookup_ns']:>10.0f} "
+            f"{result['find_us']:>10.1f} {result['find_matches']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
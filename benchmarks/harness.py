@@ -0,0 +1,82 @@
+"""Shared measurement helpers for the benchmark suite."""
+
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+# Metrics where a larger value is a regression; everything else is
+# treated as higher-is-better.
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms")
+HIGHER_IS_BETTER = ("rps",)
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize per-operation latencies (seconds) over a wall-clock window."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "rps": len(ordered) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """Call ``fn`` repeatedly and summarize the per-call latencies."""
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(iterations):
+        before = clock()
+        fn()
+        samples.append(clock() - before)
+    return summarize(samples, clock() - start)
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    min_delta_ms: float = 0.25,
+) -> List[str]:
+    """Return a description of every metric that regressed past ``tolerance``.
+
+    ``tolerance`` is relative: 1.0 allows latencies up to twice and
+    throughput down to half the baseline. Latency increases smaller than
+    ``min_delta_ms`` are ignored as timer noise.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if metric not in base or current[metric] - base[metric] < min_delta_ms:
+                continue
+            if current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.3f} > baseline {base[metric]:.3f}"
+                )
+        for metric in HIGHER_IS_BETTER:
+            if metric in base and current[metric] * (1 + tolerance) < base[metric]:
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.1f} < baseline {base[metric]:.1f}"
+                )
+    return regressions
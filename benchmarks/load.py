@@ -0,0 +1,254 @@
+"""In-process ASGI load generator covering every route of the gateway."""
+
+import asyncio
+import gc
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
+from fastapi.routing import APIRoute
+
+from benchmarks.harness import summarize
+
+Body = Optional[Callable[[int], Any]]
+
+
+@dataclass
+class Scenario:
+    """One request shape to drive against a route."""
+
+    name: str
+    method: str
+    route: str
+    path: str
+    body: Body = None
+    headers: Optional[Dict[str, str]] = None
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("health", "GET", "/", "/"),
+    Scenario("list_presentations", "GET", "/presentations", "/presentations?limit=100"),
+    Scenario(
+        "list_presentations_projected",
+        "GET",
+        "/presentations",
+        "/presentations?limit=100&fields=id,title,status",
+    ),
+    Scenario(
+        "search_presentations",
+        "GET",
+        "/presentations/search",
+        "/presentations/search?q=climate+energy&limit=10",
+    ),
+    Scenario(
+        "export_presentations",
+        "GET",
+        "/presentations/export",
+        "/presentations/export?status=completed",
+    ),
+    Scenario(
+        "get_presentation", "GET", "/presentations/{presentation_id}", "/presentations/ppt_001"
+    ),
+    Scenario(
+        "get_presentation_not_modified",
+        "GET",
+        "/presentations/{presentation_id}",
+        "/presentations/ppt_001",
+        headers={"If-None-Match": "{presentation_etag}"},
+    ),
+    Scenario(
+        "create_presentation",
+        "POST",
+        "/presentations",
+        "/presentations",
+        lambda n: {"title": f"Load {n}", "author": "Load Test", "template_id": "template_001"},
+    ),
+    Scenario(
+        "bulk_import_presentations",
+        "POST",
+        "/presentations/bulk",
+        "/presentations/bulk",
+        lambda n: b"".join(
+            b'{"title":"Bulk %d-%d","author":"Load Test"}\n' % (n, line) for line in range(100)
+        ),
+    ),
+    Scenario(
+        "populate_presentation",
+        "POST",
+        "/presentations/populate",
+        "/presentations/populate",
+        lambda n: {
+            "title": f"Populated {n}",
+            "author": "Load Test",
+            "template_id": "template_002",
+            "topics": [f"Topic {n % 50}"],
+        },
+    ),
+    Scenario(
+        "get_slides",
+        "GET",
+        "/presentations/{presentation_id}/slides",
+        "/presentations/{presentation_id}/slides",
+    ),
+    Scenario(
+        "export_pptx",
+        "GET",
+        "/presentations/{presentation_id}/export.pptx",
+        "/presentations/ppt_001/export.pptx",
+    ),
+    Scenario("get_job", "GET", "/jobs/{job_id}", "/jobs/{job_id}"),
+    Scenario(
+        "generate_cached",
+        "POST",
+        "/generate",
+        "/generate",
+        lambda n: {"topic": "Machine Learning", "slide_type": "content"},
+    ),
+    Scenario(
+        "generate_unique",
+        "POST",
+        "/generate",
+        "/generate",
+        lambda n: {"topic": f"Unique Topic {n}", "slide_type": "content"},
+    ),
+    Scenario(
+        "generate_stream",
+        "POST",
+        "/generate/stream",
+        "/generate/stream",
+        lambda n: {"topic": f"Streamed {n}"},
+    ),
+    Scenario(
+        "generate_batch",
+        "POST",
+        "/generate/batch",
+        "/generate/batch",
+        lambda n: {"template_id": "template_001", "topic": f"Batch {n}"},
+    ),
+    Scenario("templates", "GET", "/templates", "/templates"),
+    Scenario(
+        "templates_not_modified",
+        "GET",
+        "/templates",
+        "/templates",
+        headers={"If-None-Match": "{templates_etag}"},
+    ),
+    Scenario("cache_stats", "GET", "/cache/stats", "/cache/stats"),
+    Scenario("scheduler_stats", "GET", "/scheduler/stats", "/scheduler/stats"),
+    Scenario("stats", "GET", "/stats", "/stats"),
+    Scenario("metrics", "GET", "/metrics", "/metrics"),
+]
+
+
+def app_routes(app: Any) -> Set[Tuple[str, str]]:
+    """Return the ``(method, path)`` pairs of the app's API routes."""
+    docs = {app.openapi_url, app.docs_url, app.redoc_url}
+    return {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path not in docs
+        for method in route.methods
+    }
+
+
+def missing_routes(app: Any, scenarios: Sequence[Scenario] = SCENARIOS) -> List[str]:
+    """Return routes of ``app`` that no scenario exercises."""
+    covered = {(scenario.method, scenario.route) for scenario in scenarios}
+    return sorted(f"{method} {path}" for method, path in app_routes(app) - covered)
+
+
+async def _prepare(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Create the fixtures referenced by scenario paths."""
+    response = await client.post(
+        "/presentations/populate",
+        json={"title": "Fixture", "author": "Load Test", "template_id": "template_001"},
+    )
+    response.raise_for_status()
+    job = response.json()
+    presentation = await client.get("/presentations/ppt_001")
+    templates = await client.get("/templates")
+    return {
+        "job_id": job["id"],
+        "presentation_id": job["presentation_id"],
+        "presentation_etag": presentation.headers["etag"],
+        "templates_etag": templates.headers["etag"],
+    }
+
+
+def _body(body: Any) -> Dict[str, Any]:
+    """Send ``bytes`` bodies as they are and anything else as JSON."""
+    return {"content": body} if isinstance(body, bytes) else {"json": body}
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    path: str,
+    headers: Optional[Dict[str, str]],
+    concurrency: int,
+    requests: int,
+    warmup: int = 20,
+) -> Dict[str, float]:
+    for n in range(warmup):
+        await client.request(
+            scenario.method,
+            path,
+            headers=headers,
+            **_body(scenario.body(-n - 1) if scenario.body else None),
+        )
+    gc.collect()
+    samples: List[float] = []
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while issued < requests:
+            n = issued
+            issued += 1
+            body = scenario.body(n) if scenario.body else None
+            before = time.perf_counter()
+            response = await client.request(
+                scenario.method, path, headers=headers, **_body(body)
+            )
+            samples.append(time.perf_counter() - before)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f"{scenario.name}: {scenario.method} {path} -> {response.status_code}"
+                )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run_load_async(
+    app: Any, concurrency_levels: Sequence[int], requests: int
+) -> Dict[str, Dict[str, float]]:
+    """Drive every scenario at each concurrency level."""
+    missing = missing_routes(app)
+    if missing:
+        raise RuntimeError(f"Routes without a load scenario: {missing}")
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        fixtures = await _prepare(client)
+        for scenario in SCENARIOS:
+            path = scenario.path.format(**fixtures)
+            headers = None
+            if scenario.headers:
+                headers = {
+                    name: value.format(**fixtures) for name, value in scenario.headers.items()
+                }
+            for concurrency in concurrency_levels:
+                results[f"load/{scenario.name}@c{concurrency}"] = await _drive(
+                    client, scenario, path, headers, concurrency, requests
+                )
+    return results
+
+
+def run_load(
+    app: Any, concurrency_levels: Sequence[int], requests: int
+) -> Dict[str, Dict[str, float]]:
+    """Run the load generator to completion on a fresh event loop."""
+    return asyncio.run(run_load_async(app, concurrency_levels, requests))
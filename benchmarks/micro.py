@@ -0,0 +1,43 @@
+"""Micro-benchmarks of PPTWrapper methods and Pydantic model construction."""
+
+from typing import Dict, Sequence
+
+from benchmarks.harness import time_calls
+from gen_ai_gateway.src.models import GeneratedSlide, PresentationResponse
+from gen_ai_gateway.src.responses import EncodedRecordCache
+from ppt_wrapper import PPTWrapper
+
+
+def build_wrapper(size: int) -> PPTWrapper:
+    """Build a wrapper holding about ``size`` presentations."""
+    wrapper = PPTWrapper()
+    for n in range(size - len(wrapper.store)):
+        wrapper.create_presentation(f"Deck {n}", f"author_{n % 100}", "template_001")
+    return wrapper
+
+
+def run_micro(sizes: Sequence[int], iterations: int) -> Dict[str, Dict[str, float]]:
+    """Run every micro-benchmark at each catalogue size."""
+    results = {}
+    for size in sizes:
+        wrapper = build_wrapper(size)
+        presentation = wrapper.get_presentation_by_id("ppt_001")
+        slide = wrapper.generate_slide_content("Benchmarking", "content")
+        page = wrapper.list_presentations(100)["items"]
+        encoded = EncodedRecordCache(PresentationResponse)
+        cases = {
+            "get_presentation_by_id": lambda: wrapper.get_presentation_by_id("ppt_002"),
+            "list_presentations_100": lambda: wrapper.list_presentations(100),
+            "list_presentations_author": lambda: wrapper.list_presentations(
+                20, author="author_7"
+            ),
+            "get_presentation_stats": wrapper.get_presentation_stats,
+            "create_presentation": lambda: wrapper.create_presentation("New", "Bench"),
+            "generate_slide_content": lambda: wrapper.generate_slide_content("Bench"),
+            "model_presentation_response": lambda: PresentationResponse(**presentation),
+            "model_generated_slide": lambda: GeneratedSlide(**slide),
+            "encode_presentations_100": lambda: encoded.encode_many(page),
+        }
+        for name, fn in cases.items():
+            results[f"micro/{name}@{size}"] = time_calls(fn, iterations)
+    return results
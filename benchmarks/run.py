@@ -0,0 +1,109 @@
+"""Run the gateway benchmark suite and check it against a stored baseline.
+
+Usage::
+
+    python -m benchmarks.run [--quick] [--update-baseline] [--tolerance 1.0]
+
+Results are written as JSON to ``benchmarks/results/latest.json``. Any
+latency percentile or throughput figure that regresses past the tolerance
+relative to ``benchmarks/baseline.json`` makes the run exit non-zero.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmarks.harness import compare, peak_rss_mb
+from benchmarks.load import run_load
+from benchmarks.micro import run_micro
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "results", "latest.json")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer requests")
+    parser.add_argument("--sizes", type=int, nargs="+", help="catalogue sizes for micro-benchmarks")
+    parser.add_argument("--concurrency", type=int, nargs="+", help="load concurrency levels")
+    parser.add_argument("--requests", type=int, help="requests per load scenario and level")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.0)
+    return parser.parse_args(argv)
+
+
+def _print_table(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'benchmark':<58} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>11}")
+    for name, row in results.items():
+        print(
+            f"{name:<58} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+            f"{row['p99_ms']:>9.3f} {row['rps']:>11.1f}"
+        )
+
+
+def _write_json(path: str, data: Dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; return the process exit status."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    sizes = args.sizes or ([1_000, 10_000] if args.quick else [1_000, 10_000, 100_000])
+    concurrency = args.concurrency or ([1, 16] if args.quick else [1, 16, 64])
+    requests = args.requests or (100 if args.quick else 500)
+    iterations = 500 if args.quick else 2000
+
+    from gen_ai_gateway.apps.main import app
+
+    results = run_micro(sizes, iterations)
+    results.update(run_load(app, concurrency, requests))
+    report = {
+        "created_at": datetime.now().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+    _print_table(results)
+    print(f"\npeak RSS: {report['peak_rss_mb']:.1f} MiB")
+    _write_json(args.output, report)
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        _write_json(args.baseline, report)
+        print(f"baseline updated at {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline found; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if baseline.get("peak_rss_mb") and report["peak_rss_mb"] > baseline["peak_rss_mb"] * (
+        1 + args.tolerance
+    ):
+        regressions.append(
+            f"peak_rss_mb {report['peak_rss_mb']:.1f} > baseline {baseline['peak_rss_mb']:.1f}"
+        )
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nno regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
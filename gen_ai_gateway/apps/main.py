@@ -1,54 +1,311 @@
 """Main FastAPI application for Gen AI Gateway."""
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, List, Any, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from gen_ai_gateway.src.models import (
+    BatchGenerateRequest,
     PresentationResponse,
+    PresentationSearchHit,
     CreatePresentationRequest,
     GenerateContentRequest,
-    HealthResponse
+    HealthResponse,
+    JobResponse,
+    PopulatePresentationRequest,
+)
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.lifecycle import (
+    FAILED,
+    LOADING,
+    READY,
+    LazyService,
+    ServiceUnavailable,
+)
+from gen_ai_gateway.src.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsMiddleware,
+    MetricsRegistry,
 )
+from gen_ai_gateway.src.ratelimit import RateLimiter, RateLimitExceeded
+from gen_ai_gateway.src.responses import (
+    FastJSONResponse,
+    PreEncodedJSONResponse,
+    cached_json_response,
+)
+from gen_ai_gateway.src.scheduler import INTERACTIVE, SchedulerOverloaded
 from gen_ai_gateway.src.services import AIGatewayService
+from gen_ai_gateway.src.streaming import (
+    NDJSON_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    ClosingStreamingResponse,
+    RequestStreamingResponse,
+    encode_ndjson,
+    encode_sse,
+    wants_sse,
+)
+
+# Reading settings only parses environment variables. The rate limiter and
+# the service (and with it the presentation catalogue) open files and
+# databases, so the lifespan hook builds them in the background, or they
+# are built on first use without a lifespan.
+settings = GatewaySettings.from_env()
+metrics = MetricsRegistry()
+limiter_runtime: LazyService[RateLimiter] = LazyService(
+    lambda: RateLimiter.from_settings(settings, metrics=metrics)
+)
+runtime: LazyService[AIGatewayService] = LazyService(
+    lambda: AIGatewayService.from_settings(settings, metrics=metrics),
+    warm=lambda service: service.warm(settings.prewarm_presentations),
+    close=lambda service: service.close(),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start loading the service, and release it on shutdown.
+
+    The server accepts requests right away; ``GET /`` reports readiness and
+    other routes answer ``503`` until loading finishes. On shutdown, backend
+    connection pools are closed on the serving loop, then the service.
+    """
+    limiter_runtime.start()
+    runtime.start()
+    yield
+    if runtime.state == READY:
+        await runtime.get().aclose()
+    await run_in_threadpool(runtime.close)
+
 
 app = FastAPI(
     title="Gen AI Gateway",
     description="A FastAPI-based Gen AI Gateway service with PPT wrapper functionality",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 10
+PRESENTATION_FIELDS = frozenset(PresentationResponse.model_fields)
+# Presentations may change at any time: caches keep them but revalidate.
+PRESENTATION_CACHE_CONTROL = "public, no-cache"
+TEMPLATES_CACHE_CONTROL = f"public, max-age={settings.templates_max_age_seconds}"
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> Response:
+    """Reject a request over its rate limit or concurrency quota."""
+    return FastJSONResponse(
+        {"detail": exc.detail},
+        status_code=429,
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+@app.exception_handler(SchedulerOverloaded)
+async def scheduler_overloaded(request: Request, exc: SchedulerOverloaded) -> Response:
+    """Shed a generation the scheduler cannot start within its deadline."""
+    return FastJSONResponse(
+        {"detail": str(exc)},
+        status_code=503,
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+@app.exception_handler(ServiceUnavailable)
+async def service_unavailable(request: Request, exc: ServiceUnavailable) -> Response:
+    """Reject requests that arrive while the service is still loading."""
+    return FastJSONResponse(
+        {"detail": str(exc)},
+        status_code=503,
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+async def get_service() -> AIGatewayService:
+    """Return the gateway service, or raise ``ServiceUnavailable`` while it loads."""
+    return runtime.get()
+
 
-# Initialize the AI Gateway service
-ai_service = AIGatewayService()
+def _deadline(request: GenerateContentRequest) -> Optional[float]:
+    """Return a request's queueing deadline in seconds, if it sets one."""
+    return request.deadline_ms / 1000 if request.deadline_ms else None
+
+
+def _too_long(loc: Tuple[str, ...], length: int, limit: int) -> Dict[str, Any]:
+    """Describe an over-long list the way pydantic's ``max_length`` check does."""
+    return {
+        "type": "too_long",
+        "loc": loc,
+        "msg": f"List should have at most {limit} items after validation, not {length}",
+        "ctx": {"field_type": "List", "max_length": limit, "actual_length": length},
+    }
+
+
+async def admit_generation(request: Request) -> str:
+    """Apply the route's rate limit and return the client's limiter key."""
+    rate_limiter = limiter_runtime.get()
+    client = rate_limiter.client_key(
+        request.headers, request.client.host if request.client else None
+    )
+    await rate_limiter.check_async(request.scope["route"].path, client)
+    return client
 
 
 @app.get("/", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
-    """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        message="Gen AI Gateway is running",
-        version="1.0.0"
+async def health_check() -> Any:
+    """Health check endpoint that doubles as a readiness probe.
+
+    Answers ``503`` with ``status="starting"`` while the service loads in
+    the background and ``status="unavailable"`` if loading failed.
+    """
+    state = runtime.state
+    if state == LOADING:
+        health = HealthResponse(
+            status="starting",
+            message="Gen AI Gateway is loading",
+            version="1.0.0",
+            state=state,
+        )
+    elif state == FAILED:
+        health = HealthResponse(
+            status="unavailable",
+            message=f"Gen AI Gateway failed to start: {runtime.status()['error']}",
+            version="1.0.0",
+            state=state,
+        )
+    else:
+        return HealthResponse(
+            status="healthy",
+            message="Gen AI Gateway is running",
+            version="1.0.0",
+            state=state,
+        )
+    return FastJSONResponse(
+        health.model_dump(), status_code=503, headers={"Retry-After": "1"}
     )
 
 
 @app.get("/presentations", response_model=List[PresentationResponse])
-async def get_presentations() -> List[PresentationResponse]:
-    """Get all presentations."""
+async def get_presentations(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status: Optional[str] = None,
+    author: Optional[str] = None,
+    template_id: Optional[str] = None,
+    fields: Optional[str] = None,
+    ai_service: AIGatewayService = Depends(get_service),
+) -> Any:
+    """Get one page of presentations.
+
+    The cursor for the next page is returned in the ``X-Next-Cursor`` header
+    and as a ``Link: rel="next"`` URL. ``fields`` is a comma-separated
+    projection. Full records are served from the service's encoded JSON
+    cache; projected pages are encoded directly.
+    """
+    selected = None
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = sorted(set(selected) - PRESENTATION_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+    try:
+        page = await ai_service.call_store(
+            ai_service.list_presentations,
+            limit,
+            after,
+            selected,
+            status=status,
+            author=author,
+            template_id=template_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {}
+    if page["next_cursor"]:
+        next_url = request.url.include_query_params(after=page["next_cursor"])
+        headers["X-Next-Cursor"] = page["next_cursor"]
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    if selected is not None:
+        return FastJSONResponse(page["items"], headers=headers)
+    return PreEncodedJSONResponse(
+        ai_service.encode_presentations(page["items"]), headers=headers
+    )
+
+
+@app.get("/presentations/search", response_model=List[PresentationSearchHit])
+async def search_presentations(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_PAGE_SIZE),
+    ai_service: AIGatewayService = Depends(get_service),
+) -> Response:
+    """Search titles, summaries, key topics and generated slides.
+
+    Hits are ranked by BM25 relevance, best first.
+    """
     try:
-        presentations = ai_service.get_all_presentations()
-        return [PresentationResponse(**presentation) for presentation in presentations]
+        hits = await ai_service.call_store(ai_service.search_presentations, q, limit)
+        return PreEncodedJSONResponse(ai_service.encode_search_hits(hits))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/presentations/export", response_class=StreamingResponse)
+async def export_presentations(
+    status: Optional[str] = None,
+    author: Optional[str] = None,
+    template_id: Optional[str] = None,
+    ai_service: AIGatewayService = Depends(get_service),
+) -> StreamingResponse:
+    """Stream matching presentations as NDJSON, one presentation per line.
+
+    The output can be sent back to ``POST /presentations/bulk``.
+    """
+    lines = ai_service.export_presentations(
+        status=status, author=author, template_id=template_id
+    )
+    return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+
+
 @app.get("/presentations/{presentation_id}", response_model=PresentationResponse)
-async def get_presentation(presentation_id: str) -> PresentationResponse:
-    """Get a specific presentation by ID."""
+async def get_presentation(
+    presentation_id: str,
+    if_none_match: Optional[str] = Header(None),
+    ai_service: AIGatewayService = Depends(get_service),
+) -> Response:
+    """Get a specific presentation by ID.
+
+    Sends a strong ``ETag``; a matching ``If-None-Match`` gets a 304.
+    """
     try:
-        presentation = ai_service.get_presentation_by_id(presentation_id)
-        return PresentationResponse(**presentation)
+        entry = await ai_service.call_store(ai_service.get_presentation_resource, presentation_id)
+        return cached_json_response(
+            entry.body, entry.etag, PRESENTATION_CACHE_CONTROL, if_none_match
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -56,50 +313,267 @@ async def get_presentation(presentation_id: str) -> PresentationResponse:
 
 
 @app.post("/presentations", response_model=PresentationResponse)
-async def create_presentation(request: CreatePresentationRequest) -> PresentationResponse:
+async def create_presentation(
+    request: CreatePresentationRequest, ai_service: AIGatewayService = Depends(get_service)
+) -> Response:
     """Create a new presentation."""
     try:
-        presentation = ai_service.create_presentation(
+        presentation = await ai_service.create_presentation_async(
             title=request.title,
             author=request.author,
             template_id=request.template_id
         )
-        return PresentationResponse(**presentation)
+        return PreEncodedJSONResponse(ai_service.encode_presentation(presentation))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/presentations/bulk", response_class=RequestStreamingResponse)
+async def bulk_import_presentations(
+    request: Request, ai_service: AIGatewayService = Depends(get_service)
+) -> RequestStreamingResponse:
+    """Import presentations from an NDJSON request body.
+
+    Each line is a presentation with at least ``title`` and ``author``.
+    Lines are validated and inserted in batches while the body streams in.
+    The response streams one ``{"line", "id"}`` or ``{"line", "error"}``
+    result per line, then a ``{"summary": ...}`` line.
+    """
+    results = ai_service.import_presentations(request.stream())
+    return RequestStreamingResponse(encode_ndjson(results), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.post("/presentations/populate", response_model=JobResponse, status_code=202)
+async def populate_presentation(
+    request: PopulatePresentationRequest,
+    background_tasks: BackgroundTasks,
+    ai_service: AIGatewayService = Depends(get_service),
+) -> JobResponse:
+    """Create a presentation and generate its template slides in the background.
+
+    Returns the job right away; poll ``GET /jobs/{job_id}`` for completion.
+    """
+    try:
+        job = await ai_service.call_store(
+            ai_service.start_presentation_population,
+            title=request.title,
+            author=request.author,
+            template_id=request.template_id,
+            topics=request.topics,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(ai_service.populate_presentation, job["id"])
+    return JobResponse(**job)
+
+
+@app.get("/presentations/{presentation_id}/slides", response_model=List[Dict[str, Any]])
+async def get_presentation_slides(
+    presentation_id: str, ai_service: AIGatewayService = Depends(get_service)
+) -> Response:
+    """Get the generated slides of a presentation."""
+    try:
+        slides = await ai_service.call_store(ai_service.get_slides, presentation_id)
+        return FastJSONResponse(slides)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.get("/presentations/{presentation_id}/export.pptx", response_class=StreamingResponse)
+async def export_presentation(
+    presentation_id: str, ai_service: AIGatewayService = Depends(get_service)
+) -> StreamingResponse:
+    """Download a presentation and its generated slides as a PowerPoint file.
+
+    Slides follow the template's ``slides_included`` order. The package is
+    streamed as slide parts finish rendering.
+    """
+    try:
+        chunks = await ai_service.call_store(ai_service.export_presentation, presentation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    from ppt_wrapper.pptx import PPTX_MEDIA_TYPE
+
+    return StreamingResponse(
+        chunks,
+        media_type=PPTX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{presentation_id}.pptx"'},
+    )
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str, ai_service: AIGatewayService = Depends(get_service)
+) -> JobResponse:
+    """Get the status of a background job."""
+    try:
+        return JobResponse(**ai_service.get_job(job_id))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @app.post("/generate", response_model=Dict[str, Any])
-async def generate_content(request: GenerateContentRequest) -> Dict[str, Any]:
+async def generate_content(
+    request: GenerateContentRequest,
+    client: str = Depends(admit_generation),
+    ai_service: AIGatewayService = Depends(get_service),
+) -> Response:
     """Generate AI content for presentations."""
+    rate_limiter = limiter_runtime.get()
+    async with rate_limiter.slot("/generate", client):
+        try:
+            content = await ai_service.generate_slide_content_async(
+                topic=request.topic,
+                slide_type=request.slide_type,
+                deadline=_deadline(request),
+            )
+            return FastJSONResponse(content)
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/generate/stream")
+async def generate_content_stream(
+    request: GenerateContentRequest,
+    http_request: Request,
+    client: str = Depends(admit_generation),
+    ai_service: AIGatewayService = Depends(get_service),
+) -> StreamingResponse:
+    """Stream AI content as it is generated.
+
+    Returns server-sent events when the client accepts ``text/event-stream``
+    and newline-delimited JSON otherwise. Requests the scheduler would shed
+    are rejected with 503 before the stream starts.
+    """
+    deadline = _deadline(request)
+    ai_service.limiter.check_admission(INTERACTIVE, deadline)
+
+    async def events():
+        try:
+            async for event in ai_service.stream_slide_content(
+                topic=request.topic,
+                slide_type=request.slide_type,
+                deadline=deadline,
+            ):
+                yield event
+        except Exception as e:
+            yield {"event": "error", "data": {"detail": str(e)}}
+
+    # The slot is held until the response ends, however it ends.
+    rate_limiter = limiter_runtime.get()
+    lease = await rate_limiter.acquire_async("/generate/stream", client)
+    release = partial(rate_limiter.release_async, client, lease)
     try:
-        content = ai_service.generate_slide_content(
-            topic=request.topic,
-            slide_type=request.slide_type
+        if wants_sse(http_request.headers.get("accept", "")):
+            return ClosingStreamingResponse(
+                encode_sse(events()),
+                release,
+                media_type=SSE_MEDIA_TYPE,
+                headers={"Cache-Control": "no-cache"},
+            )
+        return ClosingStreamingResponse(
+            encode_ndjson(events()), release, media_type=NDJSON_MEDIA_TYPE
         )
-        return content
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    except BaseException:
+        await release()
+        raise
+
+
+@app.post("/generate/batch", response_model=List[Dict[str, Any]])
+async def generate_content_batch(
+    request: BatchGenerateRequest,
+    client: str = Depends(admit_generation),
+    ai_service: AIGatewayService = Depends(get_service),
+) -> Any:
+    """Generate several slides concurrently.
+
+    Returns the slides in request order, or with ``stream`` set, an NDJSON
+    stream of ``{"index", "result"}`` / ``{"index", "error"}`` lines in
+    completion order. Request lists longer than ``batch_max_requests`` are
+    rejected with the same 422 body as other validation errors.
+    """
+    limit = settings.batch_max_requests
+    if request.requests is not None and len(request.requests) > limit:
+        error = _too_long(("body", "requests"), len(request.requests), limit)
+        raise RequestValidationError([error])
+    if request.template_id is not None:
+        try:
+            template = ai_service.get_template_by_id(request.template_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        slides = [(request.topic, slide_type) for slide_type in template["slides_included"]]
+    else:
+        slides = [(item.topic, item.slide_type) for item in request.requests]
+
+    rate_limiter = limiter_runtime.get()
+    if request.stream:
+        lease = await rate_limiter.acquire_async("/generate/batch", client)
+        release = partial(rate_limiter.release_async, client, lease)
+        try:
+            results = ai_service.stream_batch_async(slides, request.max_parallelism)
+            return ClosingStreamingResponse(
+                encode_ndjson(results), release, media_type=NDJSON_MEDIA_TYPE
+            )
+        except BaseException:
+            await release()
+            raise
+    async with rate_limiter.slot("/generate/batch", client):
+        try:
+            slides = await ai_service.generate_batch_async(slides, request.max_parallelism)
+            return FastJSONResponse(slides)
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/templates", response_model=List[Dict[str, Any]])
-async def get_templates() -> List[Dict[str, Any]]:
-    """Get all available presentation templates."""
+async def get_templates(
+    if_none_match: Optional[str] = Header(None), ai_service: AIGatewayService = Depends(get_service)
+) -> Response:
+    """Get all available presentation templates.
+
+    Sends a strong ``ETag``; a matching ``If-None-Match`` gets a 304.
+    """
     try:
-        templates = ai_service.get_templates()
-        return templates
+        entry = ai_service.get_templates_resource()
+        return cached_json_response(
+            entry.body, entry.etag, TEMPLATES_CACHE_CONTROL, if_none_match
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats(ai_service: AIGatewayService = Depends(get_service)) -> Response:
+    """Get generation cache hit, miss and eviction counters."""
+    return FastJSONResponse(ai_service.get_cache_stats())
+
+
+@app.get("/scheduler/stats", response_model=Dict[str, Any])
+async def get_scheduler_stats(ai_service: AIGatewayService = Depends(get_service)) -> Response:
+    """Get generation slot, queue depth, shedding and queue wait statistics."""
+    return FastJSONResponse(ai_service.get_scheduler_stats())
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Expose gateway metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/stats", response_model=Dict[str, Any])
-async def get_stats() -> Dict[str, Any]:
-    """Get presentation statistics."""
+async def get_stats(
+    author: Optional[str] = None, ai_service: AIGatewayService = Depends(get_service)
+) -> Response:
+    """Get presentation statistics, optionally including one author's count."""
     try:
-        stats = ai_service.get_presentation_stats()
-        return stats
+        stats = await ai_service.call_store(ai_service.get_presentation_stats, author)
+        return FastJSONResponse(stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -107,7 +581,7 @@ async def get_stats() -> Dict[str, Any]:
 def main():
     """Main entry point for the application."""
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
 if __name__ == "__main__":
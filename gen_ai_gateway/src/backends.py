@@ -0,0 +1,319 @@
+"""Slide generation backends for the Gen AI Gateway."""
+
+import asyncio
+import random
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from gen_ai_gateway.src.config import GatewaySettings
+from ppt_wrapper import PPTWrapper
+
+SlideGenerator = Callable[[str, str], Dict[str, Any]]
+SlideRequest = Tuple[str, str]
+
+
+class BackendError(Exception):
+    """Raised when a backend fails to generate a slide."""
+
+
+class GenerationBackend(ABC):
+    """Async interface for slide content generators."""
+
+    name = "backend"
+    version = "1"
+    supports_batch = False
+
+    @abstractmethod
+    async def generate(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
+        """Generate slide content for a topic."""
+
+    async def stream(
+        self, topic: str, slide_type: str = "content"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate slide content as a sequence of events.
+
+        Backends that produce output incrementally should override this. The
+        default generates the whole slide and then splits it into events.
+        """
+        content = await self.generate(topic, slide_type)
+        for event in slide_events(content):
+            yield event
+
+    async def generate_batch(self, requests: Sequence[SlideRequest]) -> List[Dict[str, Any]]:
+        """Generate several slides, returning results in request order.
+
+        Backends with native batched inference set ``supports_batch`` and
+        override this to serve all prompts in one call. The default issues
+        the calls concurrently.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.generate(topic, slide_type) for topic, slide_type in requests)
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Release connections held for the current event loop; the default holds none."""
+
+
+class SyncBackend(GenerationBackend):
+    """Adapter for synchronous generators.
+
+    Calls are offloaded to a thread pool so a blocking client library does
+    not stall the event loop.
+    """
+
+    name = "sync"
+
+    def __init__(
+        self,
+        generate: SlideGenerator,
+        executor: Optional[Executor] = None,
+        offload: bool = True,
+    ):
+        """Initialize the adapter around a synchronous generator callable."""
+        self._generate = generate
+        self._executor = executor
+        self._offload = offload
+
+    async def generate(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
+        """Generate slide content, in the thread pool when offloading."""
+        if not self._offload:
+            return self._generate(topic, slide_type)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._generate, topic, slide_type)
+
+
+class PPTWrapperBackend(SyncBackend):
+    """Backend serving the mock content of ``PPTWrapper``.
+
+    The mock is CPU-trivial, so it runs inline unless ``offload`` is set.
+    """
+
+    name = "ppt_wrapper"
+
+    def __init__(
+        self,
+        ppt_wrapper: PPTWrapper,
+        executor: Optional[Executor] = None,
+        offload: bool = False,
+    ):
+        """Initialize the backend for a wrapper instance."""
+        super().__init__(ppt_wrapper.generate_slide_content, executor, offload)
+
+
+class SimulatedLatencyBackend(GenerationBackend):
+    """Local stand-in for a remote model, for load tests.
+
+    Each call sleeps for ``latency`` plus up to ``jitter`` seconds without
+    blocking the event loop, then returns the ``PPTWrapper`` mock content.
+    Faults can be injected: a ``slow_rate`` fraction of calls take
+    ``slow_latency`` seconds longer, modelling tail-latency spikes, and a
+    ``failure_rate`` fraction raise ``BackendError`` after their latency.
+    """
+
+    name = "simulated"
+    supports_batch = True
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        generate: Optional[SlideGenerator] = None,
+        seed: Optional[int] = None,
+        failure_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        name: Optional[str] = None,
+    ):
+        """Initialize the backend with its latency and fault profile.
+
+        Batches are served like batched inference: one latency sample for
+        the whole batch. ``name`` tells several stand-ins apart.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        if name is not None:
+            self.name = name
+        self._generate = generate or PPTWrapper().generate_slide_content
+        self._random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Draw the latency of one call."""
+        latency = self.latency + self._random.uniform(0, self.jitter)
+        if self.slow_rate and self._random.random() < self.slow_rate:
+            latency += self.slow_latency
+        return latency
+
+    def _check_failure(self) -> None:
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise BackendError(f"Simulated failure of backend {self.name}")
+
+    async def generate(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
+        """Sleep for the simulated latency, then return mock content."""
+        await asyncio.sleep(self.sample_latency())
+        self._check_failure()
+        return self._generate(topic, slide_type)
+
+    async def generate_batch(self, requests: Sequence[SlideRequest]) -> List[Dict[str, Any]]:
+        """Sleep once for the whole batch, then return mock content for each."""
+        await asyncio.sleep(self.sample_latency())
+        self._check_failure()
+        return [self._generate(topic, slide_type) for topic, slide_type in requests]
+
+    async def stream(
+        self, topic: str, slide_type: str = "content"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Emit mock content events, spreading the latency across them."""
+        events = list(slide_events(self._generate(topic, slide_type)))
+        delay = self.sample_latency() / len(events)
+        await asyncio.sleep(delay)
+        self._check_failure()
+        for index, event in enumerate(events):
+            if index:
+                await asyncio.sleep(delay)
+            yield event
+
+
+class HTTPBackend(GenerationBackend):
+    """Backend calling a remote generation service over HTTP.
+
+    Each call POSTs ``{"topic", "slide_type"}`` as JSON to ``url`` and
+    expects the generated slide as the JSON response. Requests share one
+    pooled ``httpx.AsyncClient`` per event loop, which keeps up to
+    ``max_keepalive`` idle connections alive for ``keepalive_expiry``
+    seconds and opens at most ``max_connections``. Requires ``httpx``.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        name: Optional[str] = None,
+        transport: Any = None,
+    ):
+        """Initialize the backend; connections are opened on first use."""
+        self._httpx = _require_httpx()
+        self.url = url
+        self.timeout = timeout
+        self.limits = self._httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if name is not None:
+            self.name = name
+        self._transport = transport
+        self._clients: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+    def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self._httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self._transport
+            )
+        return client
+
+    async def generate(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
+        """Request one slide from the remote service."""
+        try:
+            response = await self._client().post(
+                self.url, json={"topic": topic, "slide_type": slide_type}
+            )
+            response.raise_for_status()
+        except self._httpx.HTTPError as e:
+            raise BackendError(f"Backend {self.name} request failed: {e}") from e
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the current event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+def _require_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError:
+        raise ValueError("The HTTP backend requires httpx (pip install httpx)") from None
+    return httpx
+
+
+def slide_events(content: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split a generated slide into streaming events.
+
+    Events are emitted in rendering order: ``start``, ``title``, one
+    ``bullet_point`` per bullet, ``notes``, one ``suggested_image`` per image,
+    and a closing ``done`` event carrying ``generated_at``.
+    """
+    slide = content["content"]
+    yield {
+        "event": "start",
+        "data": {"topic": content["topic"], "slide_type": content["slide_type"]},
+    }
+    yield {"event": "title", "data": content["title"]}
+    for index, bullet_point in enumerate(slide["bullet_points"]):
+        yield {"event": "bullet_point", "index": index, "data": bullet_point}
+    yield {"event": "notes", "data": slide["notes"]}
+    for index, image in enumerate(slide["suggested_images"]):
+        yield {"event": "suggested_image", "index": index, "data": image}
+    yield {"event": "done", "data": {"generated_at": content["generated_at"]}}
+
+
+def slide_from_events(events: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Reassemble a slide from its ``slide_events``.
+
+    Returns ``None`` unless the events run from ``start`` to ``done``.
+    """
+    if not events or events[0]["event"] != "start" or events[-1]["event"] != "done":
+        return None
+    content: Dict[str, Any] = dict(events[0]["data"])
+    slide: Dict[str, Any] = {"bullet_points": [], "notes": "", "suggested_images": []}
+    for event in events[1:-1]:
+        kind = event["event"]
+        if kind == "title":
+            content["title"] = event["data"]
+        elif kind == "bullet_point":
+            slide["bullet_points"].append(event["data"])
+        elif kind == "notes":
+            slide["notes"] = event["data"]
+        elif kind == "suggested_image":
+            slide["suggested_images"].append(event["data"])
+    content["content"] = slide
+    content["generated_at"] = events[-1]["data"]["generated_at"]
+    return content
+
+
+def build_backend(settings: GatewaySettings, ppt_wrapper: PPTWrapper) -> GenerationBackend:
+    """Create the generation backend selected by ``settings.backend``."""
+    if settings.backend == "ppt_wrapper":
+        return PPTWrapperBackend(ppt_wrapper)
+    if settings.backend == "simulated":
+        return SimulatedLatencyBackend(
+            latency=settings.backend_latency_ms / 1000,
+            jitter=settings.backend_jitter_ms / 1000,
+            generate=ppt_wrapper.generate_slide_content,
+        )
+    if settings.backend == "threaded":
+        executor = ThreadPoolExecutor(
+            max_workers=settings.sync_workers, thread_name_prefix="gateway-backend"
+        )
+        return PPTWrapperBackend(ppt_wrapper, executor=executor, offload=True)
+    if settings.backend == "router":
+        # Imported here because the router module builds on this one.
+        from gen_ai_gateway.src.routing import build_router
+
+        return build_router(settings, ppt_wrapper)
+    raise ValueError(f"Unknown generation backend: {settings.backend}")
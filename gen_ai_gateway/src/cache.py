@@ -0,0 +1,238 @@
+"""Generation result caching for the Gen AI Gateway."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def cache_key(topic: str, slide_type: str, backend: str, version: str) -> str:
+    """Build a content address for a generation request.
+
+    Topics are case-folded with whitespace collapsed, so requests differing
+    only in formatting share an entry. The backend name and version are part
+    of the key, so switching models never serves stale output.
+    """
+    normalized = {
+        "topic": " ".join(topic.split()).casefold(),
+        "slide_type": slide_type.strip().casefold(),
+        "backend": backend,
+        "version": version,
+    }
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CacheTier(ABC):
+    """Persistent second tier behind the in-memory generation cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return the payload and expiry time stored under ``key``."""
+
+    @abstractmethod
+    def set(self, key: str, payload: bytes, expires_at: float) -> None:
+        """Store a payload until the given expiry time."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under ``key``, if any."""
+
+
+class DirectoryCacheTier(CacheTier):
+    """Stores one file per entry under ``<root>/<key[:2]>/<key>``.
+
+    Each file holds the expiry timestamp on its first line followed by the
+    JSON payload. Writes go through a temporary file and an atomic rename.
+    """
+
+    def __init__(self, root: str):
+        """Initialize the tier, creating the root directory if needed."""
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return the payload and expiry time stored under ``key``."""
+        try:
+            with open(self._path(key), "rb") as handle:
+                expires_at = float(handle.readline())
+                return handle.read(), expires_at
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, payload: bytes, expires_at: float) -> None:
+        """Store a payload until the given expiry time."""
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(f"{expires_at!r}\n".encode())
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under ``key``, if any."""
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+
+class SQLiteCacheTier(CacheTier):
+    """Stores entries in a SQLite table shared by all gateway workers."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the cache table in the database at ``path``."""
+        from ppt_wrapper.sqlite_store import SQLiteConnectionPool
+
+        self.pool = SQLiteConnectionPool(path)
+        self.pool.connection().execute(
+            "CREATE TABLE IF NOT EXISTS generation_cache "
+            "(key TEXT PRIMARY KEY, payload BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return the payload and expiry time stored under ``key``."""
+        row = self.pool.connection().execute(
+            "SELECT payload, expires_at FROM generation_cache WHERE key = ?", (key,)
+        ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, key: str, payload: bytes, expires_at: float) -> None:
+        """Store a payload until the given expiry time."""
+        self.pool.connection().execute(
+            "INSERT OR REPLACE INTO generation_cache (key, payload, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, payload, expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under ``key``, if any."""
+        self.pool.connection().execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+
+
+class GenerationCache:
+    """LRU cache of generated slides with a memory budget and per-entry TTL.
+
+    Entries are kept as encoded JSON, which both bounds memory accurately
+    and hands every caller an independent copy. An optional ``disk`` tier
+    is written through on every store and consulted on memory misses.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 3600.0,
+        disk: Optional[CacheTier] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache with its memory budget and default TTL."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk = disk
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for ``key``, or ``None`` on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[0])
+                self._remove(key)
+                self.expirations += 1
+        if self.disk is not None:
+            stored = self.disk.get(key)
+            if stored is not None and stored[1] > now:
+                with self._lock:
+                    self._insert(key, stored[0], stored[1])
+                    self.disk_hits += 1
+                return json.loads(stored[0])
+            if stored is not None:
+                self.disk.delete(key)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries if needed."""
+        payload = json.dumps(value, separators=(",", ":")).encode()
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._insert(key, payload, expires_at)
+        if self.disk is not None:
+            self.disk.set(key, payload, expires_at)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and occupancy."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk_enabled": self.disk is not None,
+        }
+
+    def __len__(self) -> int:
+        """Return the number of in-memory entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether ``key`` has a live in-memory entry, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)  # type: ignore[call-overload]
+        return entry is not None and entry[1] > self._clock()
+
+    def _insert(self, key: str, payload: bytes, expires_at: float) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (payload, expires_at)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
@@ -0,0 +1,84 @@
+"""Runtime settings for the Gen AI Gateway."""
+
+import os
+from dataclasses import dataclass, fields
+from typing import Any, Mapping, Optional
+
+ENV_PREFIX = "GATEWAY_"
+
+
+@dataclass
+class GatewaySettings:
+    """Gateway settings, overridable through ``GATEWAY_<FIELD>`` variables."""
+
+    store: str = "memory"
+    store_path: str = "gateway.db"
+    durable_dir: str = "gateway_data"
+    wal_sync: str = "batch"
+    wal_fsync_interval_ms: float = 50.0
+    snapshot_every: int = 100000
+    backend: str = "ppt_wrapper"
+    backend_latency_ms: float = 50.0
+    backend_jitter_ms: float = 0.0
+    router_backends: str = ""
+    router_strategy: str = "least_latency"
+    router_hedge: bool = True
+    router_hedge_quantile: float = 0.95
+    router_hedge_initial_ms: float = 1000.0
+    router_breaker_failures: int = 5
+    router_breaker_reset_ms: float = 5000.0
+    max_concurrency: int = 256
+    scheduler_max_queue: int = 1024
+    interactive_deadline_ms: float = 2000.0
+    batch_deadline_ms: float = 30000.0
+    sync_workers: int = 32
+    batch_parallelism: int = 8
+    batch_max_requests: int = 100
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_seconds: float = 3600.0
+    cache_dir: Optional[str] = None
+    semantic_cache_threshold: float = 0.0
+    semantic_cache_entries: int = 100000
+    semantic_cache_dimensions: int = 256
+    response_cache_entries: int = 10000
+    prewarm_presentations: int = 1000
+    templates_max_age_seconds: int = 300
+    export_workers: int = 2
+    export_cache_entries: int = 4096
+    bulk_batch_size: int = 1000
+    prefetch: bool = False
+    prefetch_idle_fraction: float = 0.5
+    prefetch_max_pending: int = 1024
+    job_ttl_seconds: float = 3600.0
+    job_max_finished: int = 10000
+    rate_limits: str = ""
+    rate_limit_key: str = "ip"
+    rate_limit_trusted_proxies: str = ""
+    rate_limit_api_keys: str = ""
+    rate_limit_store: str = "memory"
+    tenant_header: str = "X-Tenant-ID"
+    tenant_max_concurrency: int = 0
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "GatewaySettings":
+        """Build settings from environment variables."""
+        environ = os.environ if environ is None else environ
+        values = {}
+        for field in fields(cls):
+            raw = environ.get(ENV_PREFIX + field.name.upper())
+            if raw is not None:
+                values[field.name] = _coerce(raw, field.default)
+        return cls(**values)
+
+
+def _coerce(raw: str, default: Any) -> Any:
+    """Convert an environment string to the type of the field default."""
+    if isinstance(default, bool):
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    if default is None and raw == "":
+        return None
+    return raw
@@ -0,0 +1,129 @@
+"""Parallel, streaming ``.pptx`` export for the Gen AI Gateway."""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Sequence
+
+from ppt_wrapper.pptx import (
+    ZipStream,
+    package_parts,
+    render_slide,
+    slide_part_name,
+    slide_specs,
+    spec_key,
+)
+
+
+class PPTXExporter:
+    """Renders presentations to ``.pptx`` and streams the package.
+
+    Slide parts missing from the cache are rendered in a pool of
+    ``workers`` processes (``0`` renders on the event loop's default thread
+    pool instead). The zip is streamed as parts finish: the package
+    skeleton first, then cached slides, then rendered slides in completion
+    order, then the central directory. Rendered parts are cached by a hash
+    of their slide spec, so re-exporting after an edit only re-renders the
+    slides that changed. At most ``cache_entries`` parts are kept.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        cache_entries: int = 4096,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize the exporter; the process pool starts on first use."""
+        self.workers = workers
+        self.cache_entries = cache_entries
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._parts: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exports = 0
+        self.rendered = 0
+        self.cache_hits = 0
+
+    async def export(
+        self,
+        presentation: Mapping[str, Any],
+        slides: Sequence[Mapping[str, Any]],
+        template: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the bytes of a ``.pptx`` package for the presentation."""
+        specs = slide_specs(presentation, slides, template)
+        stream = ZipStream()
+        self.exports += 1
+        for name, data in package_parts(presentation, specs):
+            yield stream.add(name, data)
+
+        loop = asyncio.get_running_loop()
+        pending: Dict["asyncio.Future[bytes]", Any] = {}
+        try:
+            for number, spec in enumerate(specs, 1):
+                key = spec_key(spec)
+                part = self._cached(key)
+                if part is not None:
+                    yield stream.add(slide_part_name(number), part)
+                    continue
+                future = loop.run_in_executor(self._pool(), render_slide, spec)
+                pending[future] = (number, key)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    number, key = pending.pop(future)
+                    part = future.result()
+                    self._store(key, part)
+                    yield stream.add(slide_part_name(number), part)
+        finally:
+            for future in pending:
+                future.cancel()
+        yield stream.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return export, render and part cache counters."""
+        return {
+            "exports": self.exports,
+            "rendered": self.rendered,
+            "cache_hits": self.cache_hits,
+            "cached_parts": len(self._parts),
+            "workers": self.workers,
+        }
+
+    def close(self) -> None:
+        """Shut down the process pool, if this exporter started one."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _pool(self) -> Optional[Executor]:
+        if self._executor is None and self.workers > 0:
+            with self._lock:
+                if self._executor is None:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    # Spawned workers do not inherit the server's threads or locks.
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _cached(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            part = self._parts.get(key)
+            if part is not None:
+                self._parts.move_to_end(key)
+                self.cache_hits += 1
+            return part
+
+    def _store(self, key: str, part: bytes) -> None:
+        with self._lock:
+            self.rendered += 1
+            if self.cache_entries <= 0:
+                return
+            self._parts[key] = part
+            self._parts.move_to_end(key)
+            while len(self._parts) > self.cache_entries:
+                self._parts.popitem(last=False)
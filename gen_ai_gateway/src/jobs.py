@@ -0,0 +1,100 @@
+"""Background job tracking for the Gen AI Gateway."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict
+
+
+def _now() -> str:
+    return datetime.now().isoformat() + "Z"
+
+
+class JobManager:
+    """In-memory registry of background jobs and their outcomes.
+
+    Finished jobs are kept for ``ttl`` seconds, and at most
+    ``max_finished`` of them; older ones are evicted, oldest first, as
+    jobs are created or finish. Pending and running jobs are never evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_finished: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty job registry."""
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self._clock = clock
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Finished job IDs and when they finished, oldest first.
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def create(self, kind: str, **details: Any) -> Dict[str, Any]:
+        """Register a pending job and return it."""
+        job = {
+            "id": f"job_{uuid.uuid4().hex}",
+            "kind": kind,
+            "status": "pending",
+            "created_at": _now(),
+            "finished_at": None,
+            "error": None,
+            **details,
+        }
+        with self._lock:
+            self._evict()
+            self._jobs[job["id"]] = job
+        return job.copy()
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Get a job by ID."""
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"Job with ID {job_id} not found")
+            return job.copy()
+
+    def __len__(self) -> int:
+        """Return the number of retained jobs."""
+        return len(self._jobs)
+
+    @asynccontextmanager
+    async def track(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Mark a job running for the duration of the block.
+
+        The job ends ``completed``, or ``failed`` with the error message if
+        the block raises. Errors are recorded on the job, not re-raised.
+        """
+        job = self._jobs[job_id]
+        job["status"] = "running"
+        try:
+            yield job
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        else:
+            job["status"] = "completed"
+        finally:
+            job["finished_at"] = _now()
+            with self._lock:
+                self._finished[job_id] = self._clock()
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired or surplus finished jobs; call with the lock held."""
+        expired_before = self._clock() - self.ttl
+        while self._finished:
+            job_id, finished = next(iter(self._finished.items()))
+            if finished > expired_before and len(self._finished) <= self.max_finished:
+                return
+            del self._finished[job_id]
+            del self._jobs[job_id]
+            self.evicted += 1
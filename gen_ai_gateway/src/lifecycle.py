@@ -0,0 +1,133 @@
+"""Lazy and background construction of the gateway service."""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ServiceUnavailable(Exception):
+    """Raised when a request needs the service before it has finished loading."""
+
+    def __init__(self, state: str, retry_after: float = 1.0):
+        """Record the loader state and when to retry."""
+        super().__init__(f"Service is not ready ({state})")
+        self.state = state
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """``Retry-After`` value in whole seconds, at least 1."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class LazyService(Generic[T]):
+    """Builds a service once, either in the background or on first use.
+
+    ``start`` runs ``factory`` and then ``warm`` on a daemon thread so the
+    server can accept connections (and answer health checks) while the
+    catalogue loads; until then ``get`` raises ``ServiceUnavailable``. When
+    ``start`` is never called, as with an app used without its lifespan,
+    the first ``get`` builds the service synchronously and skips warming.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        warm: Optional[Callable[[T], None]] = None,
+        close: Optional[Callable[[T], None]] = None,
+    ):
+        """Initialize the loader; nothing is built yet."""
+        self._factory = factory
+        self._warm = warm
+        self._close = close
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._service: Optional[T] = None
+        self._error: Optional[BaseException] = None
+        self._state = IDLE
+        self._started_at: Optional[float] = None
+        self._load_seconds: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """``idle``, ``loading``, ``ready`` or ``failed``."""
+        return self._state
+
+    def start(self) -> None:
+        """Build and warm the service on a background thread."""
+        with self._lock:
+            if self._state != IDLE:
+                return
+            self._begin()
+            self._thread = threading.Thread(
+                target=self._load, args=(True,), name="service-loader", daemon=True
+            )
+        self._thread.start()
+
+    def get(self) -> T:
+        """Return the service, building it now if nothing has started loading."""
+        service = self._service
+        if service is not None:
+            return service
+        with self._lock:
+            if self._state == IDLE:
+                self._begin()
+                build_here = True
+            else:
+                build_here = False
+        if build_here:
+            self._load(False)
+        if self._state == READY:
+            return self._service  # type: ignore[return-value]
+        raise ServiceUnavailable(self._state)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading finishes; return whether the service is ready."""
+        self._loaded.wait(timeout)
+        return self._state == READY
+
+    def status(self) -> Dict[str, Any]:
+        """Return the loader state, how long loading took and any error."""
+        return {
+            "state": self._state,
+            "load_seconds": self._load_seconds,
+            "error": None if self._error is None else str(self._error),
+        }
+
+    def close(self) -> None:
+        """Release the service's resources once it has loaded."""
+        if self._state == IDLE:
+            return
+        self._loaded.wait()
+        if self._service is not None and self._close is not None:
+            self._close(self._service)
+
+    def _begin(self) -> None:
+        self._state = LOADING
+        self._started_at = time.perf_counter()
+
+    def _load(self, background: bool) -> None:
+        try:
+            service = self._factory()
+            if background and self._warm is not None:
+                self._warm(service)
+        except BaseException as e:
+            self._error = e
+            self._state = FAILED
+            if not background:
+                raise
+        else:
+            self._service = service
+            self._state = READY
+        finally:
+            self._load_seconds = time.perf_counter() - self._started_at
+            self._loaded.set()
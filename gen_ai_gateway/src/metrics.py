@@ -0,0 +1,273 @@
+"""Low-overhead metrics and Prometheus text exposition for the Gen AI Gateway."""
+
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """Base class for labelled metrics.
+
+    Updates are plain dict and list operations without locks. Each worker
+    process aggregates its own values, and the event loop runs on a single
+    thread, so no update interleaves with another.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def _labels(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Yield ``(name, labels, value)`` samples for exposition."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Increase the counter for the given label values."""
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Return the current value for the given label values."""
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, value in self._values.items():
+            yield self.name, self._labels(values), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        """Decrease the gauge for the given label values."""
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        """Set the gauge for the given label values."""
+        self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram.
+
+    Memory per label set is one counter per bucket plus a sum and a count,
+    independent of the number of observations.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count, sum].
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for the given label values."""
+        row = self._values.get(label_values)
+        if row is None:
+            row = self._values[label_values] = [0.0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        """Return the number of observations for the given label values."""
+        row = self._values.get(label_values)
+        return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> Iterable[Sample]:
+        for values, row in self._values.items():
+            labels = self._labels(values)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, row[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+Collector = Callable[[], Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """Holds the gateway's metrics and renders them in Prometheus format.
+
+    Besides metrics updated on the hot path, collectors can be registered
+    that read existing statistics (cache, coalescing, concurrency) only
+    when ``/metrics`` is scraped.
+    """
+
+    def __init__(self) -> None:
+        """Create the standard gateway metrics."""
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+        self.http_requests = self.counter(
+            "gateway_http_requests_total",
+            "HTTP requests by route, method and status code.",
+            ("method", "route", "status"),
+        )
+        self.http_latency = self.histogram(
+            "gateway_http_request_duration_seconds",
+            "HTTP request latency by route and method.",
+            ("method", "route"),
+        )
+        self.http_in_flight = self.gauge(
+            "gateway_http_requests_in_flight",
+            "HTTP requests currently being served.",
+            ("method",),
+        )
+        self.generation_latency = self.histogram(
+            "gateway_generation_duration_seconds",
+            "Backend slide generation latency by backend, operation and outcome.",
+            ("backend", "operation", "outcome"),
+        )
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable yielding ``(name, kind, help, samples)`` at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route HTTP metrics.
+
+    Routes are labelled by their path template (``/presentations/{id}``)
+    rather than the raw path, which keeps label cardinality bounded.
+    Latency covers the whole response, including streamed bodies.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Serve one ASGI connection, timing HTTP requests."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        method = scope["method"]
+        registry = self.registry
+        registry.http_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.http_in_flight.dec(method)
+            registry.http_latency.observe(elapsed, method, route_path)
+            registry.http_requests.inc(method, route_path, status)
+
+
+def stats_collector(
+    prefix: str, documentation: str, read: Callable[[], Optional[Dict[str, Any]]]
+) -> Collector:
+    """Build a collector exposing the numeric fields of a stats dict as gauges."""
+
+    def collect() -> Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]]:
+        stats = read() or {}
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            yield f"{prefix}_{key}", "gauge", f"{documentation} ({key}).", [({}, value)]
+
+    return collect
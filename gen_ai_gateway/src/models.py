@@ -1,6 +1,6 @@
 """Pydantic models for the Gen AI Gateway."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -10,6 +10,7 @@ class HealthResponse(BaseModel):
     status: str
     message: str
     version: str
+    state: str = "ready"
 
 
 class PresentationContent(BaseModel):
@@ -31,6 +32,12 @@ class PresentationResponse(BaseModel):
     template_id: Optional[str] = None
 
 
+class PresentationSearchHit(BaseModel):
+    """Full-text search result model."""
+    score: float
+    presentation: PresentationResponse
+
+
 class CreatePresentationRequest(BaseModel):
     """Request model for creating a new presentation."""
     title: str
@@ -38,10 +45,74 @@ class CreatePresentationRequest(BaseModel):
     template_id: Optional[str] = None
 
 
+class ImportPresentationRecord(BaseModel):
+    """One line of a bulk presentation import.
+
+    Only ``title`` and ``author`` are required; ``id`` is allocated when
+    omitted, and other fields default as for a newly created presentation.
+    Lines of ``GET /presentations/export`` are valid records.
+    """
+    id: Optional[str] = None
+    title: str
+    author: str
+    created_at: Optional[str] = None
+    slides_count: int = Field(default=0, ge=0)
+    status: str = "draft"
+    content: Optional[PresentationContent] = None
+    template_id: Optional[str] = None
+
+
+class PopulatePresentationRequest(BaseModel):
+    """Request model for creating a presentation and generating its slides."""
+    title: str
+    author: str
+    template_id: str
+    topics: List[str] = []
+
+
+class JobResponse(BaseModel):
+    """Background job response model."""
+    id: str
+    kind: str
+    status: str
+    created_at: str
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    presentation_id: Optional[str] = None
+
+
 class GenerateContentRequest(BaseModel):
-    """Request model for generating AI content."""
+    """Request model for generating AI content.
+
+    ``deadline_ms`` bounds how long the request may queue for a generation
+    slot before it is shed; it defaults to the interactive class deadline.
+    """
     topic: str
     slide_type: str = "content"
+    deadline_ms: Optional[float] = Field(default=None, gt=0)
+
+
+class BatchGenerateRequest(BaseModel):
+    """Request model for generating several slides in one call.
+
+    Either list the slides in ``requests``, or give a ``template_id`` and a
+    ``topic`` to generate one slide per entry of the template's
+    ``slides_included``.
+    """
+    requests: Optional[List[GenerateContentRequest]] = None
+    template_id: Optional[str] = None
+    topic: Optional[str] = None
+    max_parallelism: Optional[int] = Field(default=None, ge=1)
+    stream: bool = False
+
+    @model_validator(mode="after")
+    def check_source(self) -> "BatchGenerateRequest":
+        """Require exactly one of an explicit request list or a template."""
+        if (self.requests is None) == (self.template_id is None):
+            raise ValueError("Provide either requests or template_id")
+        if self.template_id is not None and not self.topic:
+            raise ValueError("topic is required with template_id")
+        return self
 
 
 class SlideContent(BaseModel):
@@ -77,3 +148,6 @@ class PresentationStats(BaseModel):
     total_slides: int
     average_slides_per_presentation: float
     available_templates: int
+    by_status: Dict[str, int] = {}
+    by_template: Dict[str, int] = {}
+    author_presentations: Optional[int] = None
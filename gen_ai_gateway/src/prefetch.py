@@ -0,0 +1,151 @@
+"""Speculative generation of slides clients are expected to request next."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from gen_ai_gateway.src.scheduler import PriorityScheduler
+
+# Generates and caches one ``(key, topic, slide_type)`` slide.
+PrefetchFn = Callable[[str, str, str], Awaitable[Any]]
+
+
+class Prefetcher:
+    """Generates queued slides in the background using idle capacity only.
+
+    ``submit`` queues ``(key, topic, slide_type)`` slides, and a worker
+    task on the submitting event loop hands them to ``generate``, which
+    stores the results in the generation cache. A slide is only started
+    while nothing waits in the scheduler's queue and fewer than
+    ``idle_fraction`` of its slots are in use; otherwise the worker checks
+    again every ``poll_interval`` seconds. At most ``max_pending`` slides
+    wait; further submissions are dropped.
+
+    The service reports every request's cache lookup through ``record``.
+    A request served from a prefetched entry is a hit; one that arrives
+    while its slide is still queued or generating is late, and a queued
+    slide is then left to the request instead of being generated twice.
+    """
+
+    def __init__(
+        self,
+        generate: PrefetchFn,
+        scheduler: PriorityScheduler,
+        idle_fraction: float = 0.5,
+        max_pending: int = 1024,
+        max_tracked: int = 10000,
+        poll_interval: float = 0.05,
+    ):
+        """Initialize an idle prefetcher."""
+        if not 0 < idle_fraction <= 1:
+            raise ValueError("Prefetch idle fraction must be in (0, 1]")
+        self.generate = generate
+        self.scheduler = scheduler
+        self.idle_fraction = idle_fraction
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+        self.poll_interval = poll_interval
+        self._pending: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._running: Dict[str, "asyncio.Task[Any]"] = {}
+        # Generating slides a request has already joined.
+        self._claimed: Set[str] = set()
+        # Prefetched slides not yet requested, oldest first.
+        self._ready: "OrderedDict[str, None]" = OrderedDict()
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self.submitted = 0
+        self.dropped = 0
+        self.generated = 0
+        self.failed = 0
+        self.hits = 0
+        self.late = 0
+        self.unused = 0
+
+    def submit(self, slides: Iterable[Tuple[str, str, str]]) -> int:
+        """Queue slides for prefetching and return how many were queued.
+
+        Slides already queued, generating or prefetched are skipped. Must
+        be called from a running event loop; otherwise nothing is queued.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        queued = 0
+        for key, topic, slide_type in slides:
+            if key in self._pending or key in self._running or key in self._ready:
+                continue
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                continue
+            self._pending[key] = (topic, slide_type)
+            queued += 1
+        self.submitted += queued
+        if self._pending and (
+            self._worker is None or self._worker.done() or self._worker.get_loop() is not loop
+        ):
+            self._worker = loop.create_task(self._drain())
+        return queued
+
+    def record(self, key: str, cached: bool) -> None:
+        """Account for a request's cache lookup of ``key``."""
+        if key in self._ready:
+            del self._ready[key]
+            if cached:
+                self.hits += 1
+            else:
+                self.unused += 1
+        elif key in self._pending:
+            del self._pending[key]
+            self.late += 1
+        elif key in self._running and key not in self._claimed:
+            self._claimed.add(key)
+            self.late += 1
+
+    def idle(self) -> bool:
+        """Return whether the scheduler has spare capacity for a prefetch."""
+        busy = max(self.scheduler.in_flight, len(self._running))
+        return self.scheduler.queued == 0 and busy < self.scheduler.limit * self.idle_fraction
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue, outcome and hit-rate counters."""
+        return {
+            "pending": len(self._pending),
+            "running": len(self._running),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "generated": self.generated,
+            "failed": self.failed,
+            "hits": self.hits,
+            "late": self.late,
+            "unused": self.unused,
+            "hit_rate": self.hits / self.generated if self.generated else 0.0,
+        }
+
+    async def _drain(self) -> None:
+        while self._pending:
+            if not self.idle():
+                await asyncio.sleep(self.poll_interval)
+                continue
+            key, (topic, slide_type) = self._pending.popitem(last=False)
+            task = asyncio.ensure_future(self.generate(key, topic, slide_type))
+            self._running[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            # Let the generation take its slot before checking capacity again.
+            await asyncio.sleep(0)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        del self._running[key]
+        claimed = key in self._claimed
+        self._claimed.discard(key)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.failed += 1
+            return
+        self.generated += 1
+        if claimed:
+            return
+        self._ready[key] = None
+        if len(self._ready) > self.max_tracked:
+            self._ready.popitem(last=False)
+            self.unused += 1
@@ -0,0 +1,403 @@
+"""Admission control for the Gen AI Gateway: rate limits and tenant quotas."""
+
+import hashlib
+import math
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.metrics import MetricsRegistry
+
+RouteLimits = Dict[str, Tuple[float, float]]
+KEY_SOURCES = ("auto", "api_key", "tenant", "ip")
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is over its rate limit or concurrency quota."""
+
+    def __init__(self, detail: str, retry_after: float):
+        """Record why the request was rejected and when to retry."""
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """``Retry-After`` value in whole seconds, at least 1."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def parse_route_limits(spec: str) -> RouteLimits:
+    """Parse ``"/generate=10:20,/generate/batch=1"`` into per-route limits.
+
+    Each entry is ``route=rate[:burst]`` with ``rate`` in requests per
+    second; ``burst`` defaults to ``rate`` (and at least 1).
+    """
+    limits: RouteLimits = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        route, sep, value = entry.partition("=")
+        rate_text, _, burst_text = value.partition(":")
+        try:
+            rate = float(rate_text)
+            burst = float(burst_text) if burst_text else max(rate, 1.0)
+        except ValueError:
+            rate = burst = 0.0
+        if not sep or not route.strip() or rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate limit: {entry}")
+        limits[route.strip()] = (rate, burst)
+    return limits
+
+
+def parse_list(spec: str) -> List[str]:
+    """Split a comma-separated setting into its non-empty entries."""
+    return [entry.strip() for entry in spec.split(",") if entry.strip()]
+
+
+class LimiterState(ABC):
+    """Token buckets and concurrency leases backing a ``RateLimiter``."""
+
+    # Whether operations block on I/O and should run off the event loop.
+    blocking = False
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens from a bucket.
+
+        Returns 0 when the tokens were taken, otherwise the number of
+        seconds until enough tokens will have accumulated.
+        """
+
+    @abstractmethod
+    def acquire_lease(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        """Take one of ``limit`` concurrency slots, or return ``None`` if all are taken.
+
+        Leases expire after ``ttl`` seconds, so a slot held by a crashed
+        worker or an abandoned response is eventually reclaimed.
+        """
+
+    @abstractmethod
+    def release_lease(self, key: str, lease: str) -> None:
+        """Return a concurrency slot."""
+
+
+class InMemoryLimiterState(LimiterState):
+    """Per-process limiter state, bounded to ``max_keys`` idle buckets."""
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        """Initialize empty buckets and leases."""
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._leases: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens from a bucket, or return the wait in seconds."""
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            # Evicting the least recently used bucket only forgets a bucket
+            # that has had the longest time to refill.
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def acquire_lease(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        """Take a concurrency slot, or return ``None`` if all are taken."""
+        now = self._clock()
+        with self._lock:
+            leases = self._leases.setdefault(key, {})
+            for lease, expires_at in list(leases.items()):
+                if expires_at <= now:
+                    del leases[lease]
+            if len(leases) >= limit:
+                return None
+            lease = uuid.uuid4().hex
+            leases[lease] = now + ttl
+            return lease
+
+    def release_lease(self, key: str, lease: str) -> None:
+        """Return a concurrency slot."""
+        with self._lock:
+            leases = self._leases.get(key)
+            if leases is not None:
+                leases.pop(lease, None)
+                if not leases:
+                    del self._leases[key]
+
+    def in_flight(self, key: str) -> int:
+        """Return the number of leases currently held for ``key``."""
+        return len(self._leases.get(key, ()))
+
+
+class SQLiteLimiterState(LimiterState):
+    """Limiter state in a SQLite database shared by every worker.
+
+    Each operation runs in one immediate transaction, so buckets and quotas
+    hold across ``--workers N`` and across replicas sharing the database.
+    Each bucket row records when it will have refilled; at most every
+    ``sweep_interval`` seconds, rows past that time are deleted, since a
+    full bucket behaves like a missing one.
+    """
+
+    blocking = True
+
+    def __init__(
+        self, path: str, clock: Callable[[], float] = time.time, sweep_interval: float = 60.0
+    ):
+        """Open (and create if needed) the limiter tables in the database at ``path``."""
+        from ppt_wrapper.sqlite_store import SQLiteConnectionPool
+
+        self._clock = clock
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self.pool = SQLiteConnectionPool(path)
+        conn = self.pool.connection()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+            "full_at REAL NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS concurrency_leases "
+            "(lease TEXT PRIMARY KEY, key TEXT NOT NULL, expires_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS concurrency_leases_key "
+            "ON concurrency_leases (key, expires_at);"
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(rate_limit_buckets)")]
+        if "full_at" not in columns:
+            conn.execute(
+                "ALTER TABLE rate_limit_buckets ADD COLUMN full_at REAL NOT NULL DEFAULT 0"
+            )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS rate_limit_buckets_full_at ON rate_limit_buckets (full_at)"
+        )
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens from a bucket, or return the wait in seconds."""
+        now = self._clock()
+        with self.pool.transaction() as conn:
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, full_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + (burst - tokens) / rate),
+            )
+        return wait
+
+    def buckets(self) -> int:
+        """Return the number of stored bucket rows."""
+        (count,) = self.pool.connection().execute(
+            "SELECT COUNT(*) FROM rate_limit_buckets"
+        ).fetchone()
+        return count
+
+    def acquire_lease(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        """Take a concurrency slot, or return ``None`` if all are taken."""
+        now = self._clock()
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "DELETE FROM concurrency_leases WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            (held,) = conn.execute(
+                "SELECT COUNT(*) FROM concurrency_leases WHERE key = ?", (key,)
+            ).fetchone()
+            if held >= limit:
+                return None
+            lease = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO concurrency_leases (lease, key, expires_at) VALUES (?, ?, ?)",
+                (lease, key, now + ttl),
+            )
+        return lease
+
+    def release_lease(self, key: str, lease: str) -> None:
+        """Return a concurrency slot."""
+        self.pool.connection().execute(
+            "DELETE FROM concurrency_leases WHERE lease = ?", (lease,)
+        )
+
+
+class RateLimiter:
+    """Per-route token buckets and per-tenant concurrency quotas.
+
+    Clients are identified by client IP, by API key (``X-API-Key`` or a
+    bearer token, hashed before use) or by tenant header. Headers are only
+    trusted when configured: an API key only if it is one of ``api_keys``,
+    and the tenant header and ``X-Forwarded-For`` only on requests whose
+    socket peer is one of ``trusted_proxies``. Otherwise the client is the
+    socket peer address. With ``key_source`` ``"auto"`` the first trusted
+    identity present is used. Routes without a limit in ``route_limits``
+    are not rate limited; ``max_concurrency`` of 0 disables the
+    concurrency quota.
+    """
+
+    def __init__(
+        self,
+        route_limits: Optional[RouteLimits] = None,
+        max_concurrency: int = 0,
+        state: Optional[LimiterState] = None,
+        key_source: str = "ip",
+        tenant_header: str = "X-Tenant-ID",
+        lease_ttl: float = 300.0,
+        metrics: Optional[MetricsRegistry] = None,
+        trusted_proxies: Iterable[str] = (),
+        api_keys: Iterable[str] = (),
+    ):
+        """Initialize the limiter."""
+        if key_source not in KEY_SOURCES:
+            raise ValueError(f"Unknown rate limit key source: {key_source}")
+        self.trusted_proxies = frozenset(trusted_proxies)
+        self._api_keys = frozenset(self._hash(api_key) for api_key in api_keys)
+        if key_source == "api_key" and not self._api_keys:
+            raise ValueError("Rate limit key source api_key requires API keys")
+        if key_source == "tenant" and not self.trusted_proxies:
+            raise ValueError("Rate limit key source tenant requires trusted proxies")
+        self.route_limits = dict(route_limits or {})
+        self.max_concurrency = max_concurrency
+        self.state = state or InMemoryLimiterState()
+        self.key_source = key_source
+        self.tenant_header = tenant_header.lower()
+        self.lease_ttl = lease_ttl
+        self.rejections = (metrics or MetricsRegistry()).counter(
+            "gateway_rate_limited_total",
+            "Requests rejected by admission control, by route and reason.",
+            ("route", "reason"),
+        )
+
+    @classmethod
+    def from_settings(
+        cls, settings: GatewaySettings, metrics: Optional[MetricsRegistry] = None
+    ) -> "RateLimiter":
+        """Create a limiter configured from gateway settings."""
+        state: Optional[LimiterState] = None
+        if settings.rate_limit_store == "sqlite":
+            state = SQLiteLimiterState(settings.store_path)
+        elif settings.rate_limit_store != "memory":
+            raise ValueError(f"Unknown rate limit store: {settings.rate_limit_store}")
+        return cls(
+            route_limits=parse_route_limits(settings.rate_limits),
+            max_concurrency=settings.tenant_max_concurrency,
+            state=state,
+            key_source=settings.rate_limit_key,
+            tenant_header=settings.tenant_header,
+            metrics=metrics,
+            trusted_proxies=parse_list(settings.rate_limit_trusted_proxies),
+            api_keys=parse_list(settings.rate_limit_api_keys),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is configured."""
+        return bool(self.route_limits) or self.max_concurrency > 0
+
+    def client_key(self, headers: Mapping[str, str], client_host: Optional[str]) -> str:
+        """Return the identity that limits and quotas are keyed by."""
+        if self.key_source in ("auto", "api_key") and self._api_keys:
+            api_key = headers.get("x-api-key")
+            authorization = headers.get("authorization", "")
+            if not api_key and authorization.lower().startswith("bearer "):
+                api_key = authorization[7:].strip()
+            if api_key:
+                hashed = self._hash(api_key)
+                if hashed in self._api_keys:
+                    return f"key:{hashed}"
+        proxied = client_host in self.trusted_proxies
+        if self.key_source in ("auto", "tenant") and proxied:
+            tenant = headers.get(self.tenant_header)
+            if tenant:
+                return f"tenant:{tenant}"
+        if proxied:
+            client_host = self._forwarded_for(headers.get("x-forwarded-for", ""), client_host)
+        return f"ip:{client_host or 'unknown'}"
+
+    def _forwarded_for(self, header: str, peer: Optional[str]) -> Optional[str]:
+        """Return the nearest address in ``X-Forwarded-For`` not added by a trusted proxy."""
+        for address in reversed(parse_list(header)):
+            if address not in self.trusted_proxies:
+                return address
+        return peer
+
+    @staticmethod
+    def _hash(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+    def check(self, route: str, key: str, cost: float = 1.0) -> None:
+        """Take tokens for one request, raising ``RateLimitExceeded`` if over the limit."""
+        limit = self.route_limits.get(route)
+        if limit is None:
+            return
+        rate, burst = limit
+        wait = self.state.take(f"{route}|{key}", rate, burst, cost)
+        if wait > 0:
+            self.rejections.inc(route, "rate")
+            raise RateLimitExceeded(f"Rate limit exceeded for {route}", wait)
+
+    def acquire(self, route: str, key: str) -> Optional[str]:
+        """Take a concurrency slot for ``key``; pair with ``release``."""
+        if self.max_concurrency <= 0:
+            return None
+        lease = self.state.acquire_lease(key, self.max_concurrency, self.lease_ttl)
+        if lease is None:
+            self.rejections.inc(route, "concurrency")
+            raise RateLimitExceeded("Too many concurrent generations", 1.0)
+        return lease
+
+    def release(self, key: str, lease: Optional[str]) -> None:
+        """Return a slot taken with ``acquire``."""
+        if lease is not None:
+            self.state.release_lease(key, lease)
+
+    async def check_async(self, route: str, key: str, cost: float = 1.0) -> None:
+        """Like ``check``, off the event loop when the state blocks on I/O."""
+        await self._call(self.check, route, key, cost)
+
+    async def acquire_async(self, route: str, key: str) -> Optional[str]:
+        """Like ``acquire``, off the event loop when the state blocks on I/O."""
+        return await self._call(self.acquire, route, key)
+
+    async def release_async(self, key: str, lease: Optional[str]) -> None:
+        """Like ``release``, off the event loop when the state blocks on I/O."""
+        if lease is not None:
+            await self._call(self.release, key, lease)
+
+    async def _call(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.state.blocking:
+            return await run_in_threadpool(function, *args)
+        return function(*args)
+
+    @asynccontextmanager
+    async def slot(self, route: str, key: str) -> AsyncIterator[None]:
+        """Hold a concurrency slot for ``key`` while the block runs."""
+        lease = await self.acquire_async(route, key)
+        try:
+            yield
+        finally:
+            await self.release_async(key, lease)
@@ -0,0 +1,189 @@
+"""Fast JSON responses for the Gen AI Gateway.
+
+Handlers return these response classes directly, so FastAPI skips its own
+``response_model`` validation and serialization. ``orjson`` is used when
+installed (``pip install gen-ai-gateway[fast]``), and the standard library
+``json`` module otherwise.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Optional, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a JSON-compatible value as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``dumps`` instead of ``json.dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode the response body."""
+        return dumps(content)
+
+
+class PreEncodedJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes."""
+
+    media_type = JSON_MEDIA_TYPE
+
+
+def etag_for(body: bytes) -> str:
+    """Return a strong entity tag derived from a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header matches ``etag``.
+
+    Uses the weak comparison that RFC 9110 prescribes for ``If-None-Match``.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cached_json_response(
+    body: bytes, etag: str, cache_control: str, if_none_match: Optional[str]
+) -> Response:
+    """Return the encoded body with validators, or 304 if the client has it."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return PreEncodedJSONResponse(body, headers=headers)
+
+
+class EncodedRecord:
+    """One record version encoded as JSON, with its entity tag."""
+
+    __slots__ = ("revision", "checked_version", "body", "etag")
+
+    def __init__(self, revision: Any, checked_version: Optional[int], body: bytes):
+        """Wrap an encoded body and derive its strong ETag."""
+        self.revision = revision
+        self.checked_version = checked_version
+        self.body = body
+        self.etag = etag_for(body)
+
+
+class EncodedRecordCache:
+    """LRU cache of records validated against a model and encoded as JSON.
+
+    Each record ID keeps its latest encoded version, tagged with the
+    record's ``revision``. Stores stamp a new revision on every write, so a
+    changed record is re-validated on its next read; each record version is
+    validated and serialized once, however often it is served.
+
+    An entry also remembers the store version at which it was last known
+    to be current. While the store version is unchanged, ``lookup`` serves
+    the entry without reading the record at all.
+    """
+
+    def __init__(self, model: Type[BaseModel], max_entries: int = 10000):
+        """Initialize the cache for records of ``model``."""
+        self.model = model
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, EncodedRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, record_id: str, store_version: int) -> Optional[EncodedRecord]:
+        """Return the entry for ``record_id`` if it is current at ``store_version``."""
+        with self._lock:
+            entry = self._entries.get(record_id)
+            if entry is None or entry.checked_version != store_version:
+                return None
+            self._entries.move_to_end(record_id)
+            self.hits += 1
+            return entry
+
+    def entry(
+        self, record: Dict[str, Any], store_version: Optional[int] = None
+    ) -> EncodedRecord:
+        """Return the encoded entry for one record, encoding it on a miss.
+
+        ``store_version`` must have been read before ``record``; it marks
+        the entry as current for ``lookup``.
+        """
+        record_id = record["id"]
+        revision = record.get("revision")
+        with self._lock:
+            entry = self._entries.get(record_id)
+            if entry is not None and entry.revision == revision:
+                self._entries.move_to_end(record_id)
+                if store_version is not None:
+                    entry.checked_version = store_version
+                self.hits += 1
+                return entry
+            self.misses += 1
+        body = self.model.model_validate(record).model_dump_json().encode()
+        entry = EncodedRecord(revision, store_version, body)
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[record_id] = entry
+                self._entries.move_to_end(record_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        """Return the JSON encoding of one record."""
+        return self.entry(record).body
+
+    def encode_many(self, records: Iterable[Dict[str, Any]]) -> bytes:
+        """Return the JSON array encoding of several records."""
+        return b"[" + b",".join(self.entry(record).body for record in records) + b"]"
+
+    def encode_each(self, records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        """Yield the JSON encoding of each record without caching new entries.
+
+        Current entries are reused; other records are encoded but not
+        stored, so a bulk read does not evict the entries serving point reads.
+        """
+        for record in records:
+            with self._lock:
+                entry = self._entries.get(record["id"])
+            if entry is not None and entry.revision == record.get("revision"):
+                yield entry.body
+            else:
+                yield self.model.model_validate(record).model_dump_json().encode()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and miss counters and occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,477 @@
+"""Routing of generations across several backends.
+
+``BackendRouter`` spreads calls over its member backends by weight or by
+observed latency, hedges slow calls on a second backend and fails over on
+errors. Each member has a ``CircuitBreaker`` that takes it out of rotation
+after repeated failures.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from gen_ai_gateway.src.backends import (
+    BackendError,
+    GenerationBackend,
+    HTTPBackend,
+    PPTWrapperBackend,
+    SimulatedLatencyBackend,
+)
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.metrics import Collector
+from ppt_wrapper import PPTWrapper
+
+WEIGHTED = "weighted"
+LEAST_LATENCY = "least_latency"
+STRATEGIES = (WEIGHTED, LEAST_LATENCY)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_BREAKER_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Weight of the latest call in the moving average used by least-latency.
+_LATENCY_SMOOTHING = 0.2
+
+
+class NoBackendAvailable(BackendError):
+    """Raised when every backend's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calls to a backend after consecutive failures.
+
+    After ``failure_threshold`` failures in a row the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets one trial call
+    through (half-open): success closes it, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed breaker."""
+        if failure_threshold < 1:
+            raise ValueError("Breaker failure threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial = False
+
+    def available(self) -> bool:
+        """Return whether ``allow`` would currently let a call through."""
+        if self.state == OPEN:
+            return self._clock() >= self._opened_at + self.reset_timeout
+        return self.state == CLOSED or not self._trial
+
+    def allow(self) -> bool:
+        """Claim permission for one call."""
+        if not self.available():
+            return False
+        if self.state != CLOSED:
+            self.state = HALF_OPEN
+            self._trial = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.state = CLOSED
+        self.failures = 0
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened += 1
+            self._opened_at = self._clock()
+        self._trial = False
+
+    def record_cancel(self) -> None:
+        """Give back a call that was cancelled before it finished."""
+        self._trial = False
+
+
+class LatencyWindow:
+    """The most recent call latencies of a backend, for quantiles and averages."""
+
+    def __init__(self, size: int = 256):
+        """Initialize an empty window of ``size`` samples."""
+        self._samples: "deque[float]" = deque(maxlen=size)
+        self._sorted: Optional[List[float]] = None
+        self.average: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """Record one call latency."""
+        self._samples.append(seconds)
+        self._sorted = None
+        if self.average is None:
+            self.average = seconds
+        else:
+            self.average += _LATENCY_SMOOTHING * (seconds - self.average)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile of the window, or ``None`` when empty."""
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+
+class RoutedBackend:
+    """A router member: a backend with its weight, breaker and latency window."""
+
+    def __init__(
+        self,
+        backend: GenerationBackend,
+        weight: float = 1.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """Wrap a backend for routing."""
+        if weight <= 0:
+            raise ValueError("Backend weight must be positive")
+        self.backend = backend
+        self.weight = weight
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyWindow()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    @property
+    def name(self) -> str:
+        """The backend's name."""
+        return self.backend.name
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call, error, latency and breaker statistics."""
+        p95 = self.latency.quantile(0.95)
+        average = self.latency.average
+        return {
+            "weight": self.weight,
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "latency_avg_ms": average * 1000 if average is not None else 0.0,
+            "latency_p95_ms": p95 * 1000 if p95 is not None else 0.0,
+            "breaker": self.breaker.state,
+            "breaker_opened": self.breaker.opened,
+        }
+
+
+class BackendRouter(GenerationBackend):
+    """Spreads generations over several backends.
+
+    ``strategy`` is ``weighted`` (random, proportional to member weights)
+    or ``least_latency`` (the lowest moving-average latency; members without
+    samples are tried first). Members whose breaker is open are skipped.
+
+    With ``hedge``, a call still running when its backend's
+    ``hedge_quantile`` latency has passed is sent to a second backend as
+    well, and whichever answers first wins; the other call is cancelled.
+    Until a backend has ``min_samples`` latencies, ``initial_budget``
+    seconds is used instead. A failed call fails over to another backend
+    that has not been tried yet.
+    """
+
+    name = "router"
+    supports_batch = False
+
+    def __init__(
+        self,
+        members: Sequence[RoutedBackend],
+        strategy: str = LEAST_LATENCY,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        initial_budget: float = 1.0,
+        min_samples: int = 20,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the router over its members."""
+        if not members:
+            raise ValueError("A backend router needs at least one backend")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        names = [member.name for member in members]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Routed backend names must be unique: {names}")
+        self.members = list(members)
+        self.strategy = strategy
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.initial_budget = initial_budget
+        self.min_samples = min_samples
+        self.version = "+".join(f"{m.name}:{m.backend.version}" for m in self.members)
+        self._random = random.Random(seed)
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.rejected = 0
+
+    def select(self, exclude: Iterable[RoutedBackend] = ()) -> Optional[RoutedBackend]:
+        """Pick the member for the next call, or ``None`` if none is available."""
+        excluded = set(map(id, exclude))
+        candidates = [
+            member
+            for member in self.members
+            if id(member) not in excluded and member.breaker.available()
+        ]
+        if not candidates:
+            return None
+        if self.strategy == WEIGHTED:
+            return self._random.choices(candidates, [m.weight for m in candidates])[0]
+        return min(
+            candidates,
+            key=lambda m: (m.latency.average is not None, m.latency.average or 0.0, m.in_flight),
+        )
+
+    def hedge_budget(self, member: RoutedBackend) -> float:
+        """Return how long to wait for ``member`` before hedging."""
+        if len(member.latency) < self.min_samples:
+            return self.initial_budget
+        return member.latency.quantile(self.hedge_quantile)  # type: ignore[return-value]
+
+    async def generate(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
+        """Generate on the selected backend, hedging and failing over as needed."""
+        primary = self._claim(())
+        tried = [primary]
+        calls: Dict["asyncio.Task[Dict[str, Any]]", RoutedBackend] = {
+            self._start(primary, topic, slide_type): primary
+        }
+        budget = self.hedge_budget(primary) if self.hedge and len(self.members) > 1 else None
+        error: Optional[BaseException] = None
+        try:
+            while calls:
+                done, _ = await asyncio.wait(
+                    calls, timeout=budget, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    budget = None
+                    member = self._claim(tried, required=False)
+                    if member is not None:
+                        self.hedges += 1
+                        tried.append(member)
+                        calls[self._start(member, topic, slide_type)] = member
+                    continue
+                for task in done:
+                    winner = calls.pop(task)
+                    if task.exception() is None:
+                        if winner is not primary and len(tried) > 1 and error is None:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                if not calls:
+                    member = self._claim(tried, required=False)
+                    if member is not None:
+                        self.failovers += 1
+                        tried.append(member)
+                        calls[self._start(member, topic, slide_type)] = member
+        finally:
+            for task in calls:
+                task.cancel()
+        assert error is not None
+        raise error
+
+    async def stream(
+        self, topic: str, slide_type: str = "content"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream from the selected backend, failing over until the first event."""
+        tried: List[RoutedBackend] = []
+        last_error: Optional[Exception] = None
+        while True:
+            member = self._claim(tried, required=last_error is None)
+            if member is None:
+                assert last_error is not None
+                raise last_error
+            tried.append(member)
+            member.calls += 1
+            member.in_flight += 1
+            start = time.perf_counter()
+            started = False
+            try:
+                async for event in member.backend.stream(topic, slide_type):
+                    started = True
+                    yield event
+            except (asyncio.CancelledError, GeneratorExit):
+                member.breaker.record_cancel()
+                raise
+            except Exception as e:
+                member.errors += 1
+                member.breaker.record_failure()
+                if started:
+                    raise
+                self.failovers += 1
+                last_error = e
+                continue
+            finally:
+                member.in_flight -= 1
+            member.latency.add(time.perf_counter() - start)
+            member.breaker.record_success()
+            return
+
+    async def aclose(self) -> None:
+        """Close every member backend."""
+        for member in self.members:
+            await member.backend.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return routing counters and per-backend statistics."""
+        return {
+            "strategy": self.strategy,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "rejected": self.rejected,
+            "backends": {member.name: member.stats() for member in self.members},
+        }
+
+    def collector(self, prefix: str = "gateway_router") -> Collector:
+        """Build a metrics collector with router counters and per-backend gauges."""
+
+        def collect() -> Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]]:
+            for key in ("hedges", "hedge_wins", "failovers", "rejected"):
+                yield (
+                    f"{prefix}_{key}_total", "counter", f"Backend router {key}.",
+                    [({}, getattr(self, key))],
+                )
+            per_backend = [(member.name, member.stats()) for member in self.members]
+            for key in ("calls", "errors", "in_flight", "latency_avg_ms", "latency_p95_ms",
+                        "breaker_opened"):
+                yield (
+                    f"{prefix}_backend_{key}", "gauge", f"Routed backend statistic ({key}).",
+                    [({"backend": name}, stats[key]) for name, stats in per_backend],
+                )
+            yield (
+                f"{prefix}_backend_breaker_state", "gauge",
+                "Routed backend circuit breaker state (0 closed, 1 half-open, 2 open).",
+                [({"backend": name}, _BREAKER_STATES[stats["breaker"]])
+                 for name, stats in per_backend],
+            )
+
+        return collect
+
+    def _claim(
+        self, tried: Sequence[RoutedBackend], required: bool = True
+    ) -> Optional[RoutedBackend]:
+        """Select a member and claim a call from its breaker."""
+        while True:
+            member = self.select(tried)
+            if member is None:
+                if required:
+                    self.rejected += 1
+                    raise NoBackendAvailable("No generation backend is available")
+                return None
+            if member.breaker.allow():
+                return member
+
+    def _start(
+        self, member: RoutedBackend, topic: str, slide_type: str
+    ) -> "asyncio.Task[Dict[str, Any]]":
+        return asyncio.ensure_future(self._call(member, topic, slide_type))
+
+    async def _call(self, member: RoutedBackend, topic: str, slide_type: str) -> Dict[str, Any]:
+        member.calls += 1
+        member.in_flight += 1
+        start = time.perf_counter()
+        try:
+            content = await member.backend.generate(topic, slide_type)
+        except asyncio.CancelledError:
+            member.breaker.record_cancel()
+            raise
+        except Exception:
+            member.errors += 1
+            member.breaker.record_failure()
+            raise
+        finally:
+            member.in_flight -= 1
+        member.latency.add(time.perf_counter() - start)
+        member.breaker.record_success()
+        return content
+
+
+def parse_backend_specs(spec: str) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Parse ``"a=simulated?latency_ms=40&weight=2,b=http?url=..."`` entries.
+
+    Each comma-separated entry is ``name=kind`` optionally followed by
+    ``?option=value&...``. Returns ``(name, kind, options)`` tuples.
+    """
+    entries = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, rest = entry.partition("=")
+        kind, _, query = rest.partition("?")
+        if not sep or not name.strip() or not kind.strip():
+            raise ValueError(f"Invalid router backend: {entry}")
+        entries.append((name.strip(), kind.strip(), dict(parse_qsl(query))))
+    return entries
+
+
+def _member_backend(
+    name: str, kind: str, options: Dict[str, str], ppt_wrapper: PPTWrapper
+) -> GenerationBackend:
+    if kind == "simulated":
+        return SimulatedLatencyBackend(
+            latency=float(options.get("latency_ms", 50)) / 1000,
+            jitter=float(options.get("jitter_ms", 0)) / 1000,
+            generate=ppt_wrapper.generate_slide_content,
+            seed=int(options["seed"]) if "seed" in options else None,
+            failure_rate=float(options.get("failure_rate", 0)),
+            slow_rate=float(options.get("slow_rate", 0)),
+            slow_latency=float(options.get("slow_ms", 0)) / 1000,
+            name=name,
+        )
+    if kind == "http":
+        if "url" not in options:
+            raise ValueError(f"Router backend {name} needs a url")
+        return HTTPBackend(
+            options["url"],
+            timeout=float(options.get("timeout_ms", 30000)) / 1000,
+            max_connections=int(options.get("max_connections", 100)),
+            max_keepalive=int(options.get("max_keepalive", 20)),
+            name=name,
+        )
+    if kind == "ppt_wrapper":
+        backend = PPTWrapperBackend(ppt_wrapper)
+        backend.name = name
+        return backend
+    raise ValueError(f"Unknown router backend kind: {kind}")
+
+
+def build_router(settings: GatewaySettings, ppt_wrapper: PPTWrapper) -> BackendRouter:
+    """Create a router over the backends listed in ``settings.router_backends``."""
+    members = []
+    for name, kind, options in parse_backend_specs(settings.router_backends):
+        members.append(
+            RoutedBackend(
+                _member_backend(name, kind, options, ppt_wrapper),
+                weight=float(options.get("weight", 1)),
+                breaker=CircuitBreaker(
+                    settings.router_breaker_failures,
+                    settings.router_breaker_reset_ms / 1000,
+                ),
+            )
+        )
+    return BackendRouter(
+        members,
+        strategy=settings.router_strategy,
+        hedge=settings.router_hedge,
+        hedge_quantile=settings.router_hedge_quantile,
+        initial_budget=settings.router_hedge_initial_ms / 1000,
+    )
@@ -0,0 +1,275 @@
+"""Priority scheduling of backend generations for the Gen AI Gateway."""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
+
+from gen_ai_gateway.src.metrics import MetricsRegistry
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+# Lower rank is served first.
+PRIORITIES: Dict[str, int] = {INTERACTIVE: 0, BATCH: 1}
+
+# Weight of the latest hold time in the moving average of service time.
+_SERVICE_TIME_SMOOTHING = 0.2
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a generation is shed instead of queued.
+
+    ``reason`` is ``"queue_full"`` when the queue is at capacity, or
+    ``"deadline"`` when the request's queueing deadline would be (or was)
+    exceeded.
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        """Record why the request was shed and when to retry."""
+        super().__init__(f"Generation capacity exhausted ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """``Retry-After`` value in whole seconds, at least 1."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "enqueued_at", "queued")
+
+    def __init__(self, future: "asyncio.Future[None]", priority: str, enqueued_at: float):
+        self.future = future
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.queued = True
+
+
+class _LoopState:
+    """Slots and queue of one event loop."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.heap: List[Tuple[int, int, _Waiter]] = []
+
+
+class PriorityScheduler:
+    """Grants generation slots by priority class, with a bounded queue.
+
+    Up to ``limit`` generations run at once. Further requests wait in a
+    priority queue (interactive before batch, FIFO within a class) of at
+    most ``max_queue`` entries. Each request has a queueing deadline, from
+    the caller or the per-class ``deadlines`` default. A request is shed
+    with ``SchedulerOverloaded`` when:
+
+    - the queue is full
+    - the estimated wait already exceeds its deadline
+    - it is still queued when its deadline passes
+
+    The estimate is the number of slot turnovers ahead of the request
+    times a moving average of how long generations hold a slot.
+
+    Slots and queues are kept per event loop, so one scheduler can be
+    shared by code running on different loops (e.g. test clients).
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int = 1024,
+        deadlines: Optional[Mapping[str, Optional[float]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the scheduler with its concurrency limit and queue bound."""
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.limit = limit
+        self.max_queue = max_queue
+        self.deadlines: Dict[str, Optional[float]] = {
+            priority: None for priority in PRIORITIES
+        }
+        self.deadlines.update(deadlines or {})
+        self._clock = clock
+        self._states: "weakref.WeakKeyDictionary[Any, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sequence = itertools.count()
+        self._queued: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._waits: Dict[str, List[float]] = {
+            priority: [0, 0.0, 0.0] for priority in PRIORITIES
+        }
+        self.service_time = 0.0
+        self.peak = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.expired = 0
+        self.wait_histogram = (metrics or MetricsRegistry()).histogram(
+            "gateway_scheduler_wait_seconds",
+            "Time generations spent queued for a slot, by priority.",
+            ("priority",),
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Generations currently holding a slot, over all event loops."""
+        return sum(state.in_flight for state in self._states.values())
+
+    @property
+    def queued(self) -> int:
+        """Requests currently waiting for a slot, over all event loops."""
+        return sum(self._queued.values())
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    def estimate_wait(self, priority: str) -> float:
+        """Estimate how long a new request of ``priority`` would queue, in seconds."""
+        rank = _rank(priority)
+        state = self._state()
+        if state.in_flight < self.limit and not state.heap:
+            return 0.0
+        ahead = sum(
+            count for name, count in self._queued.items() if PRIORITIES[name] <= rank
+        )
+        return (ahead // self.limit + 1) * self.service_time
+
+    def check_admission(self, priority: str = INTERACTIVE, deadline: Optional[float] = None) -> None:
+        """Raise ``SchedulerOverloaded`` if a request would be shed right now."""
+        if deadline is None:
+            deadline = self.deadlines.get(priority)
+        state = self._state()
+        if state.in_flight < self.limit and not state.heap:
+            return
+        if self.queued >= self.max_queue:
+            self.shed_queue_full += 1
+            raise SchedulerOverloaded("queue_full", self.service_time)
+        estimate = self.estimate_wait(priority)
+        if deadline is not None and estimate > deadline:
+            self.shed_deadline += 1
+            raise SchedulerOverloaded("deadline", estimate)
+
+    async def acquire(self, priority: str = INTERACTIVE, deadline: Optional[float] = None) -> None:
+        """Wait for a slot; pair with ``release``.
+
+        ``deadline`` bounds the queueing time in seconds and defaults to the
+        priority class's deadline.
+        """
+        _rank(priority)
+        if deadline is None:
+            deadline = self.deadlines.get(priority)
+        self.check_admission(priority, deadline)
+        state = self._state()
+        if state.in_flight < self.limit and not state.heap:
+            self._grant(state)
+            self._record_wait(priority, 0.0)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), priority, self._clock())
+        heapq.heappush(state.heap, (PRIORITIES[priority], next(self._sequence), waiter))
+        self._queued[priority] += 1
+        timer = None
+        if deadline is not None:
+            timer = loop.call_later(deadline, self._expire, waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as the caller went away.
+                self.release()
+            self._dequeue(waiter)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        self._record_wait(priority, self._clock() - waiter.enqueued_at)
+
+    def release(self) -> None:
+        """Return a slot, handing it to the highest-priority waiter."""
+        state = self._state()
+        state.in_flight -= 1
+        while state.heap:
+            _, _, waiter = heapq.heappop(state.heap)
+            if waiter.future.done():
+                continue
+            self._dequeue(waiter)
+            self._grant(state)
+            waiter.future.set_result(None)
+            return
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: str = INTERACTIVE, deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot while the block runs."""
+        await self.acquire(priority, deadline)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            held = self._clock() - start
+            self.service_time += _SERVICE_TIME_SMOOTHING * (held - self.service_time)
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return slot occupancy, queue depth, shedding and wait-time statistics."""
+        stats: Dict[str, Any] = {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "peak": self.peak,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_deadline": self.shed_deadline,
+            "expired": self.expired,
+            "service_time_ms": self.service_time * 1000,
+        }
+        for priority in PRIORITIES:
+            count, total, longest = self._waits[priority]
+            stats[f"queued_{priority}"] = self._queued[priority]
+            stats[f"wait_avg_ms_{priority}"] = total / count * 1000 if count else 0.0
+            stats[f"wait_max_ms_{priority}"] = longest * 1000
+        return stats
+
+    def _grant(self, state: _LoopState) -> None:
+        state.in_flight += 1
+        self.admitted += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        if waiter.queued:
+            waiter.queued = False
+            self._queued[waiter.priority] -= 1
+
+    def _expire(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            return
+        self._dequeue(waiter)
+        self.expired += 1
+        waiter.future.set_exception(SchedulerOverloaded("deadline", self.service_time))
+
+    def _record_wait(self, priority: str, waited: float) -> None:
+        row = self._waits[priority]
+        row[0] += 1
+        row[1] += waited
+        row[2] = max(row[2], waited)
+        self.wait_histogram.observe(waited, priority)
+
+
+def _rank(priority: str) -> int:
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(f"Unknown priority class: {priority}") from None
@@ -0,0 +1,217 @@
+"""Semantic reuse of generated slides for near-duplicate topics."""
+
+import json
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from gen_ai_gateway.src.metrics import MetricsRegistry
+from ppt_wrapper.search import tokenize
+
+# NumPy is imported on first use, so processes without a semantic cache
+# do not pay for it at startup.
+np: Any = None
+
+# Buckets for lookup latency, which is well under the generation buckets.
+LOOKUP_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+class HashingVectorizer:
+    """Embeds short texts as hashed word and character n-gram features.
+
+    Words (lower-cased, stopwords dropped) and the character n-grams of
+    each word are hashed into ``dimensions`` signed buckets, and the vector
+    is L2-normalized. Word order does not matter, and shared word stems
+    still overlap through their n-grams, so "AI in Healthcare" and
+    "healthcare AI" embed identically. Runs on the CPU with no model files.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 256,
+        ngram_sizes: Sequence[int] = (3, 4),
+        word_weight: float = 2.0,
+    ):
+        """Initialize the vectorizer."""
+        if dimensions < 1:
+            raise ValueError("Vector dimensions must be at least 1")
+        self.dimensions = dimensions
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.word_weight = word_weight
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Return the sparse, unnormalized ``{bucket: weight}`` features of ``text``."""
+        features: Dict[int, float] = {}
+        for word in tokenize(text):
+            self._add(features, "w:" + word, self.word_weight)
+            padded = f"<{word}>"
+            for size in self.ngram_sizes:
+                for start in range(len(padded) - size + 1):
+                    self._add(features, padded[start : start + size], 1.0)
+        return features
+
+    def transform(self, text: str) -> Any:
+        """Embed ``text`` as a unit-length ``float32`` NumPy vector."""
+        _require_numpy()
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for bucket, weight in self.features(text).items():
+            vector[bucket] = weight
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector /= norm
+        return vector
+
+    def _add(self, features: Dict[int, float], feature: str, weight: float) -> None:
+        digest = zlib.crc32(feature.encode())
+        bucket = digest % self.dimensions
+        # The top hash bit picks the sign, so collisions tend to cancel out.
+        sign = -1.0 if digest & 0x80000000 else 1.0
+        features[bucket] = features.get(bucket, 0.0) + sign * weight
+
+
+class SemanticCache:
+    """Serves generated slides for topics similar to earlier ones.
+
+    Topic vectors are rows of one NumPy matrix, searched with a single
+    matrix-vector product for cosine similarity. Entries are partitioned by
+    ``scope`` (backend, version and slide type), so a slide is only reused
+    for the same kind of request. A lookup hits when the most similar topic
+    in scope reaches ``threshold``. Once ``max_entries`` topics are stored,
+    the oldest are overwritten.
+
+    The matrix takes ``max_entries * dimensions * 4`` bytes when full.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_entries: int = 100_000,
+        vectorizer: Optional[HashingVectorizer] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize an empty cache."""
+        _require_numpy()
+        if not 0 < threshold <= 1:
+            raise ValueError("Similarity threshold must be in (0, 1]")
+        if max_entries < 1:
+            raise ValueError("Semantic cache needs at least one entry")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self._matrix = np.zeros((min(1024, max_entries), self.vectorizer.dimensions), np.float32)
+        self._scopes = np.zeros(len(self._matrix), dtype=np.int32)
+        self._scope_ids: Dict[str, int] = {}
+        self._topics: List[Optional[str]] = []
+        self._payloads: List[Optional[bytes]] = []
+        self._size = 0
+        self._next_row = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._lookup_seconds = 0.0
+        self.lookup_latency = (metrics or MetricsRegistry()).histogram(
+            "gateway_semantic_cache_lookup_seconds",
+            "Time to embed a topic and search the semantic cache.",
+            ("outcome",),
+            buckets=LOOKUP_BUCKETS,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of stored topics."""
+        return self._size
+
+    def add(self, topic: str, scope: str, content: Dict[str, Any]) -> None:
+        """Remember the slide generated for ``topic`` within ``scope``."""
+        vector = self.vectorizer.transform(topic)
+        payload = json.dumps(content, separators=(",", ":")).encode()
+        with self._lock:
+            scope_id = self._scope_ids.setdefault(scope, len(self._scope_ids))
+            row = self._next_row
+            if row == len(self._matrix):
+                self._grow()
+            self._matrix[row] = vector
+            self._scopes[row] = scope_id
+            if row == len(self._topics):
+                self._topics.append(topic)
+                self._payloads.append(payload)
+            else:
+                self._topics[row] = topic
+                self._payloads[row] = payload
+            self._size = max(self._size, row + 1)
+            self._next_row = (row + 1) % self.max_entries
+
+    def nearest(self, topic: str, scope: str, k: int = 1) -> List[Tuple[str, float]]:
+        """Return the ``k`` most similar stored topics in ``scope``, best first."""
+        vector = self.vectorizer.transform(topic)
+        with self._lock:
+            return [(self._topics[row], score) for row, score in self._top(vector, scope, k)]
+
+    def get(self, topic: str, scope: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the slide of the most similar topic, if similar enough."""
+        start = time.perf_counter()
+        vector = self.vectorizer.transform(topic)
+        with self._lock:
+            best = self._top(vector, scope, 1)
+            hit = bool(best) and best[0][1] >= self.threshold
+            payload = self._payloads[best[0][0]] if hit else None
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            elapsed = time.perf_counter() - start
+            self._lookup_seconds += elapsed
+        self.lookup_latency.observe(elapsed, "hit" if hit else "miss")
+        return json.loads(payload) if payload is not None else None
+
+    def clear(self) -> None:
+        """Drop every stored topic."""
+        with self._lock:
+            self._size = 0
+            self._next_row = 0
+            self._topics.clear()
+            self._payloads.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit counters, lookup latency and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "lookup_avg_ms": self._lookup_seconds / lookups * 1000 if lookups else 0.0,
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+        }
+
+    def _top(self, vector: Any, scope: str, k: int) -> List[Tuple[int, float]]:
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is None or not self._size:
+            return []
+        scores = self._matrix[: self._size] @ vector
+        scores[self._scopes[: self._size] != scope_id] = -np.inf
+        if k < len(scores):
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(len(scores))
+        rows = rows[np.argsort(-scores[rows])]
+        return [(int(row), float(scores[row])) for row in rows if scores[row] > -np.inf]
+
+    def _grow(self) -> None:
+        capacity = min(len(self._matrix) * 2, self.max_entries)
+        matrix = np.zeros((capacity, self._matrix.shape[1]), np.float32)
+        matrix[: len(self._matrix)] = self._matrix
+        scopes = np.zeros(capacity, dtype=np.int32)
+        scopes[: len(self._scopes)] = self._scopes
+        self._matrix, self._scopes = matrix, scopes
+
+
+def _require_numpy() -> None:
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ValueError("The semantic cache requires numpy (pip install numpy)") from None
+        np = numpy
@@ -1,40 +1,766 @@
 """Services for the Gen AI Gateway."""
 
-from typing import Dict, List, Any, Optional
+import asyncio
+import copy
+import time
+from typing import (
+    TYPE_CHECKING, Dict, List, Any, AsyncIterator, Callable, Optional, Sequence, Tuple
+)
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from gen_ai_gateway.src.backends import (
+    GenerationBackend,
+    PPTWrapperBackend,
+    build_backend,
+    slide_events,
+    slide_from_events,
+)
+from gen_ai_gateway.src.cache import CacheTier, GenerationCache, cache_key
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.jobs import JobManager
+from gen_ai_gateway.src.metrics import MetricsRegistry, stats_collector
+from gen_ai_gateway.src.models import ImportPresentationRecord, PresentationResponse
+from gen_ai_gateway.src.responses import EncodedRecord, EncodedRecordCache, dumps
+from gen_ai_gateway.src.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    PriorityScheduler,
+    SchedulerOverloaded,
+)
+from gen_ai_gateway.src.singleflight import SingleFlight
+from gen_ai_gateway.src.streaming import MAX_NDJSON_LINE_BYTES, split_ndjson
 from ppt_wrapper import PPTWrapper
+from ppt_wrapper.store import PresentationStore
+
+if TYPE_CHECKING:
+    # Optional features and stores are imported where they are built, so
+    # importing the app does not load them (or multiprocessing, or SQLite).
+    from gen_ai_gateway.src.export import PPTXExporter
+    from gen_ai_gateway.src.prefetch import Prefetcher
+    from gen_ai_gateway.src.semantic import SemanticCache
 
 
 class AIGatewayService:
     """Service class for AI Gateway operations."""
     
-    def __init__(self):
-        """Initialize the AI Gateway service."""
-        self.ppt_wrapper = PPTWrapper()
+    def __init__(
+        self,
+        ppt_wrapper: Optional[PPTWrapper] = None,
+        backend: Optional[GenerationBackend] = None,
+        max_concurrency: int = 256,
+        cache: Optional[GenerationCache] = None,
+        batch_parallelism: int = 8,
+        metrics: Optional[MetricsRegistry] = None,
+        response_cache_entries: int = 10000,
+        max_queue: int = 1024,
+        deadlines: Optional[Dict[str, Optional[float]]] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+        exporter: Optional["PPTXExporter"] = None,
+        bulk_batch_size: int = 1000,
+        prefetch: bool = False,
+        prefetch_idle_fraction: float = 0.5,
+        prefetch_max_pending: int = 1024,
+        jobs: Optional[JobManager] = None,
+    ):
+        """Initialize the AI Gateway service.
+
+        ``backend`` generates slide content for the async path and defaults
+        to the ``PPTWrapper`` mock. At most ``max_concurrency`` generations
+        run at once; further callers queue by priority class, at most
+        ``max_queue`` of them, and are shed once their queueing deadline
+        (``deadlines`` per class, in seconds) passes. When ``cache`` is
+        given, identical requests are served from it. Concurrent identical
+        requests always share a single backend call. Batches fan out to at
+        most ``batch_parallelism`` concurrent generations by default. Up to
+        ``response_cache_entries`` presentations are kept as encoded JSON.
+        With ``semantic_cache``, a request whose topic is similar enough to
+        an earlier one of the same slide type reuses that slide.
+        ``exporter`` renders ``.pptx`` exports. Bulk imports and exports
+        move ``bulk_batch_size`` presentations per store call. With
+        ``prefetch``, creating a presentation from a template queues its
+        slides, seeded with the title, for background generation into
+        ``cache`` whenever the scheduler is below ``prefetch_idle_fraction``
+        of its slots (see ``Prefetcher``). ``jobs`` tracks background jobs.
+        """
+        self.ppt_wrapper = ppt_wrapper or PPTWrapper()
+        self.backend = backend or PPTWrapperBackend(self.ppt_wrapper)
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        if exporter is None:
+            from gen_ai_gateway.src.export import PPTXExporter
+
+            exporter = PPTXExporter()
+        self.exporter = exporter
+        self.single_flight = SingleFlight()
+        self.batch_parallelism = batch_parallelism
+        self.bulk_batch_size = bulk_batch_size
+        self.jobs = jobs or JobManager()
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.limiter = PriorityScheduler(
+            max_concurrency, max_queue=max_queue, deadlines=deadlines, metrics=self.metrics
+        )
+        self.presentation_json = EncodedRecordCache(
+            PresentationResponse, response_cache_entries
+        )
+        self._templates_resource: Optional[EncodedRecord] = None
+        self.prefetcher: Optional["Prefetcher"] = None
+        if prefetch:
+            if cache is None:
+                raise ValueError("Prefetching requires the generation cache")
+            from gen_ai_gateway.src.prefetch import Prefetcher
+
+            self.prefetcher = Prefetcher(
+                self._prefetch_slide,
+                self.limiter,
+                idle_fraction=prefetch_idle_fraction,
+                max_pending=prefetch_max_pending,
+            )
+        self._register_collectors()
+    
+    def _register_collectors(self) -> None:
+        collectors = [
+            ("gateway_cache", "Generation cache statistic", self._cache_stats),
+            ("gateway_single_flight", "Request coalescing statistic", self.single_flight.stats),
+            ("gateway_generation_slots", "Generation scheduler statistic", self.limiter.stats),
+            ("gateway_response_cache", "Encoded presentation cache statistic",
+             self.presentation_json.stats),
+            ("gateway_search_index", "Full-text search index statistic",
+             self.ppt_wrapper.search_stats),
+            ("gateway_semantic_cache", "Semantic topic cache statistic",
+             self._semantic_cache_stats),
+            ("gateway_export", "PPTX export statistic", self.exporter.stats),
+            ("gateway_prefetch", "Speculative slide prefetch statistic",
+             self._prefetch_stats),
+        ]
+        for prefix, documentation, read in collectors:
+            self.metrics.add_collector(stats_collector(prefix, documentation, read))
+        from gen_ai_gateway.src.routing import BackendRouter
+
+        if isinstance(self.backend, BackendRouter):
+            self.metrics.add_collector(self.backend.collector())
+    
+    def _cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.cache.stats() if self.cache is not None else None
+    
+    def _semantic_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self.semantic_cache is None:
+            return None
+        return self.semantic_cache.stats()
+    
+    def _prefetch_stats(self) -> Optional[Dict[str, Any]]:
+        return self.prefetcher.stats() if self.prefetcher is not None else None
     
+    def _observe_generation(self, operation: str, start: float, outcome: str) -> None:
+        self.metrics.generation_latency.observe(
+            time.perf_counter() - start, self.backend.name, operation, outcome
+        )
+    
+    @classmethod
+    def from_settings(
+        cls, settings: GatewaySettings, metrics: Optional[MetricsRegistry] = None
+    ) -> "AIGatewayService":
+        """Create a service configured from gateway settings.
+
+        With ``store="sqlite"`` presentations and the second cache tier live
+        in one SQLite database, so every worker process sees the same data.
+        With ``store="durable"`` presentations stay in memory and are
+        persisted to a write-ahead log and snapshots in ``durable_dir``.
+        """
+        from gen_ai_gateway.src.export import PPTXExporter
+
+        store: Optional[PresentationStore] = None
+        disk: Optional[CacheTier] = None
+        if settings.store == "sqlite":
+            from gen_ai_gateway.src.cache import SQLiteCacheTier
+            from ppt_wrapper.sqlite_store import SQLitePresentationStore
+
+            store = SQLitePresentationStore(settings.store_path)
+            disk = SQLiteCacheTier(settings.store_path)
+        elif settings.store == "durable":
+            from ppt_wrapper.durable_store import DurablePresentationStore
+
+            store = DurablePresentationStore(
+                settings.durable_dir,
+                sync=settings.wal_sync,
+                fsync_interval=settings.wal_fsync_interval_ms / 1000,
+                snapshot_every=settings.snapshot_every,
+            )
+        elif settings.store != "memory":
+            raise ValueError(f"Unknown presentation store: {settings.store}")
+        if settings.cache_dir:
+            from gen_ai_gateway.src.cache import DirectoryCacheTier
+
+            disk = DirectoryCacheTier(settings.cache_dir)
+        ppt_wrapper = PPTWrapper(store=store)
+        semantic_cache = None
+        if settings.semantic_cache_threshold > 0:
+            from gen_ai_gateway.src.semantic import HashingVectorizer, SemanticCache
+
+            semantic_cache = SemanticCache(
+                threshold=settings.semantic_cache_threshold,
+                max_entries=settings.semantic_cache_entries,
+                vectorizer=HashingVectorizer(settings.semantic_cache_dimensions),
+                metrics=metrics,
+            )
+        cache = None
+        if settings.cache_max_bytes > 0:
+            cache = GenerationCache(
+                max_bytes=settings.cache_max_bytes,
+                ttl=settings.cache_ttl_seconds,
+                disk=disk,
+            )
+        return cls(
+            ppt_wrapper=ppt_wrapper,
+            backend=build_backend(settings, ppt_wrapper),
+            max_concurrency=settings.max_concurrency,
+            cache=cache,
+            batch_parallelism=settings.batch_parallelism,
+            metrics=metrics,
+            response_cache_entries=settings.response_cache_entries,
+            max_queue=settings.scheduler_max_queue,
+            deadlines={
+                INTERACTIVE: (settings.interactive_deadline_ms / 1000) or None,
+                BATCH: (settings.batch_deadline_ms / 1000) or None,
+            },
+            semantic_cache=semantic_cache,
+            exporter=PPTXExporter(
+                workers=settings.export_workers,
+                cache_entries=settings.export_cache_entries,
+            ),
+            bulk_batch_size=settings.bulk_batch_size,
+            prefetch=settings.prefetch,
+            prefetch_idle_fraction=settings.prefetch_idle_fraction,
+            prefetch_max_pending=settings.prefetch_max_pending,
+            jobs=JobManager(
+                ttl=settings.job_ttl_seconds, max_finished=settings.job_max_finished
+            ),
+        )
+
+    def warm(self, presentations: int = 0) -> None:
+        """Pre-build the templates response and encode the first presentations.
+
+        Up to ``presentations`` records, in listing order, are validated and
+        encoded into the response cache, so the first pages served after
+        startup are cache hits.
+        """
+        self.get_templates_resource()
+        after = None
+        while presentations > 0:
+            page = self.list_presentations(min(presentations, self.bulk_batch_size), after)
+            self.encode_presentations(page["items"])
+            presentations -= len(page["items"])
+            after = page["next_cursor"]
+            if after is None:
+                break
+
+    async def aclose(self) -> None:
+        """Close the backend's connections on the serving event loop."""
+        await self.backend.aclose()
+
+    def close(self) -> None:
+        """Stop the exporter's workers and close the store, if it holds resources."""
+        self.exporter.close()
+        close_store = getattr(self.ppt_wrapper.store, "close", None)
+        if close_store is not None:
+            close_store()
+
     def get_all_presentations(self) -> List[Dict[str, Any]]:
         """Get all presentations."""
         return self.ppt_wrapper.get_presentations()
     
+    def list_presentations(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """Get one page of presentations with optional projection and filters."""
+        return self.ppt_wrapper.list_presentations(limit, after, fields, **filters)
+    
     def get_presentation_by_id(self, presentation_id: str) -> Dict[str, Any]:
         """Get a specific presentation by ID."""
         return self.ppt_wrapper.get_presentation_by_id(presentation_id)
     
+    def get_presentation_resource(self, presentation_id: str) -> EncodedRecord:
+        """Get a specific presentation as validated, encoded JSON with its ETag.
+
+        While the store version is unchanged since the presentation was
+        last served, the record itself is not read again.
+        """
+        version = self.ppt_wrapper.store.version()
+        entry = self.presentation_json.lookup(presentation_id, version)
+        if entry is None:
+            presentation = self.get_presentation_by_id(presentation_id)
+            entry = self.presentation_json.entry(presentation, version)
+        return entry
+    
+    def encode_presentations(self, presentations: Sequence[Dict[str, Any]]) -> bytes:
+        """Encode presentation records as a validated JSON array."""
+        return self.presentation_json.encode_many(presentations)
+    
+    def encode_presentation(self, presentation: Dict[str, Any]) -> bytes:
+        """Encode one presentation record as validated JSON."""
+        return self.presentation_json.encode(presentation)
+    
+    def search_presentations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search presentations and their slides by relevance."""
+        return self.ppt_wrapper.search_presentations(query, limit)
+    
+    def encode_search_hits(self, hits: Sequence[Dict[str, Any]]) -> bytes:
+        """Encode search hits as JSON, reusing each presentation's encoded bytes."""
+        return b"[" + b",".join(
+            b'{"score":' + dumps(hit["score"]) + b',"presentation":'
+            + self.presentation_json.entry(hit["presentation"]).body + b"}"
+            for hit in hits
+        ) + b"]"
+    
     def create_presentation(self, title: str, author: str, template_id: Optional[str] = None) -> Dict[str, Any]:
-        """Create a new presentation."""
-        return self.ppt_wrapper.create_presentation(title, author, template_id)
+        """Create a new presentation, prefetching its template's slides if enabled.
+
+        Raises ``ValueError`` for an unknown template before storing anything.
+        """
+        template = self.get_template_by_id(template_id) if template_id is not None else None
+        presentation = self.ppt_wrapper.create_presentation(title, author, template_id)
+        self._prefetch_template(title, template)
+        return presentation
+
+    async def create_presentation_async(
+        self, title: str, author: str, template_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Like ``create_presentation``, writing to a blocking store from a worker thread."""
+        template = self.get_template_by_id(template_id) if template_id is not None else None
+        presentation = await self.call_store(
+            self.ppt_wrapper.create_presentation, title, author, template_id
+        )
+        self._prefetch_template(title, template)
+        return presentation
+
+    def _prefetch_template(self, title: str, template: Optional[Dict[str, Any]]) -> None:
+        if template is not None and self.prefetcher is not None:
+            self.prefetcher.submit(
+                (self._request_key(title, slide_type), title, slide_type)
+                for slide_type in template["slides_included"]
+            )
+
+    async def call_store(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a call that reads or writes the presentation store.
+
+        Stores that block on I/O, such as ``sqlite`` with its busy timeout,
+        are called from a worker thread so a held lock does not stall the
+        event loop.
+        """
+        if self.ppt_wrapper.store.blocking:
+            return await run_in_threadpool(function, *args, **kwargs)
+        return function(*args, **kwargs)
+    
+    async def import_presentations(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Import presentations from an NDJSON byte stream.
+
+        Lines are validated as they arrive and inserted ``bulk_batch_size``
+        at a time, each batch in one store write, so memory stays bounded
+        by the batch. Yields a ``{"line", "id"}`` or ``{"line", "error"}``
+        result for every non-blank line, in input order, then a
+        ``{"summary": ...}`` with the totals.
+        """
+        totals = {"lines": 0, "imported": 0, "failed": 0}
+        pending: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]] = []
+        async for number, line in split_ndjson(chunks):
+            if line is None:
+                pending.append((number, None, f"Line exceeds {MAX_NDJSON_LINE_BYTES} bytes"))
+            elif not line.strip():
+                continue
+            else:
+                try:
+                    record = ImportPresentationRecord.model_validate_json(line)
+                except ValidationError as e:
+                    pending.append((number, None, _describe_errors(e)))
+                else:
+                    pending.append((number, record.model_dump(exclude_none=True), None))
+            if len(pending) >= self.bulk_batch_size:
+                for result in await self.call_store(self._import_batch, pending, totals):
+                    yield result
+                pending = []
+        for result in await self.call_store(self._import_batch, pending, totals):
+            yield result
+        yield {"summary": totals}
+    
+    def _import_batch(
+        self,
+        pending: Sequence[Tuple[int, Optional[Dict[str, Any]], Optional[str]]],
+        totals: Dict[str, int],
+    ) -> List[Dict[str, Any]]:
+        records = [record for _, record, _ in pending if record is not None]
+        inserted = iter(self.ppt_wrapper.import_presentations(records) if records else ())
+        results = []
+        for number, record, error in pending:
+            result = next(inserted) if record is not None else {"error": error}
+            results.append({"line": number, **result})
+            totals["lines"] += 1
+            totals["failed" if "error" in result else "imported"] += 1
+        return results
+    
+    async def export_presentations(self, **filters: Any) -> AsyncIterator[bytes]:
+        """Stream presentations matching ``filters`` as NDJSON, one page at a time.
+
+        Pages of ``bulk_batch_size`` are read by cursor, so writes made
+        during the export neither fail it nor repeat records.
+        """
+        after = None
+        while True:
+            page = await self.call_store(
+                self.ppt_wrapper.list_presentations, self.bulk_batch_size, after, **filters
+            )
+            if page["items"]:
+                yield b"\n".join(self.presentation_json.encode_each(page["items"])) + b"\n"
+            after = page["next_cursor"]
+            if after is None:
+                return
+    
+    def start_presentation_population(
+        self,
+        title: str,
+        author: str,
+        template_id: str,
+        topics: Sequence[str] = (),
+    ) -> Dict[str, Any]:
+        """Create a presentation and register a job to generate its slides.
+
+        Run the returned job with ``populate_presentation``.
+        """
+        template = self.get_template_by_id(template_id)
+        # The job generates the slides right away, so they are not prefetched.
+        presentation = self.ppt_wrapper.create_presentation(title, author, template_id)
+        self.ppt_wrapper.update_presentation(presentation["id"], status="generating")
+        slides = [
+            (topics[index % len(topics)] if topics else title, slide_type)
+            for index, slide_type in enumerate(template["slides_included"])
+        ]
+        return self.jobs.create(
+            "populate_presentation",
+            presentation_id=presentation["id"],
+            slides=slides,
+            key_topics=list(topics),
+        )
+    
+    async def populate_presentation(self, job_id: str) -> None:
+        """Generate and attach the slides of a population job.
+
+        Slides listed in the template are generated in parallel. The
+        presentation ends ``completed``, or ``failed`` if generation fails.
+        """
+        job = self.jobs.get(job_id)
+        presentation_id = job["presentation_id"]
+        async with self.jobs.track(job_id):
+            try:
+                slides = await self.generate_batch_async(job["slides"])
+            except Exception:
+                await self.call_store(
+                    self.ppt_wrapper.update_presentation, presentation_id, status="failed"
+                )
+                raise
+            await self.call_store(
+                self.ppt_wrapper.attach_slides,
+                presentation_id,
+                slides,
+                key_topics=job["key_topics"],
+                status="completed",
+            )
+    
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Get a background job by ID."""
+        return self.jobs.get(job_id)
+    
+    def get_slides(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Get the generated slides of a presentation."""
+        return self.ppt_wrapper.get_slides(presentation_id)
+    
+    def export_presentation(self, presentation_id: str) -> AsyncIterator[bytes]:
+        """Stream a presentation and its generated slides as a ``.pptx`` package.
+
+        Raises ``ValueError`` for an unknown presentation before any bytes
+        are produced.
+        """
+        presentation = self.get_presentation_by_id(presentation_id)
+        slides = self.get_slides(presentation_id)
+        template = self.ppt_wrapper.find_template(presentation)
+        return self.exporter.export(presentation, slides, template)
     
     def generate_slide_content(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
         """Generate slide content for a given topic."""
         return self.ppt_wrapper.generate_slide_content(topic, slide_type)
     
+    async def generate_slide_content_async(
+        self,
+        topic: str,
+        slide_type: str = "content",
+        priority: str = INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Generate slide content through the backend without blocking the event loop.
+
+        Backend calls are scheduled in the ``priority`` class and shed with
+        ``SchedulerOverloaded`` if they cannot start within ``deadline``
+        seconds (default: the class deadline).
+        """
+        key = self._request_key(topic, slide_type)
+        cached = await self._cached(key, topic, slide_type)
+        if cached is not None:
+            return cached
+        content = await self.single_flight.do(
+            key,
+            lambda: self._generate_uncached(key, topic, slide_type, priority, deadline),
+        )
+        content = copy.deepcopy(content)
+        content["topic"] = topic
+        return content
+    
+    async def _generate_uncached(
+        self,
+        key: str,
+        topic: str,
+        slide_type: str,
+        priority: str,
+        deadline: Optional[float],
+    ) -> Dict[str, Any]:
+        async with self.limiter.slot(priority, deadline):
+            start = time.perf_counter()
+            try:
+                content = await self.backend.generate(topic, slide_type)
+            except Exception:
+                self._observe_generation("generate", start, "error")
+                raise
+            self._observe_generation("generate", start, "ok")
+        await self._remember(key, topic, slide_type, content)
+        return content
+    
+    async def stream_slide_content(
+        self,
+        topic: str,
+        slide_type: str = "content",
+        priority: str = INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream slide content events as the backend produces them.
+
+        Cached slides are replayed as events immediately. A completed
+        stream is reassembled and cached like a generated slide.
+        """
+        key = self._request_key(topic, slide_type)
+        cached = await self._cached(key, topic, slide_type)
+        if cached is not None:
+            for event in slide_events(cached):
+                yield event
+            return
+        events: List[Dict[str, Any]] = []
+        async with self.limiter.slot(priority, deadline):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                async for event in self.backend.stream(topic, slide_type):
+                    events.append(event)
+                    yield event
+                outcome = "ok"
+            finally:
+                self._observe_generation("stream", start, outcome)
+        content = slide_from_events(events)
+        if content is not None:
+            await self._remember(key, topic, slide_type, content)
+    
+    async def stream_batch_async(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        max_parallelism: Optional[int] = None,
+        priority: str = BATCH,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate several ``(topic, slide_type)`` slides as they complete.
+
+        Yields ``{"index", "result"}`` items, or ``{"index", "error"}`` for
+        failed slides. Cached slides come first. Remaining slides go to the
+        backend in one call when it supports batching, and otherwise fan out
+        with at most ``max_parallelism`` in flight. Backend calls are
+        scheduled in the ``priority`` class.
+        """
+        async for index, content, error in self._batch_results(
+            requests, max_parallelism, priority
+        ):
+            if error is not None:
+                yield {"index": index, "error": str(error)}
+            else:
+                yield {"index": index, "result": content}
+    
+    async def _batch_results(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        max_parallelism: Optional[int],
+        priority: str,
+    ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        misses = []
+        for index, (topic, slide_type) in enumerate(requests):
+            cached = await self._cached(self._request_key(topic, slide_type), topic, slide_type)
+            if cached is None:
+                misses.append(index)
+                continue
+            yield index, cached, None
+        if not misses:
+            return
+
+        if self.backend.supports_batch:
+            try:
+                async with self.limiter.slot(priority):
+                    start = time.perf_counter()
+                    try:
+                        contents = await self.backend.generate_batch(
+                            [requests[i] for i in misses]
+                        )
+                    except Exception:
+                        self._observe_generation("batch", start, "error")
+                        raise
+                    self._observe_generation("batch", start, "ok")
+            except Exception as e:
+                for index in misses:
+                    yield index, None, e
+                return
+            for index, content in zip(misses, contents):
+                topic, slide_type = requests[index]
+                await self._remember(
+                    self._request_key(topic, slide_type), topic, slide_type, content
+                )
+                yield index, content, None
+            return
+
+        parallelism = min(max_parallelism or self.batch_parallelism, self.limiter.limit)
+        semaphore = asyncio.Semaphore(parallelism)
+
+        async def run(
+            index: int,
+        ) -> Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]:
+            async with semaphore:
+                try:
+                    content = await self.generate_slide_content_async(
+                        *requests[index], priority=priority
+                    )
+                except Exception as e:
+                    return index, None, e
+                return index, content, None
+
+        tasks = [asyncio.ensure_future(run(index)) for index in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def generate_batch_async(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        max_parallelism: Optional[int] = None,
+        priority: str = BATCH,
+    ) -> List[Dict[str, Any]]:
+        """Generate several ``(topic, slide_type)`` slides, returned in order.
+
+        Raises ``SchedulerOverloaded`` if any slide was shed by the scheduler.
+        """
+        results: List[Dict[str, Any]] = [{}] * len(requests)
+        async for index, content, error in self._batch_results(
+            requests, max_parallelism, priority
+        ):
+            if isinstance(error, SchedulerOverloaded):
+                raise error
+            if error is not None:
+                raise RuntimeError(f"Slide {index} failed: {error}")
+            results[index] = content
+        return results
+    
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get generation slot, queue depth and queue wait statistics."""
+        return self.limiter.stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get generation cache and request coalescing statistics."""
+        stats = {"enabled": self.cache is not None}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        stats["single_flight"] = self.single_flight.stats()
+        if self.semantic_cache is not None:
+            stats["semantic"] = self.semantic_cache.stats()
+        if self.prefetcher is not None:
+            stats["prefetch"] = self.prefetcher.stats()
+        return stats
+    
+    async def _prefetch_slide(self, key: str, topic: str, slide_type: str) -> None:
+        """Generate one slide into the cache at batch priority, unless it is cached."""
+        if key in self.cache:  # type: ignore[operator]
+            return
+        await self.single_flight.do(
+            key, lambda: self._generate_uncached(key, topic, slide_type, BATCH, None)
+        )
+    
+    def _request_key(self, topic: str, slide_type: str) -> str:
+        return cache_key(topic, slide_type, self.backend.name, self.backend.version)
+    
+    def _semantic_scope(self, slide_type: str) -> str:
+        return f"{self.backend.name}:{self.backend.version}:{slide_type.strip().casefold()}"
+    
+    async def _cached(self, key: str, topic: str, slide_type: str) -> Optional[Dict[str, Any]]:
+        """Return a cached slide for the exact request, or else for a similar topic.
+
+        Lookups that have to read the cache's disk tier run in a worker thread.
+        """
+        cached = None
+        if self.cache is not None:
+            if self.cache.disk is None or key in self.cache:
+                cached = self.cache.get(key)
+            else:
+                cached = await run_in_threadpool(self.cache.get, key)
+        if self.prefetcher is not None:
+            self.prefetcher.record(key, cached is not None)
+        if cached is None and self.semantic_cache is not None:
+            cached = self.semantic_cache.get(topic, self._semantic_scope(slide_type))
+        if cached is not None:
+            cached["topic"] = topic
+        return cached
+    
+    async def _remember(
+        self, key: str, topic: str, slide_type: str, content: Dict[str, Any]
+    ) -> None:
+        if self.cache is not None:
+            if self.cache.disk is None:
+                self.cache.set(key, content)
+            else:
+                await run_in_threadpool(self.cache.set, key, content)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(topic, self._semantic_scope(slide_type), content)
+    
     def get_templates(self) -> List[Dict[str, Any]]:
         """Get all available templates."""
         return self.ppt_wrapper.get_templates()
     
+    def get_templates_resource(self) -> EncodedRecord:
+        """Get all available templates as encoded JSON with its ETag.
+
+        Templates never change after startup, so they are encoded once.
+        """
+        if self._templates_resource is None:
+            self._templates_resource = EncodedRecord(None, None, dumps(self.get_templates()))
+        return self._templates_resource
+    
     def get_template_by_id(self, template_id: str) -> Dict[str, Any]:
         """Get a specific template by ID."""
         return self.ppt_wrapper.get_template_by_id(template_id)
     
-    def get_presentation_stats(self) -> Dict[str, Any]:
+    def get_presentation_stats(self, author: Optional[str] = None) -> Dict[str, Any]:
         """Get presentation statistics."""
-        return self.ppt_wrapper.get_presentation_stats()
+        return self.ppt_wrapper.get_presentation_stats(author)
+
+
+def _describe_errors(error: ValidationError) -> str:
+    """Summarize a validation error as ``field: message`` pairs on one line."""
+    return "; ".join(
+        ".".join(str(part) for part in detail["loc"]) + ": " + detail["msg"]
+        if detail["loc"] else detail["msg"]
+        for detail in error.errors()
+    )
@@ -0,0 +1,58 @@
+"""Request coalescing for the Gen AI Gateway."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task. The task is shielded, so a caller
+    that is cancelled (e.g. a disconnected client) does not cancel the work
+    for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty call registry."""
+        self._calls: Dict[Tuple[Any, Hashable], "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[Tuple[Any, Hashable], int] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is in flight."""
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        task = self._calls.get(call_key)
+        if task is None:
+            task = loop.create_task(fn())
+            self._calls[call_key] = task
+            self._waiters[call_key] = 0
+            self.executions += 1
+            task.add_done_callback(lambda _: self._forget(call_key))
+        else:
+            self.coalesced += 1
+            self._waiters[call_key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[call_key])
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently executing."""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters."""
+        return {
+            "executions": self.executions,
+            "coalesced_waiters": self.coalesced,
+            "max_waiters": self.max_waiters,
+            "in_flight": self.in_flight(),
+        }
+
+    def _forget(self, call_key: Tuple[Any, Hashable]) -> None:
+        self._calls.pop(call_key, None)
+        self._waiters.pop(call_key, None)
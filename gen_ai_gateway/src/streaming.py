@@ -0,0 +1,111 @@
+"""Streaming response encoders for the Gen AI Gateway."""
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Longest NDJSON input line accepted; longer lines are skipped, not buffered.
+MAX_NDJSON_LINE_BYTES = 1024 * 1024
+
+
+async def encode_ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode events as newline-delimited JSON, one line per event."""
+    async for event in events:
+        yield json.dumps(event, separators=(",", ":")).encode() + b"\n"
+
+
+async def split_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_NDJSON_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split a byte stream into ``(line_number, line)`` pairs, numbered from 1.
+
+    Only the current line is buffered. A line longer than ``max_line_bytes``
+    is discarded as it arrives and yielded as ``None``. A final line without
+    a trailing newline is still yielded.
+    """
+    number = 0
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            number += 1
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield number, None
+            else:
+                buffer += chunk[start:end]
+                yield number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+    if oversized or buffer:
+        yield number + 1, None if oversized else bytes(buffer)
+
+
+async def encode_sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode events as server-sent events.
+
+    The ``event`` key becomes the SSE event name; the rest of the event is
+    sent as JSON data.
+    """
+    async for event in events:
+        name = event.get("event", "message")
+        data = {key: value for key, value in event.items() if key != "event"}
+        payload = json.dumps(data, separators=(",", ":"))
+        yield f"event: {name}\ndata: {payload}\n\n".encode()
+
+
+def wants_sse(accept: str) -> bool:
+    """Return whether an ``Accept`` header asks for server-sent events."""
+    return SSE_MEDIA_TYPE in (accept or "")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """Streaming response whose body is produced while the request body is read.
+
+    ``StreamingResponse`` watches ``receive`` for a disconnect while it
+    streams, which swallows the request body messages that a body iterator
+    reading ``Request.stream()`` waits for. This response leaves ``receive``
+    to the request; a client that goes away surfaces as ``ClientDisconnect``
+    from ``Request.stream()`` instead.
+    """
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Stream the body without listening for a disconnect."""
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """Streaming response that runs ``on_close`` however the response ends.
+
+    Unlike ``background``, ``on_close`` also runs when the client is gone
+    before or while the body streams, or when sending fails, so resources
+    held for the stream are always returned.
+    """
+
+    def __init__(
+        self, content: AsyncIterator[bytes], on_close: Callable[[], Awaitable[None]], **kwargs: Any
+    ):
+        """Initialize the response with its close callback."""
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Stream the body, then run ``on_close``."""
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.on_close()
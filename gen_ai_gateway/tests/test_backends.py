@@ -0,0 +1,142 @@
+"""Tests for the generation backends and async service path."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from gen_ai_gateway.src.backends import (
+    PPTWrapperBackend,
+    SimulatedLatencyBackend,
+    SyncBackend,
+    build_backend,
+)
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.scheduler import PriorityScheduler
+from gen_ai_gateway.src.services import AIGatewayService
+from ppt_wrapper import PPTWrapper
+
+
+async def test_ppt_wrapper_backend_matches_mock():
+    """Test that the default backend returns the PPTWrapper mock content."""
+    backend = PPTWrapperBackend(PPTWrapper())
+    content = await backend.generate("Edge Computing", "title")
+    assert content["title"] == "Edge Computing Overview"
+    assert content["slide_type"] == "title"
+
+
+async def test_simulated_backend_runs_concurrently():
+    """Test that simulated latency overlaps instead of serializing."""
+    service = AIGatewayService(backend=SimulatedLatencyBackend(latency=0.05))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(service.generate_slide_content_async(f"Topic {n}") for n in range(200))
+    )
+    assert len(results) == 200
+    assert time.perf_counter() - start < 1.0
+    assert service.limiter.peak == 200
+
+
+async def test_limiter_bounds_in_flight_generations():
+    """Test that the service never exceeds its concurrency limit."""
+    service = AIGatewayService(
+        backend=SimulatedLatencyBackend(latency=0.01), max_concurrency=5
+    )
+    await asyncio.gather(
+        *(service.generate_slide_content_async(f"Topic {n}") for n in range(20))
+    )
+    assert service.limiter.peak == 5
+    assert service.limiter.in_flight == 0
+
+
+async def test_sync_backend_offloads_to_thread():
+    """Test that sync generators run off the event loop thread."""
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def generate(topic, slide_type):
+        seen.append(threading.get_ident())
+        return {"topic": topic, "slide_type": slide_type}
+
+    content = await SyncBackend(generate).generate("Offload")
+    assert content["topic"] == "Offload"
+    assert seen and seen[0] != loop_thread
+
+
+def test_invalid_limits_and_backends():
+    """Test configuration errors."""
+    with pytest.raises(ValueError):
+        PriorityScheduler(0)
+    with pytest.raises(ValueError, match="Unknown generation backend"):
+        build_backend(GatewaySettings(backend="nope"), PPTWrapper())
+
+
+def test_settings_from_env():
+    """Test reading settings from environment variables."""
+    settings = GatewaySettings.from_env(
+        {"GATEWAY_BACKEND": "simulated", "GATEWAY_BACKEND_LATENCY_MS": "5"}
+    )
+    assert settings.backend == "simulated"
+    assert settings.backend_latency_ms == 5.0
+    backend = build_backend(settings, PPTWrapper())
+    assert isinstance(backend, SimulatedLatencyBackend)
+    assert backend.latency == 0.005
+
+
+async def test_simulated_backend_streams_incrementally():
+    """Test that the first streamed event arrives before the full latency."""
+    backend = SimulatedLatencyBackend(latency=0.2)
+    service = AIGatewayService(backend=backend)
+    start = time.perf_counter()
+    events = []
+    async for event in service.stream_slide_content("Streaming"):
+        if not events:
+            first_event_at = time.perf_counter() - start
+        events.append(event)
+    assert first_event_at < 0.1
+    assert events[1] == {"event": "title", "data": "Streaming Overview"}
+    assert service.limiter.in_flight == 0
+
+
+async def test_batch_uses_native_batching():
+    """Test that batch-capable backends receive one call for all misses."""
+    calls = []
+
+    class RecordingBackend(SimulatedLatencyBackend):
+        async def generate_batch(self, requests):
+            calls.append(list(requests))
+            return await super().generate_batch(requests)
+
+    service = AIGatewayService(backend=RecordingBackend(latency=0))
+    slides = [(f"Topic {n}", "content") for n in range(10)]
+    results = await service.generate_batch_async(slides)
+    assert [r["topic"] for r in results] == [topic for topic, _ in slides]
+    assert calls == [slides]
+
+
+async def test_batch_fan_out_respects_parallelism():
+    """Test the parallelism cap for backends without native batching."""
+    backend = SimulatedLatencyBackend(latency=0.01)
+    backend.supports_batch = False
+    service = AIGatewayService(backend=backend)
+    slides = [(f"Topic {n}", "content") for n in range(12)]
+    results = await service.generate_batch_async(slides, max_parallelism=3)
+    assert [r["topic"] for r in results] == [topic for topic, _ in slides]
+    assert service.limiter.peak == 3
+
+
+async def test_populate_presentation_failure_marks_job_failed():
+    """Test that a failing backend fails both the job and the presentation."""
+
+    def generate(topic, slide_type):
+        raise RuntimeError("model unavailable")
+
+    service = AIGatewayService(backend=SyncBackend(generate, offload=False))
+    job = service.start_presentation_population("Deck", "Author", "template_002")
+    await service.populate_presentation(job["id"])
+    job = service.get_job(job["id"])
+    assert job["status"] == "failed"
+    assert "model unavailable" in job["error"]
+    presentation = service.get_presentation_by_id(job["presentation_id"])
+    assert presentation["status"] == "failed"
+    assert presentation["slides_count"] == 0
@@ -0,0 +1,29 @@
+"""Tests for the benchmark suite helpers."""
+
+from benchmarks.harness import compare, percentile, summarize
+from benchmarks.load import missing_routes
+from gen_ai_gateway.apps.main import app
+
+
+def test_every_route_has_a_load_scenario():
+    """Test that the load generator covers every API route."""
+    assert missing_routes(app) == []
+
+
+def test_summarize_percentiles():
+    """Test nearest-rank percentiles and throughput."""
+    samples = [n / 1000 for n in range(1, 101)]
+    summary = summarize(samples, elapsed=2.0)
+    assert summary["p50_ms"] == 50
+    assert summary["p99_ms"] == 99
+    assert summary["rps"] == 50
+    assert percentile([], 0.5) == 0.0
+
+
+def test_compare_flags_regressions():
+    """Test regression detection with relative tolerance and a noise floor."""
+    baseline = {"a": {"p95_ms": 1.0, "rps": 1000.0}, "b": {"p95_ms": 0.01, "rps": 10.0}}
+    results = {"a": {"p95_ms": 1.6, "rps": 400.0}, "b": {"p95_ms": 0.2, "rps": 10.0}}
+    regressions = compare(results, baseline, tolerance=0.5)
+    assert len(regressions) == 2
+    assert all(line.startswith("a: ") for line in regressions)
@@ -0,0 +1,100 @@
+"""Tests for the generation cache."""
+
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend
+from gen_ai_gateway.src.cache import DirectoryCacheTier, GenerationCache, cache_key
+from gen_ai_gateway.src.services import AIGatewayService
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalization():
+    """Test that formatting differences share a key but backends do not."""
+    key = cache_key("AI  in Healthcare ", "content", "mock", "1")
+    assert key == cache_key("ai in healthcare", "Content", "mock", "1")
+    assert key != cache_key("ai in healthcare", "title", "mock", "1")
+    assert key != cache_key("ai in healthcare", "content", "mock", "2")
+
+
+def test_lru_eviction_by_memory_budget():
+    """Test that the least recently used entry is evicted first."""
+    cache = GenerationCache(max_bytes=40)
+    cache.set("a", {"v": "x" * 10})
+    cache.set("b", {"v": "y" * 10})
+    assert cache.get("a") is not None
+    cache.set("c", {"v": "z" * 10})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "x" * 10}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 40
+
+
+def test_ttl_expiry():
+    """Test that entries expire after their TTL."""
+    clock = FakeClock()
+    cache = GenerationCache(ttl=10, clock=clock)
+    cache.set("a", {"v": 1})
+    clock.now += 5
+    assert cache.get("a") == {"v": 1}
+    clock.now += 6
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_returned_values_are_independent():
+    """Test that callers cannot mutate cached entries."""
+    cache = GenerationCache()
+    cache.set("a", {"items": [1]})
+    cache.get("a")["items"].append(2)
+    assert cache.get("a") == {"items": [1]}
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that a new cache instance reads entries from the disk tier."""
+    GenerationCache(disk=DirectoryCacheTier(str(tmp_path))).set("k" * 64, {"v": 1})
+    restarted = GenerationCache(disk=DirectoryCacheTier(str(tmp_path)))
+    assert restarted.get("k" * 64) == {"v": 1}
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.get("k" * 64) == {"v": 1}
+    assert restarted.stats()["hits"] == 1
+
+
+async def test_service_serves_repeats_from_cache():
+    """Test that the service only calls the backend once per normalized request."""
+    calls = []
+
+    def generate(topic, slide_type):
+        calls.append(topic)
+        return {"topic": topic, "slide_type": slide_type, "generated_at": "now"}
+
+    service = AIGatewayService(
+        backend=SimulatedLatencyBackend(latency=0, generate=generate),
+        cache=GenerationCache(),
+    )
+    await service.generate_slide_content_async("Quantum Computing")
+    content = await service.generate_slide_content_async("quantum  computing")
+    assert calls == ["Quantum Computing"]
+    assert content["topic"] == "quantum  computing"
+    assert service.get_cache_stats()["hits"] == 1
+
+
+async def test_completed_streams_are_cached():
+    """Test that a streamed slide is stored and served to later requests."""
+    backend = SimulatedLatencyBackend(latency=0)
+    service = AIGatewayService(backend=backend, cache=GenerationCache())
+    events = [event async for event in service.stream_slide_content("Quantum Computing")]
+    content = await service.generate_slide_content_async("quantum computing")
+    assert service.get_cache_stats()["hits"] == 1
+    assert content["title"] == "Quantum Computing Overview"
+    assert content["generated_at"] == events[-1]["data"]["generated_at"]
+    assert len(content["content"]["bullet_points"]) == 3
+    replayed = [event async for event in service.stream_slide_content("Quantum Computing")]
+    assert replayed == events
@@ -0,0 +1,149 @@
+"""Tests for the write-ahead logged presentation store."""
+
+import os
+import threading
+
+import pytest
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.services import AIGatewayService
+from ppt_wrapper import PPTWrapper
+from ppt_wrapper.durable_store import SNAPSHOT_NAME, DurablePresentationStore
+
+
+def _open(path, **kwargs):
+    return DurablePresentationStore(str(path), sync="always", **kwargs)
+
+
+def test_reopen_restores_writes(tmp_path):
+    """Test that creates, updates, slides and deletes survive a restart."""
+    store = _open(tmp_path)
+    wrapper = PPTWrapper(store=store)
+    created = wrapper.create_presentation("Durable", "Ann", "template_001")
+    wrapper.update_presentation(created["id"], status="completed", slides_count=2)
+    attached = wrapper.attach_slides(created["id"], [{"title": "one"}, {"title": "two"}])
+    wrapper.delete_presentation("ppt_002")
+    version = store.version()
+    store.close()
+
+    reopened = _open(tmp_path)
+    wrapper = PPTWrapper(store=reopened)
+    assert [record["id"] for record in reopened] == ["ppt_001", "ppt_003", "ppt_004"]
+    restored = wrapper.get_presentation_by_id(created["id"])
+    assert restored["status"] == "completed"
+    assert restored["revision"] == attached["revision"]
+    assert [slide["title"] for slide in wrapper.get_slides(created["id"])] == ["one", "two"]
+    assert reopened.version() == version
+    assert reopened.count("author", "Ann") == 1
+    assert wrapper.create_presentation("Next", "Bob")["id"] == "ppt_005"
+    reopened.close()
+
+
+def test_snapshot_then_replays_only_the_tail(tmp_path):
+    """Test that a snapshot replaces older log segments and the tail is replayed."""
+    store = _open(tmp_path, snapshot_every=5)
+    for n in range(12):
+        store.add({"id": f"ppt_{n + 1:03d}", "author": "Ann", "slides_count": 1})
+    store.update("ppt_003", {"status": "completed"})
+    version = store.version()
+    store.close()
+
+    files = sorted(os.listdir(tmp_path))
+    assert SNAPSHOT_NAME in files
+    assert len([name for name in files if name.startswith("wal-")]) == 1
+
+    reopened = _open(tmp_path)
+    assert len(reopened) == 12
+    assert reopened.get("ppt_003")["status"] == "completed"
+    assert reopened.total_slides() == 12
+    assert reopened.version() == version
+    reopened.snapshot()
+    reopened.add({"id": "ppt_013"})
+    reopened.close()
+    assert len(_open(tmp_path)) == 13
+
+
+def test_snapshots_run_in_the_background(tmp_path):
+    """Test that writes neither take nor wait for a due snapshot."""
+    store = _open(tmp_path, snapshot_every=3)
+    gate, writing = threading.Event(), threading.Event()
+    write_snapshot = store._write_snapshot
+
+    def slow_write(meta, rows):
+        writing.set()
+        assert gate.wait(5)
+        write_snapshot(meta, rows)
+
+    store._write_snapshot = slow_write
+    for n in range(3):
+        store.add({"id": f"ppt_{n + 1:03d}"})
+    assert writing.wait(5)
+    store.add({"id": "ppt_004"})
+    store.update("ppt_001", {"status": "completed"})
+    assert not os.path.exists(tmp_path / SNAPSHOT_NAME)
+
+    gate.set()
+    store.close()
+    assert os.path.exists(tmp_path / SNAPSHOT_NAME)
+    reopened = _open(tmp_path)
+    assert len(reopened) == 4
+    assert reopened.get("ppt_001")["status"] == "completed"
+    reopened.close()
+
+
+def test_torn_log_tail_is_truncated(tmp_path):
+    """Test recovery from a crash in the middle of a log write."""
+    store = _open(tmp_path)
+    store.add({"id": "ppt_001", "title": "Kept"})
+    store.add({"id": "ppt_002", "title": "Torn"})
+    store.close()
+    (segment,) = [name for name in os.listdir(tmp_path) if name.startswith("wal-")]
+    path = tmp_path / segment
+    path.write_bytes(path.read_bytes()[:-3])
+
+    reopened = _open(tmp_path)
+    assert [record["title"] for record in reopened] == ["Kept"]
+    reopened.add({"id": "ppt_003", "title": "After"})
+    reopened.close()
+    assert [record["id"] for record in _open(tmp_path)] == ["ppt_001", "ppt_003"]
+
+
+def test_add_many_is_logged_as_one_entry(tmp_path):
+    """Test that a bulk insert is recovered as a whole from one log frame."""
+    store = _open(tmp_path)
+    store.add({"id": "ppt_001", "title": "First"})
+    records = [{"id": None, "title": f"Bulk {n}"} for n in range(4)]
+    records.append({"id": "bulk_x", "title": "Bulk 4"})
+    records.append({"id": "bulk_x", "title": "Repeated in batch"})
+    records.append({"id": "ppt_001", "title": "Duplicate"})
+    errors = store.add_many(records)
+    assert errors == [None] * 5 + [
+        "Presentation with ID bulk_x already exists",
+        "Presentation with ID ppt_001 already exists",
+    ]
+    store.close()
+    (segment,) = [name for name in os.listdir(tmp_path) if name.startswith("wal-")]
+    path = tmp_path / segment
+    data = path.read_bytes()
+
+    reopened = _open(tmp_path)
+    assert [record["title"] for record in reopened][-1] == "Bulk 4"
+    assert len(reopened) == 6
+    reopened.close()
+    path.write_bytes(data[:-1])
+    assert [record["title"] for record in _open(tmp_path)] == ["First"]
+
+
+def test_batched_sync_and_settings(tmp_path):
+    """Test the background flusher and building the service on the durable store."""
+    settings = GatewaySettings(
+        store="durable", durable_dir=str(tmp_path), wal_fsync_interval_ms=1
+    )
+    service = AIGatewayService.from_settings(settings)
+    store = service.ppt_wrapper.store
+    assert isinstance(store, DurablePresentationStore)
+    assert store.sync == "batch"
+    service.ppt_wrapper.create_presentation("Batched", "Ann")
+    store.close()
+    assert len(_open(tmp_path)) == 4
+    with pytest.raises(ValueError, match="sync mode"):
+        DurablePresentationStore(str(tmp_path), sync="sometimes")
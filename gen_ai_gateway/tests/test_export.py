@@ -0,0 +1,114 @@
+"""Tests for PPTX rendering and streaming export."""
+
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+from gen_ai_gateway.src.export import PPTXExporter
+from ppt_wrapper import PPTWrapper
+from ppt_wrapper.pptx import build_pptx, slide_specs
+
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def _deck():
+    wrapper = PPTWrapper()
+    presentation = wrapper.get_presentation_by_id("ppt_001")
+    slides = [
+        wrapper.generate_slide_content("Imaging", "content"),
+        wrapper.generate_slide_content("Q&A <live>", "title"),
+        wrapper.generate_slide_content("Extra", "appendix"),
+    ]
+    return presentation, slides, wrapper.get_template_by_id("template_001")
+
+
+def _slide_texts(package: bytes):
+    archive = zipfile.ZipFile(io.BytesIO(package))
+    count = sum(name.startswith("ppt/slides/slide") for name in archive.namelist())
+    texts = []
+    for number in range(1, count + 1):
+        root = ElementTree.fromstring(archive.read(f"ppt/slides/slide{number}.xml"))
+        texts.append([node.text for node in root.iter(f"{A}t")])
+    return texts
+
+
+def test_slides_follow_template_order():
+    """Test the cover, template sections, headings and trailing extra slides."""
+    presentation, slides, template = _deck()
+    specs = slide_specs(presentation, slides, template)
+    assert [spec["title"] for spec in specs] == [
+        "AI in Healthcare",
+        "Q&A <Live> Overview",
+        "Agenda",
+        "Imaging Overview",
+        "Charts",
+        "Conclusion",
+        "Extra Overview",
+    ]
+    assert [spec["layout"] for spec in specs[:3]] == ["title", "title", "content"]
+    assert len(slide_specs(presentation, slides)) == 4
+
+
+def test_package_is_well_formed():
+    """Test that every part parses and the package lists every slide."""
+    presentation, slides, template = _deck()
+    package = build_pptx(presentation, slides, template)
+    archive = zipfile.ZipFile(io.BytesIO(package))
+    assert archive.namelist()[0] == "[Content_Types].xml"
+    assert archive.testzip() is None
+    for name in archive.namelist():
+        ElementTree.fromstring(archive.read(name))
+    root = ElementTree.fromstring(archive.read("ppt/presentation.xml"))
+    assert len(root.find(f"{P}sldIdLst")) == 7
+    texts = _slide_texts(package)
+    assert texts[0] == ["AI in Healthcare", "Dr. Jane Smith", presentation["content"]["summary"]]
+    assert texts[1][0] == "Q&A <Live> Overview"
+    assert build_pptx(presentation, slides, template) == package
+
+
+def test_package_opens_in_python_pptx():
+    """Test that an independent reader accepts the package."""
+    pptx = pytest.importorskip("pptx")
+    presentation, slides, template = _deck()
+    deck = pptx.Presentation(io.BytesIO(build_pptx(presentation, slides, template)))
+    assert [slide.shapes.title.text for slide in deck.slides][:2] == [
+        "AI in Healthcare",
+        "Q&A <Live> Overview",
+    ]
+
+
+async def _export(exporter, *args):
+    return [chunk async for chunk in exporter.export(*args)]
+
+
+async def test_streamed_export_reuses_cached_parts():
+    """Test streaming in several chunks and re-rendering only changed slides."""
+    presentation, slides, template = _deck()
+    exporter = PPTXExporter(workers=0)
+    chunks = await _export(exporter, presentation, slides, template)
+    assert len([chunk for chunk in chunks if chunk]) > 10
+    package = b"".join(chunks)
+    assert _slide_texts(package) == _slide_texts(build_pptx(presentation, slides, template))
+    assert exporter.stats()["rendered"] == 7
+
+    await _export(exporter, presentation, slides, template)
+    assert exporter.stats()["rendered"] == 7
+    assert exporter.stats()["cache_hits"] == 7
+    edited = dict(presentation, title="AI in Medicine")
+    package = b"".join(await _export(exporter, edited, slides, template))
+    assert exporter.stats()["rendered"] == 8
+    assert _slide_texts(package)[0][0] == "AI in Medicine"
+
+
+async def test_process_pool_rendering():
+    """Test rendering slides in worker processes."""
+    presentation, slides, template = _deck()
+    exporter = PPTXExporter(workers=1, cache_entries=0)
+    try:
+        package = b"".join(await _export(exporter, presentation, slides, template))
+    finally:
+        exporter.close()
+    assert _slide_texts(package) == _slide_texts(build_pptx(presentation, slides, template))
+    assert exporter.stats()["cached_parts"] == 0
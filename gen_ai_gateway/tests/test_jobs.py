@@ -0,0 +1,55 @@
+"""Tests for background job tracking."""
+
+import pytest
+
+from gen_ai_gateway.src.jobs import JobManager
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _finish(jobs: JobManager, job_id: str) -> None:
+    async with jobs.track(job_id):
+        pass
+
+
+async def test_finished_jobs_expire_after_ttl():
+    """Finished jobs are dropped once their TTL has passed."""
+    clock = FakeClock()
+    jobs = JobManager(ttl=60, clock=clock)
+    done = jobs.create("populate")
+    pending = jobs.create("populate")
+    await _finish(jobs, done["id"])
+
+    clock.now = 59
+    assert jobs.get(done["id"])["status"] == "completed"
+
+    clock.now = 61
+    with pytest.raises(ValueError):
+        jobs.get(done["id"])
+    # Unfinished jobs are kept however old they are.
+    assert jobs.get(pending["id"])["status"] == "pending"
+    assert len(jobs) == 1
+    assert jobs.evicted == 1
+
+
+async def test_oldest_finished_jobs_are_evicted_above_the_limit():
+    """At most ``max_finished`` finished jobs are kept, newest first."""
+    jobs = JobManager(max_finished=2)
+    running = jobs.create("populate")
+    finished = [jobs.create("populate")["id"] for _ in range(4)]
+    for job_id in finished:
+        await _finish(jobs, job_id)
+
+    assert len(jobs) == 3
+    for job_id in finished[:2]:
+        with pytest.raises(ValueError):
+            jobs.get(job_id)
+    for job_id in finished[2:]:
+        assert jobs.get(job_id)["status"] == "completed"
+    assert jobs.get(running["id"])["status"] == "pending"
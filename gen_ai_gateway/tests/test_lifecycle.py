@@ -0,0 +1,145 @@
+"""Tests for lazy and background service startup."""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend
+from gen_ai_gateway.src.lifecycle import LazyService, ServiceUnavailable
+from gen_ai_gateway.src.services import AIGatewayService
+
+
+def _gated_factory(gate, built):
+    def factory():
+        gate.wait(5)
+        service = AIGatewayService()
+        built.append(service)
+        return service
+
+    return factory
+
+
+def test_background_start_reports_loading_then_ready():
+    """Test that requests are refused while loading and served once warm."""
+    gate = threading.Event()
+    built, warmed = [], []
+    runtime = LazyService(_gated_factory(gate, built), warm=warmed.append)
+    runtime.start()
+    assert runtime.state == "loading"
+    with pytest.raises(ServiceUnavailable) as error:
+        runtime.get()
+    assert error.value.retry_after_header == "1"
+
+    gate.set()
+    assert runtime.wait(5)
+    assert runtime.get() is built[0]
+    assert warmed == built
+    assert runtime.status()["load_seconds"] >= 0
+    runtime.start()
+    assert len(built) == 1
+
+
+def test_first_use_builds_synchronously_without_warming():
+    """Test that a runtime that was never started builds on first access."""
+    warmed = []
+    runtime = LazyService(AIGatewayService, warm=warmed.append)
+    assert runtime.state == "idle"
+    service = runtime.get()
+    assert runtime.get() is service and runtime.state == "ready"
+    assert warmed == []
+
+
+def test_failed_load_is_reported():
+    """Test that a failing factory leaves the runtime in the failed state."""
+
+    def factory():
+        raise RuntimeError("catalogue missing")
+
+    runtime = LazyService(factory)
+    runtime.start()
+    assert not runtime.wait(5)
+    assert runtime.status()["error"] == "catalogue missing"
+    with pytest.raises(ServiceUnavailable, match="failed"):
+        runtime.get()
+
+
+def test_warm_encodes_first_presentations():
+    """Test that warming fills the templates and presentation response caches."""
+    service = AIGatewayService(bulk_batch_size=2)
+    service.warm(presentations=3)
+    assert service._templates_resource is not None
+    assert service.presentation_json.stats()["entries"] == 3
+
+
+def test_app_reports_readiness_during_background_load(monkeypatch):
+    """Test that / answers 503 while loading and routes wait for the service."""
+    from gen_ai_gateway.apps import main
+
+    gate = threading.Event()
+    monkeypatch.setattr(main, "runtime", LazyService(_gated_factory(gate, [])))
+    with TestClient(main.app) as client:
+        health = client.get("/")
+        assert health.status_code == 503
+        assert health.json()["status"] == "starting"
+        assert health.json()["state"] == "loading"
+        templates = client.get("/templates")
+        assert templates.status_code == 503
+        assert templates.headers["retry-after"] == "1"
+
+        gate.set()
+        assert main.runtime.wait(5)
+        health = client.get("/")
+        assert health.status_code == 200
+        assert health.json()["status"] == "healthy"
+        assert health.json()["state"] == "ready"
+        assert client.get("/templates").status_code == 200
+
+
+def test_shutdown_closes_backend_connections(monkeypatch):
+    """Test that the lifespan closes the backend when the server stops."""
+    from gen_ai_gateway.apps import main
+
+    closed = []
+
+    class ClosingBackend(SimulatedLatencyBackend):
+        async def aclose(self):
+            closed.append(self)
+
+    backend = ClosingBackend(latency=0)
+    runtime = LazyService(lambda: AIGatewayService(backend=backend))
+    monkeypatch.setattr(main, "runtime", runtime)
+    with TestClient(main.app) as client:
+        assert runtime.wait(5)
+        assert client.post("/generate", json={"topic": "Shutdown"}).status_code == 200
+        assert closed == []
+    assert closed == [backend]
+
+
+def test_importing_the_app_defers_optional_modules():
+    """Test that stores, export workers and NumPy load only when used."""
+    deferred = [
+        "gen_ai_gateway.src.export",
+        "gen_ai_gateway.src.routing",
+        "gen_ai_gateway.src.semantic",
+        "multiprocessing",
+        "numpy",
+        "ppt_wrapper.durable_store",
+        "ppt_wrapper.pptx",
+        "ppt_wrapper.sqlite_store",
+        "sqlite3",
+    ]
+    script = (
+        "import sys; import gen_ai_gateway.apps.main; "
+        f"print(','.join(m for m in {deferred!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
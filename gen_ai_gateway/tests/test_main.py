@@ -1,5 +1,12 @@
 """Tests for the main FastAPI application."""
 
+import asyncio
+import io
+import json
+import zipfile
+
+import httpx
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -38,6 +45,62 @@ def test_get_nonexistent_presentation(client: TestClient):
     assert response.status_code == 404
 
 
+def test_presentation_responses_follow_updates(client: TestClient):
+    """Test that pre-encoded presentation bodies are refreshed after writes."""
+    from gen_ai_gateway.apps.main import runtime
+
+    ai_service = runtime.get()
+
+    created = client.post("/presentations", json={"title": "Draft", "author": "Eve"}).json()
+    assert "revision" not in created
+    assert client.get(f"/presentations/{created['id']}").json() == created
+
+    ai_service.ppt_wrapper.update_presentation(created["id"], title="Final")
+    response = client.get(f"/presentations/{created['id']}")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["title"] == "Final"
+    listed = client.get("/presentations", params={"author": "Eve"}).json()
+    assert [p["title"] for p in listed] == ["Final"]
+
+
+def test_presentation_etag_and_not_modified(client: TestClient, monkeypatch):
+    """Test ETag validation of a presentation without re-reading the store."""
+    from gen_ai_gateway.apps.main import runtime
+
+    ai_service = runtime.get()
+
+    created = client.post("/presentations", json={"title": "Tagged", "author": "Eve"}).json()
+    path = f"/presentations/{created['id']}"
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "public, no-cache"
+
+    store = ai_service.ppt_wrapper.store
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "get", lambda presentation_id: pytest.fail("store read"))
+        response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    ai_service.ppt_wrapper.update_presentation(created["id"], title="Retitled")
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Retitled"
+
+
+def test_templates_etag(client: TestClient):
+    """Test that templates carry a stable ETag and honour If-None-Match."""
+    first = client.get("/templates")
+    etag = first.headers["etag"]
+    assert "max-age=" in first.headers["cache-control"]
+    assert client.get("/templates").headers["etag"] == etag
+    response = client.get("/templates", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert client.get("/templates", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
 def test_create_presentation(client: TestClient):
     """Test creating a new presentation."""
     payload = {
@@ -86,3 +149,287 @@ def test_get_stats(client: TestClient):
     assert "completed_presentations" in data
     assert "total_slides" in data
     assert "available_templates" in data
+
+
+def test_get_stats_breakdowns(client: TestClient):
+    """Test the status and author breakdowns on the stats endpoint."""
+    response = client.get("/stats", params={"author": "Dr. Jane Smith"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["by_status"]["completed"] >= 2
+    assert data["author_presentations"] == 1
+
+
+def test_get_presentations_pagination(client: TestClient):
+    """Test cursor pagination over the presentations listing."""
+    first = client.get("/presentations", params={"limit": 2})
+    assert first.status_code == 200
+    assert [p["id"] for p in first.json()] == ["ppt_001", "ppt_002"]
+    cursor = first.headers["X-Next-Cursor"]
+    assert 'rel="next"' in first.headers["Link"]
+
+    second = client.get("/presentations", params={"limit": 2, "after": cursor})
+    assert second.status_code == 200
+    assert second.json()[0]["id"] == "ppt_003"
+
+
+def test_get_presentations_filter_and_fields(client: TestClient):
+    """Test server-side filtering and field projection."""
+    response = client.get(
+        "/presentations", params={"status": "completed", "fields": "id,status"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["id"] for p in data][:2] == ["ppt_001", "ppt_003"]
+    assert all(set(p) == {"id", "status"} for p in data)
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_presentations_bad_params(client: TestClient):
+    """Test rejection of unknown fields and malformed cursors."""
+    assert client.get("/presentations", params={"fields": "id,secret"}).status_code == 400
+    assert client.get("/presentations", params={"after": "!!"}).status_code == 400
+
+
+def test_generate_content_stream_ndjson(client: TestClient):
+    """Test streaming generation as newline-delimited JSON."""
+    payload = {"topic": "Machine Learning", "slide_type": "content"}
+    response = client.post("/generate/stream", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    names = [event["event"] for event in events]
+    assert names[0] == "start"
+    assert names[1] == "title"
+    assert names.count("bullet_point") == 3
+    assert names[-1] == "done"
+
+
+def test_generate_content_stream_sse(client: TestClient):
+    """Test streaming generation as server-sent events."""
+    payload = {"topic": "Machine Learning"}
+    response = client.post(
+        "/generate/stream", json=payload, headers={"Accept": "text/event-stream"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: start\ndata: ")
+    assert "event: done" in response.text
+
+
+def test_get_cache_stats(client: TestClient):
+    """Test the generation cache statistics endpoint."""
+    payload = {"topic": "Cache Warmup", "slide_type": "content"}
+    client.post("/generate", json=payload)
+    client.post("/generate", json=payload)
+    response = client.get("/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["hits"] >= 1
+    assert "evictions" in data
+
+
+def test_generate_batch(client: TestClient):
+    """Test generating an explicit list of slides in order."""
+    payload = {
+        "requests": [
+            {"topic": "Batch One", "slide_type": "title"},
+            {"topic": "Batch Two"},
+        ]
+    }
+    response = client.post("/generate/batch", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert [(d["topic"], d["slide_type"]) for d in data] == [
+        ("Batch One", "title"),
+        ("Batch Two", "content"),
+    ]
+
+
+def test_generate_batch_from_template_stream(client: TestClient):
+    """Test streaming a template-driven batch as NDJSON."""
+    payload = {"template_id": "template_003", "topic": "Pitch", "stream": True}
+    response = client.post("/generate/batch", json=payload)
+    assert response.status_code == 200
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in items) == [0, 1, 2, 3, 4]
+    slide_types = {item["index"]: item["result"]["slide_type"] for item in items}
+    assert slide_types[0] == "problem"
+    assert slide_types[4] == "team"
+
+
+def test_generate_batch_validation(client: TestClient):
+    """Test batch request validation and unknown templates."""
+    assert client.post("/generate/batch", json={}).status_code == 422
+    assert client.post("/generate/batch", json={"template_id": "template_001"}).status_code == 422
+    payload = {"template_id": "nonexistent", "topic": "x"}
+    assert client.post("/generate/batch", json=payload).status_code == 404
+
+
+def test_generate_batch_size_limit(client: TestClient, monkeypatch):
+    """Test that batches over the configured size get a validation error."""
+    from gen_ai_gateway.apps import main
+
+    monkeypatch.setattr(main.settings, "batch_max_requests", 3)
+    requests = [{"topic": f"Topic {n}"} for n in range(4)]
+    response = client.post("/generate/batch", json={"requests": requests})
+    assert response.status_code == 422
+    error = response.json()["detail"][0]
+    assert error["type"] == "too_long" and error["loc"] == ["body", "requests"]
+    assert error["ctx"]["max_length"] == 3
+    assert client.post("/generate/batch", json={"requests": requests[1:]}).status_code == 200
+    response = client.post("/generate/batch", json={"template_id": "template_001", "topic": "AI"})
+    assert response.status_code == 200
+
+
+def test_populate_presentation(client: TestClient):
+    """Test creating a presentation whose slides are generated in the background."""
+    payload = {
+        "title": "Quarterly Review",
+        "author": "Populate Author",
+        "template_id": "template_001",
+        "topics": ["Revenue", "Hiring"],
+    }
+    response = client.post("/presentations/populate", json=payload)
+    assert response.status_code == 202
+    job = response.json()
+    presentation_id = job["presentation_id"]
+
+    job = client.get(f"/jobs/{job['id']}").json()
+    assert job["status"] == "completed"
+    presentation = client.get(f"/presentations/{presentation_id}").json()
+    assert presentation["status"] == "completed"
+    assert presentation["slides_count"] == 5
+    assert presentation["content"]["key_topics"] == ["Revenue", "Hiring"]
+
+    slides = client.get(f"/presentations/{presentation_id}/slides").json()
+    assert [s["slide_type"] for s in slides] == [
+        "title", "agenda", "content", "charts", "conclusion"
+    ]
+    assert [s["topic"] for s in slides][:3] == ["Revenue", "Hiring", "Revenue"]
+
+
+def test_populate_presentation_errors(client: TestClient):
+    """Test unknown templates, jobs and presentations."""
+    payload = {"title": "X", "author": "Y", "template_id": "nonexistent"}
+    assert client.post("/presentations/populate", json=payload).status_code == 400
+    assert client.get("/jobs/nonexistent").status_code == 404
+    assert client.get("/presentations/nonexistent/slides").status_code == 404
+
+
+def test_create_presentation_with_unknown_template(client: TestClient):
+    """Test that an unknown template is rejected without storing a presentation."""
+    from gen_ai_gateway.apps.main import runtime
+
+    before = len(runtime.get().ppt_wrapper.store)
+    payload = {"title": "Orphan", "author": "Ann", "template_id": "nonexistent"}
+    response = client.post("/presentations", json=payload)
+    assert response.status_code == 400
+    assert "nonexistent" in response.json()["detail"]
+    assert len(runtime.get().ppt_wrapper.store) == before
+
+
+def test_search_presentations(client: TestClient):
+    """Test the full-text search endpoint."""
+    created = client.post(
+        "/presentations", json={"title": "Ocean Robotics", "author": "Searcher"}
+    ).json()
+    response = client.get("/presentations/search", params={"q": "ocean robotics"})
+    assert response.status_code == 200
+    hits = response.json()
+    assert hits[0]["presentation"] == created
+    assert hits[0]["score"] > 0
+    response = client.get("/presentations/search", params={"q": "climate", "limit": 1})
+    assert [hit["presentation"]["id"] for hit in response.json()] == ["ppt_003"]
+    assert client.get("/presentations/search").status_code == 422
+    assert client.get("/presentations/search", params={"q": "zzzz"}).json() == []
+
+
+def test_search_presentations_errors(client: TestClient, monkeypatch):
+    """Test that search failures get the presentation routes' error shape."""
+    from gen_ai_gateway.apps.main import runtime
+
+    def fail(query, limit):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(runtime.get(), "search_presentations", fail)
+    response = client.get("/presentations/search", params={"q": "ocean"})
+    assert response.status_code == 500
+    assert response.json() == {"detail": "index unavailable"}
+
+
+def test_export_presentation(client: TestClient):
+    """Test downloading a presentation as a PPTX package."""
+    response = client.get("/presentations/ppt_002/export.pptx")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+    )
+    assert 'filename="ppt_002.pptx"' in response.headers["content-disposition"]
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert "ppt/slides/slide1.xml" in archive.namelist()
+    assert b"Future of Transportation" in archive.read("ppt/slides/slide1.xml")
+    assert client.get("/presentations/nope/export.pptx").status_code == 404
+
+
+def test_bulk_import_and_export(client: TestClient):
+    """Test NDJSON import with per-line errors and re-exporting the records."""
+    lines = [
+        json.dumps({"title": "Bulk One", "author": "Bulk Loader"}),
+        "",
+        json.dumps({"title": "Missing author"}),
+        "{not json",
+        json.dumps(
+            {
+                "id": "bulk_002",
+                "title": "Bulk Two",
+                "author": "Bulk Loader",
+                "status": "completed",
+                "slides_count": 3,
+                "content": {"summary": "S", "key_topics": ["K"], "audience": "A"},
+            }
+        ),
+        json.dumps({"id": "ppt_001", "title": "Duplicate", "author": "Bulk Loader"}),
+    ]
+    response = client.post("/presentations/bulk", content="\n".join(lines))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result.get("line") for result in results] == [1, 3, 4, 5, 6, None]
+    assert "id" in results[0] and results[3] == {"line": 5, "id": "bulk_002"}
+    assert results[1]["error"] == "author: Field required"
+    assert "Invalid JSON" in results[2]["error"]
+    assert "already exists" in results[4]["error"]
+    assert results[-1] == {"summary": {"lines": 5, "imported": 2, "failed": 3}}
+
+    exported = client.get("/presentations/export", params={"author": "Bulk Loader"})
+    assert exported.status_code == 200
+    records = [json.loads(line) for line in exported.text.splitlines()]
+    assert [record["title"] for record in records] == ["Bulk One", "Bulk Two"]
+    assert records[0]["status"] == "draft"
+    assert records[1] == client.get("/presentations/bulk_002").json()
+    assert client.get("/presentations/search", params={"q": "bulk two"}).json()
+
+    reimported = client.post("/presentations/bulk", content=exported.content)
+    summary = [json.loads(line) for line in reimported.text.splitlines()][-1]
+    assert summary == {"summary": {"lines": 2, "imported": 0, "failed": 2}}
+
+
+async def test_bulk_import_streams_multi_chunk_body():
+    """Test that a body sent in many chunks is read to the end while results stream."""
+    from gen_ai_gateway.apps.main import app
+
+    async def body():
+        for n in range(50):
+            line = json.dumps({"title": f"Chunked {n}", "author": "Chunked Loader"})
+            yield line[:10].encode()
+            yield line[10:].encode() + b"\n"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await asyncio.wait_for(
+            client.post("/presentations/bulk", content=body()), timeout=10
+        )
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results[-1] == {"summary": {"lines": 50, "imported": 50, "failed": 0}}
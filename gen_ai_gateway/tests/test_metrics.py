@@ -0,0 +1,65 @@
+"""Tests for gateway metrics."""
+
+from fastapi.testclient import TestClient
+from gen_ai_gateway.src.backends import SyncBackend
+from gen_ai_gateway.src.metrics import Histogram, MetricsRegistry
+from gen_ai_gateway.src.services import AIGatewayService
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket placement, sum and count of a histogram."""
+    histogram = Histogram("latency", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, "/")
+    samples = {(name, labels.get("le")): value for name, labels, value in histogram.samples()}
+    assert samples[("latency_bucket", "0.1")] == 2
+    assert samples[("latency_bucket", "1")] == 3
+    assert samples[("latency_bucket", "+Inf")] == 4
+    assert samples[("latency_count", None)] == 4
+    assert samples[("latency_sum", None)] == 5.65
+    assert histogram.count("/") == 4
+
+
+def test_render_escapes_labels():
+    """Test Prometheus text rendering."""
+    registry = MetricsRegistry()
+    registry.http_requests.inc("GET", '/a"b', "200")
+    text = registry.render()
+    assert "# TYPE gateway_http_requests_total counter" in text
+    assert 'gateway_http_requests_total{method="GET",route="/a\\"b",status="200"} 1' in text
+
+
+async def test_service_records_generation_timings():
+    """Test backend timings by outcome and scrape-time service statistics."""
+
+    def generate(topic, slide_type):
+        if topic == "fail":
+            raise RuntimeError("boom")
+        return {"topic": topic, "slide_type": slide_type}
+
+    registry = MetricsRegistry()
+    service = AIGatewayService(backend=SyncBackend(generate, offload=False), metrics=registry)
+    await service.generate_slide_content_async("ok")
+    try:
+        await service.generate_slide_content_async("fail")
+    except RuntimeError:
+        pass
+    assert registry.generation_latency.count("sync", "generate", "ok") == 1
+    assert registry.generation_latency.count("sync", "generate", "error") == 1
+    assert "gateway_single_flight_executions 2" in registry.render()
+
+
+def test_metrics_endpoint(client: TestClient):
+    """Test that requests show up on /metrics by route template."""
+    client.get("/presentations/ppt_001")
+    client.get("/presentations/nonexistent")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert (
+        'gateway_http_requests_total{method="GET",route="/presentations/{presentation_id}",'
+        'status="404"}' in text
+    )
+    assert 'gateway_http_request_duration_seconds_bucket{method="GET",' in text
+    assert "gateway_generation_slots_limit" in text
@@ -110,3 +110,57 @@ def test_get_presentation_stats():
     
     assert stats["total_presentations"] == 3
     assert stats["available_templates"] == 3
+
+
+def test_presentation_stats_track_writes():
+    """Test that statistics follow creates, updates and deletes."""
+    wrapper = PPTWrapper()
+    stats = wrapper.get_presentation_stats()
+    assert stats["completed_presentations"] == 2
+    assert stats["total_slides"] == 75
+    assert stats["by_status"] == {"completed": 2, "in_progress": 1}
+
+    created = wrapper.create_presentation("Deck", "Test Author", "template_002")
+    wrapper.update_presentation(created["id"], status="completed", slides_count=5)
+    stats = wrapper.get_presentation_stats(author="Test Author")
+    assert stats["completed_presentations"] == 3
+    assert stats["total_slides"] == 80
+    assert stats["by_template"] == {"template_002": 1}
+    assert stats["author_presentations"] == 1
+
+    wrapper.delete_presentation("ppt_001")
+    stats = wrapper.get_presentation_stats()
+    assert stats["total_presentations"] == 3
+    assert stats["total_slides"] == 55
+    assert stats["by_status"] == {"completed": 2, "in_progress": 1}
+
+
+def test_list_presentations_pages():
+    """Test walking every page of a filtered listing."""
+    wrapper = PPTWrapper()
+    for n in range(5):
+        wrapper.create_presentation(f"Deck {n}", "Pager")
+    seen = []
+    cursor = None
+    while True:
+        page = wrapper.list_presentations(2, cursor, author="Pager")
+        seen.extend(p["title"] for p in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"Deck {n}" for n in range(5)]
+
+
+def test_attach_slides():
+    """Test attaching generated slides to a presentation."""
+    wrapper = PPTWrapper()
+    created = wrapper.create_presentation("Deck", "Author", "template_001")
+    slide = wrapper.generate_slide_content("Topic", "title")
+    updated = wrapper.attach_slides(
+        created["id"], [slide, slide], key_topics=["Topic"], status="completed"
+    )
+    assert updated["slides_count"] == 2
+    assert updated["status"] == "completed"
+    assert updated["content"]["key_topics"] == ["Topic"]
+    assert wrapper.get_slides(created["id"]) == [slide, slide]
+    assert wrapper.get_presentation_stats()["total_slides"] == 77
@@ -0,0 +1,92 @@
+"""Tests for speculative template slide prefetching."""
+
+import asyncio
+
+import pytest
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend
+from gen_ai_gateway.src.cache import GenerationCache
+from gen_ai_gateway.src.services import AIGatewayService
+
+SLIDES = ["title", "agenda", "content", "charts", "conclusion"]
+
+
+class CountingBackend(SimulatedLatencyBackend):
+    """Simulated backend that counts generations."""
+
+    supports_batch = False
+
+    def __init__(self):
+        super().__init__(latency=0.01)
+        self.calls = 0
+
+    async def generate(self, topic, slide_type="content"):
+        self.calls += 1
+        return await super().generate(topic, slide_type)
+
+
+def _service(max_concurrency=4):
+    backend = CountingBackend()
+    service = AIGatewayService(
+        backend=backend,
+        cache=GenerationCache(),
+        max_concurrency=max_concurrency,
+        prefetch=True,
+    )
+    service.prefetcher.poll_interval = 0.005
+    return service, backend
+
+
+async def _settle(service):
+    while service.prefetcher._pending or service.prefetcher._running:
+        await asyncio.sleep(0.005)
+
+
+async def test_template_slides_are_prefetched_into_the_cache():
+    """Test that creating from a template makes later generations cache hits."""
+    service, backend = _service()
+    service.create_presentation("Quarterly Review", "Ann", "template_001")
+    await _settle(service)
+    assert backend.calls == len(SLIDES)
+
+    for slide_type in SLIDES:
+        content = await service.generate_slide_content_async("Quarterly Review", slide_type)
+        assert content["topic"] == "Quarterly Review"
+    assert backend.calls == len(SLIDES)
+    stats = service.get_cache_stats()["prefetch"]
+    assert stats["generated"] == stats["hits"] == len(SLIDES)
+    assert stats["hit_rate"] == 1.0
+    assert "gateway_prefetch_hits 5" in service.metrics.render()
+
+
+async def test_prefetch_waits_for_idle_capacity():
+    """Test that prefetches only start while the scheduler is mostly idle."""
+    service, backend = _service(max_concurrency=2)
+    await service.limiter.acquire()
+    service.create_presentation("Busy Deck", "Ann", "template_001")
+    await asyncio.sleep(0.05)
+    assert backend.calls == 0
+    assert service.prefetcher.stats()["pending"] == len(SLIDES)
+
+    service.limiter.release()
+    await _settle(service)
+    assert backend.calls == len(SLIDES)
+    assert service.limiter.stats()["peak"] == 1
+
+
+async def test_request_before_prefetch_is_late_and_not_generated_twice():
+    """Test that a slide requested while still queued is left to the request."""
+    service, backend = _service(max_concurrency=2)
+    await service.limiter.acquire()
+    service.create_presentation("Early Deck", "Ann", "template_001")
+    service.limiter.release()
+    await service.generate_slide_content_async("Early Deck", "agenda")
+    await _settle(service)
+    assert backend.calls == len(SLIDES)
+    stats = service.prefetcher.stats()
+    assert stats["late"] == 1 and stats["generated"] == len(SLIDES) - 1
+
+
+def test_prefetch_requires_cache():
+    """Test that prefetching without a generation cache is rejected."""
+    with pytest.raises(ValueError, match="generation cache"):
+        AIGatewayService(prefetch=True)
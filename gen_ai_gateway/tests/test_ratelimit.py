@@ -0,0 +1,227 @@
+"""Tests for rate limiting and tenant concurrency quotas."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from gen_ai_gateway.apps import main
+from gen_ai_gateway.src.lifecycle import LazyService
+from gen_ai_gateway.src.ratelimit import (
+    InMemoryLimiterState,
+    RateLimiter,
+    RateLimitExceeded,
+    SQLiteLimiterState,
+    parse_route_limits,
+)
+
+
+def _use_limiter(monkeypatch, limiter: RateLimiter) -> None:
+    monkeypatch.setattr(main, "limiter_runtime", LazyService(lambda: limiter))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_route_limits():
+    """Test the ``route=rate[:burst]`` format."""
+    assert parse_route_limits("/generate=10:20, /generate/batch=0.5") == {
+        "/generate": (10.0, 20.0),
+        "/generate/batch": (0.5, 1.0),
+    }
+    assert parse_route_limits("") == {}
+    for spec in ("/generate", "/generate=x", "/generate=-1", "=5"):
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            parse_route_limits(spec)
+
+
+def test_token_bucket_refills_at_rate():
+    """Test bursts, rejection with a wait time, and refill."""
+    clock = FakeClock()
+    state = InMemoryLimiterState(clock=clock)
+    assert [state.take("k", rate=2, burst=3) for _ in range(3)] == [0, 0, 0]
+    assert state.take("k", rate=2, burst=3) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert state.take("k", rate=2, burst=3) == 0
+    assert state.take("other", rate=2, burst=3) == 0
+
+
+def test_leases_cap_and_expire():
+    """Test the concurrency quota, release and reclaiming expired leases."""
+    clock = FakeClock()
+    state = InMemoryLimiterState(clock=clock)
+    first = state.acquire_lease("t", limit=2, ttl=10)
+    assert state.acquire_lease("t", limit=2, ttl=10) is not None
+    assert state.acquire_lease("t", limit=2, ttl=10) is None
+    state.release_lease("t", first)
+    assert state.acquire_lease("t", limit=2, ttl=10) is not None
+    clock.now += 11
+    assert state.in_flight("t") == 2
+    assert state.acquire_lease("t", limit=2, ttl=10) is not None
+    assert state.in_flight("t") == 1
+
+
+def test_sqlite_state_is_shared(tmp_path):
+    """Test that two workers on one database share buckets and leases."""
+    clock = FakeClock()
+    path = str(tmp_path / "limits.db")
+    first = SQLiteLimiterState(path, clock=clock)
+    second = SQLiteLimiterState(path, clock=clock)
+    assert first.take("k", rate=1, burst=2) == 0
+    assert second.take("k", rate=1, burst=2) == 0
+    assert first.take("k", rate=1, burst=2) == pytest.approx(1.0)
+    lease = first.acquire_lease("t", limit=1, ttl=10)
+    assert second.acquire_lease("t", limit=1, ttl=10) is None
+    first.release_lease("t", lease)
+    assert second.acquire_lease("t", limit=1, ttl=10) is not None
+
+
+def test_sqlite_state_expires_refilled_buckets(tmp_path):
+    """Test that buckets which have refilled are swept from the table."""
+    clock = FakeClock()
+    state = SQLiteLimiterState(str(tmp_path / "limits.db"), clock=clock, sweep_interval=10)
+    for n in range(5):
+        state.take(f"client{n}", rate=1, burst=2)
+    state.take("busy", rate=0.01, burst=2, cost=2)
+    assert state.buckets() == 6
+    clock.now += 10
+    state.take("client0", rate=1, burst=2)
+    assert state.buckets() == 2
+    assert state.take("busy", rate=0.01, burst=2) == pytest.approx(90.0)
+
+
+async def test_sqlite_state_runs_off_the_event_loop(tmp_path):
+    """Test the async limiter calls against a blocking state."""
+    limiter = RateLimiter(
+        {"/generate": (1, 1)}, max_concurrency=1, state=SQLiteLimiterState(str(tmp_path / "l.db"))
+    )
+    await limiter.check_async("/generate", "ip:a")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check_async("/generate", "ip:a")
+    async with limiter.slot("/generate", "ip:a"):
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire_async("/generate", "ip:a")
+    assert await limiter.acquire_async("/generate", "ip:a") is not None
+
+
+def test_client_key_sources():
+    """Test API key, tenant header and IP identification."""
+    limiter = RateLimiter(key_source="auto", trusted_proxies=["10.0.0.1"], api_keys=["secret"])
+    key = limiter.client_key({"x-api-key": "secret", "x-tenant-id": "acme"}, "1.2.3.4")
+    assert key.startswith("key:") and "secret" not in key
+    assert key == limiter.client_key({"authorization": "Bearer secret"}, None)
+    assert limiter.client_key({"x-api-key": "guess"}, "1.2.3.4") == "ip:1.2.3.4"
+    assert limiter.client_key({"x-tenant-id": "acme"}, "10.0.0.1") == "tenant:acme"
+    assert limiter.client_key({"x-tenant-id": "acme"}, "1.2.3.4") == "ip:1.2.3.4"
+    by_ip = RateLimiter(key_source="ip")
+    assert by_ip.client_key({"x-api-key": "secret"}, "1.2.3.4") == "ip:1.2.3.4"
+    with pytest.raises(ValueError, match="key source"):
+        RateLimiter(key_source="cookie")
+    with pytest.raises(ValueError, match="requires API keys"):
+        RateLimiter(key_source="api_key")
+    with pytest.raises(ValueError, match="requires trusted proxies"):
+        RateLimiter(key_source="tenant")
+
+
+def test_client_key_defaults_to_the_peer_address():
+    """Test that forwarding headers are only trusted from configured proxies."""
+    headers = {"x-forwarded-for": "6.6.6.6, 5.5.5.5", "x-tenant-id": "acme"}
+    assert RateLimiter().client_key(headers, "1.2.3.4") == "ip:1.2.3.4"
+    assert RateLimiter(key_source="auto").client_key(headers, "1.2.3.4") == "ip:1.2.3.4"
+    proxied = RateLimiter(trusted_proxies=["10.0.0.1", "5.5.5.5"])
+    assert proxied.client_key(headers, "10.0.0.1") == "ip:6.6.6.6"
+    assert proxied.client_key(headers, "1.2.3.4") == "ip:1.2.3.4"
+    assert proxied.client_key({}, "10.0.0.1") == "ip:10.0.0.1"
+
+
+def test_generate_returns_429_with_retry_after(client: TestClient, monkeypatch):
+    """Test per-route limits on /generate, separately for each tenant."""
+    limiter = RateLimiter(
+        {"/generate": (0.5, 2)}, key_source="tenant", trusted_proxies=["testclient"]
+    )
+    _use_limiter(monkeypatch, limiter)
+    payload = {"topic": "Limits"}
+    acme = {"X-Tenant-ID": "acme"}
+    for _ in range(2):
+        assert client.post("/generate", json=payload, headers=acme).status_code == 200
+    response = client.post("/generate", json=payload, headers=acme)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+    other = {"X-Tenant-ID": "other"}
+    assert client.post("/generate", json=payload, headers=other).status_code == 200
+    assert client.post("/generate/stream", json=payload, headers=acme).status_code == 200
+    assert limiter.rejections.value("/generate", "rate") == 1
+
+
+def test_tenant_concurrency_quota(client: TestClient, monkeypatch):
+    """Test that a tenant at its in-flight quota is rejected and others are not."""
+    limiter = RateLimiter(max_concurrency=1, key_source="tenant", trusted_proxies=["testclient"])
+    _use_limiter(monkeypatch, limiter)
+    lease = limiter.acquire("/generate", "tenant:busy")
+    payload = {"topic": "Quota"}
+    for path in ("/generate", "/generate/stream"):
+        response = client.post(path, json=payload, headers={"X-Tenant-ID": "busy"})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+    idle = {"X-Tenant-ID": "idle"}
+    assert client.post("/generate", json=payload, headers=idle).status_code == 200
+    assert limiter.state.in_flight("tenant:idle") == 0
+    assert limiter.rejections.value("/generate/stream", "concurrency") == 1
+
+    limiter.release("tenant:busy", lease)
+    response = client.post("/generate/stream", json=payload, headers={"X-Tenant-ID": "busy"})
+    assert response.status_code == 200
+    assert limiter.state.in_flight("tenant:busy") == 0
+
+
+@pytest.mark.parametrize("path", ["/generate/stream", "/generate/batch"])
+async def test_stream_slot_is_released_when_the_client_is_gone(monkeypatch, path):
+    """Test that a stream whose response never starts returns its slot."""
+    limiter = RateLimiter(max_concurrency=1)
+    _use_limiter(monkeypatch, limiter)
+    main.runtime.get()
+    payload = {"topic": "Gone"}
+    if path == "/generate/batch":
+        payload = {"requests": [payload], "stream": True}
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("1.2.3.4", 1234),
+        "server": ("gateway", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("connection reset")
+
+    with pytest.raises(Exception):
+        await main.app(scope, receive, send)
+    assert limiter.state.in_flight("ip:1.2.3.4") == 0
+
+
+async def test_slot_is_released_on_error():
+    """Test that a failing generation gives its concurrency slot back."""
+    limiter = RateLimiter(max_concurrency=1)
+    with pytest.raises(RuntimeError):
+        async with limiter.slot("/generate", "tenant:t"):
+            raise RuntimeError("backend down")
+    async with limiter.slot("/generate", "tenant:t"):
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire("/generate", "tenant:t")
@@ -0,0 +1,77 @@
+"""Tests for the fast JSON response helpers."""
+
+import json
+
+from gen_ai_gateway.src.models import PresentationResponse
+from gen_ai_gateway.src.responses import (
+    EncodedRecordCache,
+    dumps,
+    etag_for,
+    etag_matches,
+)
+from ppt_wrapper import PPTWrapper
+
+
+def test_dumps_matches_json():
+    """Test compact encoding, non-ASCII text and non-string keys."""
+    value = {"title": "Café", "counts": {None: 1, "a": 2}, "items": [1, 2.5, True]}
+    assert json.loads(dumps(value)) == {
+        "title": "Café",
+        "counts": {"null": 1, "a": 2},
+        "items": [1, 2.5, True],
+    }
+
+
+def test_encoded_record_cache_tracks_revisions():
+    """Test that each record version is validated once and updates re-encode."""
+    wrapper = PPTWrapper()
+    cache = EncodedRecordCache(PresentationResponse)
+    record = wrapper.get_presentation_by_id("ppt_001")
+    payload = cache.encode(record)
+    assert json.loads(payload) == PresentationResponse(**record).model_dump()
+    assert cache.encode(wrapper.get_presentation_by_id("ppt_001")) is payload
+    assert cache.stats()["hits"] == 1
+
+    updated = wrapper.update_presentation("ppt_001", title="Renamed")
+    assert json.loads(cache.encode(updated))["title"] == "Renamed"
+    assert cache.stats()["misses"] == 2
+
+
+def test_encode_many_and_bounded_size():
+    """Test JSON array encoding and LRU eviction."""
+    wrapper = PPTWrapper()
+    cache = EncodedRecordCache(PresentationResponse, max_entries=2)
+    records = wrapper.get_presentations()
+    assert [p["id"] for p in json.loads(cache.encode_many(records))] == [
+        "ppt_001",
+        "ppt_002",
+        "ppt_003",
+    ]
+    assert json.loads(cache.encode_many([])) == []
+    assert cache.stats()["entries"] == 2
+
+
+def test_etag_matching():
+    """Test strong ETags and If-None-Match list, weak and wildcard forms."""
+    etag = etag_for(b"[]")
+    assert etag == etag_for(b"[]") != etag_for(b"{}")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"a", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"a"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_lookup_requires_current_store_version():
+    """Test that entries are served without a read only at the checked version."""
+    wrapper = PPTWrapper()
+    cache = EncodedRecordCache(PresentationResponse)
+    version = wrapper.store.version()
+    entry = cache.entry(wrapper.get_presentation_by_id("ppt_002"), version)
+    assert cache.lookup("ppt_002", version) is entry
+
+    wrapper.update_presentation("ppt_001", status="completed")
+    assert cache.lookup("ppt_002", wrapper.store.version()) is None
+    again = cache.entry(wrapper.get_presentation_by_id("ppt_002"), wrapper.store.version())
+    assert again is entry
+    assert cache.lookup("ppt_002", wrapper.store.version()) is entry
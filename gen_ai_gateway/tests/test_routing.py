@@ -0,0 +1,164 @@
+"""Tests for multi-backend routing, hedging and circuit breakers."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from gen_ai_gateway.src.backends import (
+    BackendError,
+    HTTPBackend,
+    SimulatedLatencyBackend,
+    build_backend,
+)
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.routing import (
+    BackendRouter,
+    CircuitBreaker,
+    NoBackendAvailable,
+    RoutedBackend,
+    parse_backend_specs,
+)
+from gen_ai_gateway.src.services import AIGatewayService
+from ppt_wrapper import PPTWrapper
+
+
+def _member(name, weight=1.0, breaker=None, **options):
+    return RoutedBackend(SimulatedLatencyBackend(name=name, **options), weight, breaker)
+
+
+async def _latencies(backend, calls):
+    async def timed(n):
+        start = time.perf_counter()
+        await backend.generate(f"Topic {n}")
+        return time.perf_counter() - start
+
+    return sorted(await asyncio.gather(*(timed(n) for n in range(calls))))
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the closed, open and half-open transitions of a breaker."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 5.0
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opened == 2
+
+    now[0] = 10.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_selection_strategies():
+    """Test weighted and least-latency selection, skipping open breakers."""
+    heavy, light = _member("heavy", weight=3), _member("light", weight=1)
+    router = BackendRouter([heavy, light], strategy="weighted", seed=7)
+    picks = [router.select().name for _ in range(1000)]
+    assert 650 < picks.count("heavy") < 850
+
+    router = BackendRouter([heavy, light], strategy="least_latency")
+    heavy.latency.add(0.2)
+    assert router.select() is light
+    light.latency.add(0.5)
+    assert router.select() is heavy
+    for _ in range(5):
+        heavy.breaker.record_failure()
+    assert router.select() is light
+
+
+async def test_hedging_cuts_tail_latency():
+    """Test that hedging on a second backend removes latency spikes."""
+
+    def members():
+        return [
+            _member("spiky", latency=0.005, slow_rate=0.2, slow_latency=0.3, seed=1),
+            _member("steady", latency=0.02, seed=2),
+        ]
+
+    plain = BackendRouter(members()[:1], hedge=False)
+    hedged = BackendRouter(members(), min_samples=10, initial_budget=0.05)
+    plain_latencies = await _latencies(plain, 100)
+    hedged_latencies = await _latencies(hedged, 100)
+    assert plain_latencies[98] > 0.3
+    assert hedged_latencies[98] < 0.15
+    assert hedged.hedges > 0 and hedged.hedge_wins > 0
+    assert hedged.members[0].in_flight == hedged.members[1].in_flight == 0
+
+
+async def test_failures_fail_over_and_open_the_breaker():
+    """Test failover to a healthy backend and exclusion of a failing one."""
+    broken = _member("broken", breaker=CircuitBreaker(3), latency=0.001, failure_rate=1.0)
+    healthy = _member("healthy", latency=0.01)
+    router = BackendRouter([broken, healthy], strategy="weighted", hedge=False, seed=3)
+    for n in range(20):
+        content = await router.generate(f"Topic {n}")
+        assert content["topic"] == f"Topic {n}"
+    assert broken.breaker.state == "open"
+    assert broken.errors == router.failovers == 3
+
+    events = [event async for event in router.stream("Streamed")]
+    assert events[0]["event"] == "start" and events[-1]["event"] == "done"
+
+    for _ in range(5):
+        healthy.breaker.record_failure()
+    with pytest.raises(NoBackendAvailable):
+        await router.generate("Nowhere")
+    assert router.rejected == 1
+
+
+async def test_http_backend_posts_through_pooled_client():
+    """Test the HTTP backend against a mock transport."""
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        if b"Broken" in request.content:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"title": "Remote", "slide_type": "content"})
+
+    backend = HTTPBackend(
+        "http://model.test/generate", name="remote", transport=httpx.MockTransport(handle)
+    )
+    assert (await backend.generate("AI"))["title"] == "Remote"
+    await backend.generate("More AI")
+    assert requests[0].url == "http://model.test/generate"
+    assert b'"topic":"AI"' in requests[0].content.replace(b" ", b"")
+    assert len(backend._clients) == 1
+    with pytest.raises(BackendError, match="remote"):
+        await backend.generate("Broken")
+    router = BackendRouter([RoutedBackend(backend), _member("local")])
+    await router.aclose()
+    assert len(backend._clients) == 0
+
+
+def test_router_from_settings_and_metrics():
+    """Test building a router from settings and exporting its metrics."""
+    assert parse_backend_specs("a=simulated?latency_ms=5&weight=2, b=http?url=http://x:1/g") == [
+        ("a", "simulated", {"latency_ms": "5", "weight": "2"}),
+        ("b", "http", {"url": "http://x:1/g"}),
+    ]
+    with pytest.raises(ValueError, match="Invalid router backend"):
+        parse_backend_specs("nameless")
+    settings = GatewaySettings(
+        backend="router",
+        router_backends="a=simulated?latency_ms=1&weight=2,b=simulated?failure_rate=0.5",
+        router_strategy="weighted",
+    )
+    router = build_backend(settings, PPTWrapper())
+    assert isinstance(router, BackendRouter)
+    assert [(m.name, m.weight) for m in router.members] == [("a", 2.0), ("b", 1.0)]
+    assert router.version == "a:1+b:1"
+
+    service = AIGatewayService(backend=router)
+    asyncio.run(service.generate_slide_content_async("Metrics"))
+    rendered = service.metrics.render()
+    assert 'gateway_router_backend_breaker_state{backend="a"} 0' in rendered
+    assert "gateway_router_hedges_total 0" in rendered
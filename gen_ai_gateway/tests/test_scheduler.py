@@ -0,0 +1,137 @@
+"""Tests for the priority generation scheduler."""
+
+import asyncio
+
+import httpx
+import pytest
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend
+from gen_ai_gateway.src.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    PriorityScheduler,
+    SchedulerOverloaded,
+)
+from gen_ai_gateway.src.services import AIGatewayService
+
+
+async def _hold(scheduler, order, name, priority, release):
+    async with scheduler.slot(priority):
+        order.append(name)
+        await release.wait()
+
+
+async def test_interactive_requests_jump_the_batch_queue():
+    """Test that queued interactive requests are granted before batch ones."""
+    scheduler = PriorityScheduler(limit=1)
+    release = asyncio.Event()
+    order = []
+    holder = asyncio.ensure_future(_hold(scheduler, order, "first", BATCH, release))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.ensure_future(_hold(scheduler, order, name, priority, release))
+        for name, priority in [("b1", BATCH), ("b2", BATCH), ("i1", INTERACTIVE)]
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued_batch"] == 2
+    assert scheduler.stats()["queued_interactive"] == 1
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    assert order == ["first", "i1", "b1", "b2"]
+    assert scheduler.in_flight == 0 and scheduler.queued == 0
+    assert scheduler.peak == 1
+
+
+async def test_full_queue_sheds_immediately():
+    """Test the bounded queue."""
+    scheduler = PriorityScheduler(limit=1, max_queue=1)
+    await scheduler.acquire()
+    waiter = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(SchedulerOverloaded) as excinfo:
+        await scheduler.acquire()
+    assert excinfo.value.reason == "queue_full"
+    scheduler.release()
+    await waiter
+    scheduler.release()
+    assert scheduler.stats()["shed_queue_full"] == 1
+
+
+async def test_deadline_expires_while_queued():
+    """Test that a queued request is shed when its deadline passes."""
+    scheduler = PriorityScheduler(limit=1, deadlines={BATCH: 0.01})
+    await scheduler.acquire()
+    with pytest.raises(SchedulerOverloaded, match="deadline"):
+        await scheduler.acquire(BATCH)
+    assert scheduler.queued == 0
+    assert scheduler.stats()["expired"] == 1
+    scheduler.release()
+    await scheduler.acquire(BATCH)
+    scheduler.release()
+    assert scheduler.in_flight == 0
+
+
+async def test_estimated_wait_sheds_before_queueing():
+    """Test load shedding when the expected wait exceeds the deadline."""
+    scheduler = PriorityScheduler(limit=1)
+    scheduler.service_time = 1.0
+    await scheduler.acquire()
+    assert scheduler.estimate_wait(INTERACTIVE) == 1.0
+    with pytest.raises(SchedulerOverloaded) as excinfo:
+        await scheduler.acquire(INTERACTIVE, deadline=0.5)
+    assert excinfo.value.retry_after_header == "1"
+    assert scheduler.queued == 0
+    assert scheduler.stats()["shed_deadline"] == 1
+    scheduler.release()
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    """Test that a cancelled request frees its queue entry and never holds a slot."""
+    scheduler = PriorityScheduler(limit=1)
+    await scheduler.acquire()
+    waiter = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.queued == 0
+    scheduler.release()
+    assert scheduler.in_flight == 0
+    with pytest.raises(ValueError, match="priority"):
+        await scheduler.acquire("urgent")
+
+
+async def test_service_sheds_batch_generations():
+    """Test that batches fail with SchedulerOverloaded rather than a generic error."""
+    service = AIGatewayService(
+        backend=SimulatedLatencyBackend(latency=0.2),
+        max_concurrency=1,
+        deadlines={BATCH: 0.01},
+    )
+    blocker = asyncio.ensure_future(service.generate_slide_content_async("Blocker"))
+    await asyncio.sleep(0.01)
+    with pytest.raises(SchedulerOverloaded):
+        await service.generate_batch_async([("Shed", "content")])
+    await blocker
+    stats = service.get_scheduler_stats()
+    assert stats["expired"] == 1
+    assert stats["wait_max_ms_interactive"] == 0
+
+
+async def test_generate_returns_503_when_overloaded(monkeypatch):
+    """Test that shed generations get 503 with Retry-After."""
+    from gen_ai_gateway.apps import main
+
+    scheduler = PriorityScheduler(limit=1, max_queue=0)
+    monkeypatch.setattr(main.runtime.get(), "limiter", scheduler)
+    await scheduler.acquire()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/generate", "/generate/stream"):
+            response = await client.post(
+                path, json={"topic": "Overloaded Topic", "deadline_ms": 50}
+            )
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+        stats = (await client.get("/scheduler/stats")).json()
+    assert stats["shed_queue_full"] == 2
+    scheduler.release()
@@ -0,0 +1,113 @@
+"""Tests for the full-text presentation search index."""
+
+from ppt_wrapper import PPTWrapper
+from ppt_wrapper.search import SearchIndex, tokenize
+from ppt_wrapper.sqlite_store import SQLitePresentationStore
+
+
+def test_tokenize():
+    """Test lower-casing, punctuation splitting and stopword removal."""
+    assert tokenize("The Future of AI-driven Healthcare, 2024!") == [
+        "future",
+        "ai",
+        "driven",
+        "healthcare",
+        "2024",
+    ]
+
+
+def test_bm25_ranking():
+    """Test that rarer and title terms rank higher and misses are excluded."""
+    index = SearchIndex()
+    index.index({"id": "a", "title": "Solar energy", "content": {"summary": "energy policy"}})
+    index.index({"id": "b", "title": "Energy markets", "content": {"summary": "wind"}})
+    index.index({"id": "c", "title": "Banking", "content": {"summary": "solar loans"}})
+    assert [hit for hit, _ in index.search("solar")] == ["a", "c"]
+    assert index.search("solar energy")[0][0] == "a"
+    assert index.search("nothing here") == []
+    assert len(index.search("energy solar wind", limit=2)) == 2
+
+
+def test_reindex_remove_and_compact():
+    """Test that replaced and removed versions stop matching."""
+    index = SearchIndex()
+    index.index({"id": "a", "title": "Old title"})
+    index.index({"id": "a", "title": "New title"})
+    assert index.search("old") == []
+    assert [hit for hit, _ in index.search("new")] == ["a"]
+    index.remove("a")
+    assert index.search("new") == [] and len(index) == 0
+    for n in range(10):
+        index.index({"id": f"d{n}", "title": f"Deck {n}"})
+    index.compact()
+    assert index.stats()["tombstones"] == 0
+    assert index.stats()["documents"] == 10
+    assert [hit for hit, _ in index.search("deck 7")][0] == "d7"
+
+
+def test_common_terms_only_rescore_candidates():
+    """Test that terms above ``max_candidates`` only refine rarer matches."""
+    index = SearchIndex(max_candidates=5)
+    for n in range(20):
+        index.index({"id": f"d{n}", "title": "Quarterly report", "content": {"summary": f"item{n}"}})
+    hits = [hit for hit, _ in index.search("report item3", limit=5)]
+    assert hits[0] == "d3"
+    assert sorted(hits[1:]) == ["d16", "d17", "d18", "d19"]
+    assert [hit for hit, _ in index.search("report item3", limit=1)] == ["d3"]
+    assert len(index.search("report", limit=3)) == 3
+    assert len(index.search("report", limit=100)) == 20
+
+
+def test_wrapper_keeps_index_current():
+    """Test indexing on create, slide attachment, update and delete."""
+    wrapper = PPTWrapper()
+    assert wrapper.search_presentations("healthcare")[0]["presentation"]["id"] == "ppt_001"
+    created = wrapper.create_presentation("Quantum Computing", "Ann")
+    assert wrapper.search_presentations("quantum")[0]["presentation"]["id"] == created["id"]
+    slide = wrapper.generate_slide_content("Error Correction")
+    wrapper.attach_slides(created["id"], [slide], key_topics=["Qubits"])
+    for query in ("correction", "qubits"):
+        hits = wrapper.search_presentations(query)
+        assert [hit["presentation"]["id"] for hit in hits] == [created["id"]]
+    assert wrapper.search_presentations("cryptography") == []
+    wrapper.update_presentation(created["id"], title="Cryptography")
+    assert wrapper.search_presentations("cryptography")
+    assert wrapper.search_presentations("correction")
+    wrapper.delete_presentation(created["id"])
+    assert wrapper.search_presentations("cryptography") == []
+
+
+def test_index_catches_up_with_other_writers(tmp_path):
+    """Test that writes through another wrapper on a shared store are found."""
+    path = str(tmp_path / "shared.db")
+    first = PPTWrapper(store=SQLitePresentationStore(path))
+    second = PPTWrapper(store=SQLitePresentationStore(path))
+    created = second.create_presentation("Quantum Computing", "Ann")
+    assert first.search_presentations("quantum")[0]["presentation"]["id"] == created["id"]
+
+    first.create_presentation("Ocean Currents", "Bob")
+    second.delete_presentation(created["id"])
+    assert first.search_presentations("quantum") == []
+    assert first.search_presentations("ocean")
+    assert second.search_presentations("ocean")
+
+
+def test_catch_up_only_reads_changed_records(tmp_path, monkeypatch):
+    """Test that catching up re-reads the written records, not the catalogue."""
+    path = str(tmp_path / "shared.db")
+    first = PPTWrapper(store=SQLitePresentationStore(path))
+    second = PPTWrapper(store=SQLitePresentationStore(path))
+    for n in range(20):
+        second.create_presentation(f"Deck {n}", "Ann")
+    first.search_presentations("deck")
+    created = second.create_presentation("Quantum Computing", "Ann")
+    read = []
+    get_slides = first.store.get_slides
+
+    def recording_get_slides(presentation_id):
+        read.append(presentation_id)
+        return get_slides(presentation_id)
+
+    monkeypatch.setattr(first.store, "get_slides", recording_get_slides)
+    assert first.search_presentations("quantum")[0]["presentation"]["id"] == created["id"]
+    assert read == [created["id"]]
@@ -0,0 +1,84 @@
+"""Tests for the semantic topic cache."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend  # noqa: E402
+from gen_ai_gateway.src.config import GatewaySettings  # noqa: E402
+from gen_ai_gateway.src.semantic import HashingVectorizer, SemanticCache  # noqa: E402
+from gen_ai_gateway.src.services import AIGatewayService  # noqa: E402
+
+
+def test_vectorizer_ignores_word_order_and_stopwords():
+    """Test that reordered topics embed identically and unrelated ones do not."""
+    vectorizer = HashingVectorizer(dimensions=128)
+    first = vectorizer.transform("AI in Healthcare")
+    assert first.shape == (128,) and first.dtype == np.float32
+    assert float(np.linalg.norm(first)) == pytest.approx(1.0)
+    assert float(first @ vectorizer.transform("healthcare AI")) == pytest.approx(1.0)
+    assert float(first @ vectorizer.transform("Ocean shipping logistics")) < 0.5
+    assert not vectorizer.transform("the of").any()
+
+
+def test_threshold_scopes_and_eviction():
+    """Test similarity hits, per-scope isolation and overwriting the oldest topic."""
+    cache = SemanticCache(threshold=0.8, max_entries=2)
+    cache.add("Machine learning", "mock:content", {"title": "ML"})
+    assert cache.get("machine learning models", "mock:content") == {"title": "ML"}
+    assert cache.get("machine learning", "mock:title") is None
+    assert cache.get("Ocean shipping", "mock:content") is None
+    cache.add("Ocean shipping", "mock:content", {"title": "Ships"})
+    cache.add("Solar power", "mock:content", {"title": "Solar"})
+    assert len(cache) == 2
+    assert cache.get("Machine learning", "mock:content") is None
+    assert [topic for topic, _ in cache.nearest("solar power plants", "mock:content", 2)] == [
+        "Solar power",
+        "Ocean shipping",
+    ]
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.25)
+    with pytest.raises(ValueError, match="threshold"):
+        SemanticCache(threshold=1.5)
+
+
+def test_matrix_grows_past_initial_capacity():
+    """Test that the topic matrix grows and keeps earlier rows."""
+    cache = SemanticCache(threshold=0.99, max_entries=5000)
+    for n in range(1500):
+        cache.add(f"topic{n} subject{n}", "s", {"n": n})
+    assert cache.get("subject7 topic7", "s") == {"n": 7}
+    assert cache.get("subject1499 topic1499", "s") == {"n": 1499}
+
+
+async def test_service_reuses_slides_for_similar_topics():
+    """Test that the service skips the backend for a near-duplicate topic."""
+    calls = []
+
+    def generate(topic, slide_type):
+        calls.append(topic)
+        return {"topic": topic, "slide_type": slide_type, "generated_at": "now"}
+
+    service = AIGatewayService(
+        backend=SimulatedLatencyBackend(latency=0, generate=generate),
+        semantic_cache=SemanticCache(threshold=0.9),
+    )
+    await service.generate_slide_content_async("AI in Healthcare")
+    content = await service.generate_slide_content_async("Healthcare AI")
+    await service.generate_slide_content_async("Healthcare AI", "title")
+    assert calls == ["AI in Healthcare", "Healthcare AI"]
+    assert content["topic"] == "Healthcare AI"
+    assert service.get_cache_stats()["semantic"]["hits"] == 1
+    results = await service.generate_batch_async([("healthcare ai", "content")])
+    assert results[0]["topic"] == "healthcare ai" and len(calls) == 2
+
+
+def test_service_from_settings():
+    """Test that a positive threshold enables the semantic cache."""
+    assert AIGatewayService.from_settings(GatewaySettings()).semantic_cache is None
+    service = AIGatewayService.from_settings(
+        GatewaySettings(semantic_cache_threshold=0.85, semantic_cache_dimensions=64)
+    )
+    assert service.semantic_cache.threshold == 0.85
+    assert service.semantic_cache.vectorizer.dimensions == 64
@@ -0,0 +1,92 @@
+"""Tests for request coalescing."""
+
+import asyncio
+
+import pytest
+from gen_ai_gateway.src.backends import SimulatedLatencyBackend, SyncBackend
+from gen_ai_gateway.src.services import AIGatewayService
+from gen_ai_gateway.src.singleflight import SingleFlight
+from ppt_wrapper import PPTWrapper
+
+
+async def test_concurrent_calls_share_one_execution():
+    """Test that concurrent callers with the same key share one result."""
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(10)))
+    assert results == ["done"] * 10
+    assert calls == [1]
+    assert flight.stats()["coalesced_waiters"] == 9
+    assert flight.stats()["max_waiters"] == 9
+    assert flight.in_flight() == 0
+
+
+async def test_errors_propagate_to_all_waiters():
+    """Test that a failed execution raises for every waiter and is not cached."""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await flight.do("k", lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    """Test that cancelling the first caller leaves the others unaffected."""
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("k", work))
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.parametrize("offload", [False, True])
+async def test_service_coalesces_sync_backend(offload):
+    """Test coalescing in front of the sync PPTWrapper mock, inline or offloaded."""
+    calls = []
+    wrapper = PPTWrapper()
+
+    def generate(topic, slide_type):
+        calls.append(topic)
+        return wrapper.generate_slide_content(topic, slide_type)
+
+    service = AIGatewayService(backend=SyncBackend(generate, offload=offload))
+    results = await asyncio.gather(
+        *(service.generate_slide_content_async("Trending Topic") for _ in range(5))
+    )
+    assert len({r["generated_at"] for r in results}) == 1
+    assert len(calls) == 1
+
+
+async def test_service_coalesces_async_backend():
+    """Test coalescing of identical requests against an async backend."""
+    service = AIGatewayService(backend=SimulatedLatencyBackend(latency=0.02))
+    results = await asyncio.gather(
+        service.generate_slide_content_async("Trending Topic"),
+        service.generate_slide_content_async("trending topic"),
+        service.generate_slide_content_async("Other Topic"),
+    )
+    assert results[1]["topic"] == "trending topic"
+    assert results[0] is not results[1]
+    stats = service.get_cache_stats()["single_flight"]
+    assert stats["executions"] == 2
+    assert stats["coalesced_waiters"] == 1
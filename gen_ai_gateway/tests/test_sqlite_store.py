@@ -0,0 +1,163 @@
+"""Tests for the shared SQLite presentation store."""
+
+import multiprocessing
+import threading
+
+import pytest
+from gen_ai_gateway.src.cache import GenerationCache, SQLiteCacheTier
+from gen_ai_gateway.src.config import GatewaySettings
+from gen_ai_gateway.src.services import AIGatewayService
+from ppt_wrapper import PPTWrapper
+from ppt_wrapper.sqlite_store import SQLitePresentationStore
+
+
+def _create_many(path, count):
+    wrapper = PPTWrapper(store=SQLitePresentationStore(path))
+    for n in range(count):
+        wrapper.create_presentation(f"Deck {n}", "Worker")
+
+
+def test_workers_share_data(tmp_path):
+    """Test that two wrappers on one database see each other's writes."""
+    path = str(tmp_path / "gateway.db")
+    first = PPTWrapper(store=SQLitePresentationStore(path))
+    second = PPTWrapper(store=SQLitePresentationStore(path))
+    assert len(second.get_presentations()) == 3
+
+    created = first.create_presentation("Shared", "Ann", "template_001")
+    assert second.get_presentation_by_id(created["id"])["title"] == "Shared"
+    assert created["id"] == "ppt_004"
+    assert second.create_presentation("Other", "Bob")["id"] == "ppt_005"
+
+    revision = created["revision"]
+    second.update_presentation(created["id"], status="completed")
+    assert first.get_presentation_by_id(created["id"])["revision"] > revision
+    assert first.store.version() == second.store.version() > revision
+
+
+def test_add_many_in_one_transaction(tmp_path):
+    """Test batched inserts, ID allocation and duplicate reporting."""
+    store = SQLitePresentationStore(str(tmp_path / "g.db"))
+    PPTWrapper(store=store)
+    version = store.version()
+    records = [
+        {"id": None, "title": "New", "author": "Ann"},
+        {"id": "ppt_002", "title": "Duplicate", "author": "Ann"},
+        {"id": "ppt_009", "title": "Explicit", "author": "Ann", "slides_count": 4},
+    ]
+    errors = store.add_many(records)
+    assert errors[0] is None and errors[2] is None
+    assert "already exists" in errors[1]
+    assert records[0]["id"] == "ppt_004"
+    assert store.count("author", "Ann") == 2
+    assert store.get("ppt_002")["title"] == "Future of Transportation"
+    assert store.version() == version + 2
+    assert store.next_id() == "ppt_010"
+
+
+def test_stats_and_pagination(tmp_path):
+    """Test trigger-maintained counters and seq-based pages."""
+    wrapper = PPTWrapper(store=SQLitePresentationStore(str(tmp_path / "g.db")))
+    created = wrapper.create_presentation("Deck", "Ann", "template_002")
+    wrapper.update_presentation(created["id"], status="completed", slides_count=5)
+    stats = wrapper.get_presentation_stats(author="Ann")
+    assert stats["total_presentations"] == 4
+    assert stats["completed_presentations"] == 3
+    assert stats["total_slides"] == 80
+    assert stats["by_template"] == {"template_002": 1}
+    assert stats["author_presentations"] == 1
+
+    page = wrapper.list_presentations(2)
+    assert [p["id"] for p in page["items"]] == ["ppt_001", "ppt_002"]
+    page = wrapper.list_presentations(2, page["next_cursor"])
+    assert [p["id"] for p in page["items"]] == ["ppt_003", "ppt_004"]
+    assert page["next_cursor"] is None
+
+    wrapper.attach_slides(created["id"], [{"title": "s"}])
+    assert wrapper.get_slides(created["id"]) == [{"title": "s"}]
+    wrapper.delete_presentation(created["id"])
+    stats = wrapper.get_presentation_stats()
+    assert stats["total_slides"] == 75
+    assert stats["by_status"] == {"completed": 2, "in_progress": 1}
+    with pytest.raises(ValueError, match="not found"):
+        wrapper.get_slides(created["id"])
+
+
+def test_concurrent_processes_allocate_unique_ids(tmp_path):
+    """Test collision-free ID allocation across worker processes."""
+    path = str(tmp_path / "gateway.db")
+    SQLitePresentationStore(path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_create_many, args=(path, 25)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    store = SQLitePresentationStore(path)
+    ids = [record["id"] for record in store]
+    assert len(ids) == 103
+    assert len(set(ids)) == 103
+    assert store.count("author", "Worker") == 100
+
+
+def test_shared_cache_tier(tmp_path):
+    """Test that generation cache entries are shared through SQLite."""
+    path = str(tmp_path / "gateway.db")
+    GenerationCache(disk=SQLiteCacheTier(path)).set("key", {"v": 1})
+    assert GenerationCache(disk=SQLiteCacheTier(path)).get("key") == {"v": 1}
+
+
+def test_service_from_sqlite_settings(tmp_path):
+    """Test building the service on the SQLite store from settings."""
+    settings = GatewaySettings(store="sqlite", store_path=str(tmp_path / "g.db"))
+    service = AIGatewayService.from_settings(settings)
+    assert isinstance(service.ppt_wrapper.store, SQLitePresentationStore)
+    assert isinstance(service.cache.disk, SQLiteCacheTier)
+    with pytest.raises(ValueError, match="Unknown presentation store"):
+        AIGatewayService.from_settings(GatewaySettings(store="nope"))
+
+
+def test_change_log_lists_written_records(tmp_path):
+    """Test that ``changes`` reports inserted, updated and deleted IDs once each."""
+    store = SQLitePresentationStore(str(tmp_path / "c.db"))
+    PPTWrapper(store=store)
+    version = store.version()
+    assert store.changes(version) == (version, [])
+    store.add({"id": "ppt_100", "title": "New", "author": "Ann"})
+    store.update("ppt_001", {"title": "Renamed"})
+    store.set_slides("ppt_001", [])
+    store.delete("ppt_002")
+    latest, changed = store.changes(version)
+    assert latest == store.version() == version + 4
+    assert sorted(changed) == ["ppt_001", "ppt_002", "ppt_100"]
+
+
+async def test_store_and_disk_cache_calls_run_off_the_event_loop(tmp_path):
+    """Test that SQLite store and cache tier calls run in worker threads."""
+    path = str(tmp_path / "shared.db")
+    tier = SQLiteCacheTier(path)
+    service = AIGatewayService(
+        ppt_wrapper=PPTWrapper(store=SQLitePresentationStore(path)),
+        cache=GenerationCache(disk=tier),
+    )
+    loop_thread = threading.get_ident()
+    assert await service.call_store(threading.get_ident) != loop_thread
+    assert await AIGatewayService().call_store(threading.get_ident) == loop_thread
+
+    threads = []
+    get = tier.get
+
+    def recording_get(key):
+        threads.append(threading.get_ident())
+        return get(key)
+
+    tier.get = recording_get
+    created = await service.create_presentation_async("Threaded", "Ann")
+    assert service.get_presentation_by_id(created["id"])["title"] == "Threaded"
+    await service.generate_slide_content_async("Threaded")
+    service.cache.clear()
+    content = await service.generate_slide_content_async("Threaded")
+    assert content["topic"] == "Threaded" and service.cache.disk_hits == 1
+    assert threads and loop_thread not in threads
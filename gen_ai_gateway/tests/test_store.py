@@ -0,0 +1,135 @@
+"""Tests for the presentation store."""
+
+import pytest
+from ppt_wrapper import PPTWrapper
+from ppt_wrapper.store import InMemoryPresentationStore
+
+
+def _record(presentation_id, author="Ann", status="draft", template_id=None):
+    return {
+        "id": presentation_id,
+        "title": f"Deck {presentation_id}",
+        "author": author,
+        "status": status,
+        "template_id": template_id,
+        "slides_count": 0,
+    }
+
+
+def test_get_and_next_id():
+    """Test point lookups and ID allocation past seeded IDs."""
+    store = InMemoryPresentationStore([_record("ppt_001"), _record("ppt_007")])
+    assert store.get("ppt_007")["title"] == "Deck ppt_007"
+    assert store.get("missing") is None
+    assert store.next_id() == "ppt_008"
+    assert store.next_id() == "ppt_009"
+
+
+def test_add_duplicate_id():
+    """Test that duplicate IDs are rejected."""
+    store = InMemoryPresentationStore([_record("ppt_001")])
+    with pytest.raises(ValueError, match="already exists"):
+        store.add(_record("ppt_001"))
+
+
+def test_add_many_reports_each_record():
+    """Test batched inserts with allocated IDs and per-record errors."""
+    store = InMemoryPresentationStore([_record("ppt_001")])
+    records = [_record(None), _record("ppt_001"), _record("ppt_010")]
+    errors = store.add_many(records)
+    assert errors[0] is None and errors[2] is None
+    assert "already exists" in errors[1]
+    assert records[0]["id"] == "ppt_002"
+    assert [record["id"] for record in store] == ["ppt_001", "ppt_002", "ppt_010"]
+
+
+def test_find_uses_secondary_indexes():
+    """Test filtered listings on one or several indexed fields."""
+    store = InMemoryPresentationStore(
+        [
+            _record("ppt_001", author="Ann", status="draft"),
+            _record("ppt_002", author="Bob", status="completed"),
+            _record("ppt_003", author="Ann", status="completed", template_id="t1"),
+        ]
+    )
+    assert [r["id"] for r in store.find(author="Ann")] == ["ppt_001", "ppt_003"]
+    assert [r["id"] for r in store.find(author="Ann", status="completed")] == ["ppt_003"]
+    assert [r["id"] for r in store.find(template_id="t1")] == ["ppt_003"]
+    assert store.find(author="Nobody") == []
+    with pytest.raises(ValueError, match="non-indexed"):
+        store.find(title="Deck ppt_001")
+
+
+def test_update_and_delete_maintain_indexes():
+    """Test that updates and deletes keep secondary indexes consistent."""
+    store = InMemoryPresentationStore([_record("ppt_001"), _record("ppt_002")])
+    store.update("ppt_001", {"status": "completed"})
+    assert [r["id"] for r in store.find(status="draft")] == ["ppt_002"]
+    assert [r["id"] for r in store.find(status="completed")] == ["ppt_001"]
+
+    store.update("ppt_001", {"status": "draft"})
+    assert [r["id"] for r in store.find(status="draft")] == ["ppt_001", "ppt_002"]
+
+    store.delete("ppt_002")
+    assert len(store) == 1
+    assert store.count("status", "draft") == 1
+    with pytest.raises(ValueError, match="not found"):
+        store.delete("ppt_002")
+
+
+def test_writes_stamp_increasing_revisions():
+    """Test that every write stamps a store-wide revision that is never reused."""
+    store = InMemoryPresentationStore([_record("ppt_001"), _record("ppt_002")])
+    first = store.get("ppt_001")["revision"]
+    assert store.get("ppt_002")["revision"] > first
+    store.update("ppt_001", {"status": "completed"})
+    updated = store.get("ppt_001")["revision"]
+    assert updated > store.get("ppt_002")["revision"]
+    store.delete("ppt_001")
+    assert store.version() == updated + 1
+    store.add(_record("ppt_001"))
+    assert store.get("ppt_001")["revision"] == store.version() == updated + 2
+
+
+def test_records_are_immutable_versioned_views():
+    """Test that reads return read-only snapshots that never leak nested state."""
+    record = _record("ppt_001")
+    record["content"] = {"summary": "S", "key_topics": ["A"], "audience": "All"}
+    record["extra"] = {"tags": ["x"]}
+    store = InMemoryPresentationStore([record])
+    record["content"]["key_topics"].append("leaked")
+
+    view = store.get("ppt_001")
+    assert view["content"]["key_topics"] == ["A"]
+    view["content"]["key_topics"].append("leaked")
+    view["extra"]["tags"].append("leaked")
+    assert store.get("ppt_001")["content"]["key_topics"] == ["A"]
+    assert store.get("ppt_001")["extra"] == {"tags": ["x"]}
+    with pytest.raises(TypeError):
+        view["title"] = "Changed"
+
+    store.update("ppt_001", {"title": "Changed", "slides_count": 4})
+    assert view["title"] == "Deck ppt_001" and view["slides_count"] == 0
+    updated = store.get("ppt_001")
+    assert updated["title"] == "Changed" and updated["slides_count"] == 4
+    assert updated.to_dict() == {
+        **record,
+        "title": "Changed",
+        "slides_count": 4,
+        "content": {"summary": "S", "key_topics": ["A"], "audience": "All"},
+        "revision": updated["revision"],
+    }
+    assert list(updated)[:3] == ["id", "title", "author"]
+    assert store.total_slides() == 4
+
+
+def test_wrapper_uses_custom_store():
+    """Test that PPTWrapper reads and writes through an injected store."""
+    store = InMemoryPresentationStore([_record("ppt_010", author="Ann")])
+    wrapper = PPTWrapper(store=store)
+    created = wrapper.create_presentation("New", "Ann")
+    assert created["id"] == "ppt_011"
+    assert [p["id"] for p in wrapper.find_presentations(author="Ann")] == [
+        "ppt_010",
+        "ppt_011",
+    ]
@@ -0,0 +1,31 @@
+"""Tests for the streaming encoders and decoders."""
+
+from gen_ai_gateway.src.streaming import encode_ndjson, split_ndjson
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+async def test_split_ndjson_across_chunks():
+    """Test that lines split across chunk boundaries are reassembled."""
+    lines = await _collect(split_ndjson(_chunks(b'{"a"', b":1}\n\n{", b'"b":2}')))
+    assert lines == [(1, b'{"a":1}'), (2, b""), (3, b'{"b":2}')]
+
+
+async def test_split_ndjson_skips_long_lines():
+    """Test that oversized lines are reported without being buffered."""
+    chunks = _chunks(b"short\n" + b"x" * 6, b"x" * 6, b"x\nok\n", b"y" * 20)
+    lines = await _collect(split_ndjson(chunks, max_line_bytes=8))
+    assert lines == [(1, b"short"), (2, None), (3, b"ok"), (4, None)]
+
+
+async def test_encode_ndjson():
+    """Test one compact JSON document per line."""
+    encoded = await _collect(encode_ndjson(_chunks({"a": 1}, {"b": [2]})))
+    assert encoded == [b'{"a":1}\n', b'{"b":[2]}\n']
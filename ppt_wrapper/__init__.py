@@ -1,15 +1,30 @@
 """PPT Wrapper module for Gen AI Gateway."""
 
-from typing import Dict, List, Any, Optional
+import base64
+import binascii
+import threading
+from typing import Dict, List, Any, Mapping, Optional, Sequence
 from datetime import datetime
 
+from ppt_wrapper.search import SearchIndex
+from ppt_wrapper.store import InMemoryPresentationStore, PresentationStore
+
+# Top-level fields whose changes require re-indexing a presentation.
+SEARCHABLE_FIELDS = ("title", "content")
+
 
 class PPTWrapper:
     """Wrapper class for PPT-related operations with mock data."""
     
-    def __init__(self):
-        """Initialize the PPT wrapper with mock data."""
-        self._mock_presentations = [
+    def __init__(self, store: Optional[PresentationStore] = None):
+        """Initialize the PPT wrapper with mock data.
+
+        ``store`` selects the presentation storage backend and defaults to
+        an in-memory indexed store. Empty stores are seeded with the mock
+        presentations. Existing presentations are loaded into the full-text
+        search index, which is then kept current by this wrapper's writes.
+        """
+        mock_presentations = [
             {
                 "id": "ppt_001",
                 "title": "AI in Healthcare",
@@ -50,6 +65,17 @@ class PPTWrapper:
                 }
             }
         ]
+        if store is None:
+            store = InMemoryPresentationStore()
+        store.seed(mock_presentations)
+        self._store = store
+        self._search = SearchIndex()
+        self._search_lock = threading.Lock()
+        self._search_version = store.version()
+        # Stores with a change log are indexed by catching up on it only.
+        self._search_logged = store.changes(self._search_version) is not None
+        for record in store:
+            self._search.index(record, store.get_slides(record["id"]))
         
         self._mock_templates = [
             {
@@ -74,37 +100,223 @@ class PPTWrapper:
                 "slides_included": ["problem", "solution", "market", "business_model", "team"]
             }
         ]
+        self._templates_by_id = {t["id"]: t for t in self._mock_templates}
     
-    def get_presentations(self) -> List[Dict[str, Any]]:
-        """Get all presentations."""
-        return self._mock_presentations.copy()
+    @property
+    def store(self) -> PresentationStore:
+        """The presentation storage backend."""
+        return self._store
     
-    def get_presentation_by_id(self, presentation_id: str) -> Dict[str, Any]:
-        """Get a specific presentation by ID."""
-        for presentation in self._mock_presentations:
-            if presentation["id"] == presentation_id:
-                return presentation.copy()
-        raise ValueError(f"Presentation with ID {presentation_id} not found")
+    def get_presentations(self) -> List[Mapping[str, Any]]:
+        """Get all presentations as read-only records."""
+        return list(self._store)
     
-    def create_presentation(self, title: str, author: str, template_id: Optional[str] = None) -> Dict[str, Any]:
-        """Create a new presentation."""
-        presentation_id = f"ppt_{len(self._mock_presentations) + 1:03d}"
-        new_presentation = {
-            "id": presentation_id,
-            "title": title,
-            "author": author,
-            "created_at": datetime.now().isoformat() + "Z",
-            "slides_count": 0,
-            "status": "draft",
-            "template_id": template_id,
-            "content": {
-                "summary": f"New presentation: {title}",
-                "key_topics": [],
-                "audience": "General audience"
-            }
+    def find_presentations(self, **filters: Any) -> List[Mapping[str, Any]]:
+        """Get presentations matching indexed fields (author, status, template_id)."""
+        return self._store.find(**filters)
+    
+    def list_presentations(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """Get one page of presentations.
+
+        ``after`` is an opaque cursor taken from a previous page's
+        ``next_cursor``. ``fields`` restricts each returned record to the
+        given top-level fields. ``filters`` match indexed fields exactly.
+        """
+        position = self._decode_cursor(after) if after else None
+        active_filters = {key: value for key, value in filters.items() if value is not None}
+        records, last = self._store.page(limit, position, **active_filters)
+        if fields is None:
+            items = records
+        else:
+            items = [{field: record.get(field) for field in fields} for record in records]
+        return {
+            "items": items,
+            "next_cursor": self._encode_cursor(last) if last is not None else None,
         }
-        self._mock_presentations.append(new_presentation)
-        return new_presentation.copy()
+    
+    @staticmethod
+    def _encode_cursor(position: int) -> str:
+        return base64.urlsafe_b64encode(f"p{position}".encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> int:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            if not raw.startswith("p"):
+                raise ValueError
+            return int(raw[1:])
+        except (ValueError, binascii.Error, UnicodeDecodeError):
+            raise ValueError(f"Invalid cursor: {cursor}") from None
+    
+    def get_presentation_by_id(self, presentation_id: str) -> Mapping[str, Any]:
+        """Get a specific presentation by ID, as a read-only record."""
+        presentation = self._store.get(presentation_id)
+        if presentation is None:
+            raise ValueError(f"Presentation with ID {presentation_id} not found")
+        return presentation
+    
+    def create_presentation(self, title: str, author: str, template_id: Optional[str] = None) -> Mapping[str, Any]:
+        """Create a new presentation."""
+        new_presentation = self._with_defaults(
+            {"id": self._store.next_id(), "title": title, "author": author,
+             "template_id": template_id}
+        )
+        record = self._store.add(new_presentation)
+        self._index_search(record)
+        return record
+    
+    def import_presentations(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert a batch of presentations in one store write.
+
+        Each record needs ``title`` and ``author``; other fields default as
+        in ``create_presentation``, and a missing ``id`` is allocated.
+        Returns one result per record, in order: ``{"id": ...}`` or
+        ``{"error": ...}``.
+        """
+        presentations = [self._with_defaults(dict(record)) for record in records]
+        errors = self._store.add_many(presentations)
+        results = []
+        for presentation, error in zip(presentations, errors):
+            if error is None:
+                self._index_search(presentation)
+                results.append({"id": presentation["id"]})
+            else:
+                results.append({"error": error})
+        return results
+    
+    @staticmethod
+    def _with_defaults(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the fields of a new presentation that ``record`` lacks."""
+        title = record["title"]
+        record.setdefault("id", None)
+        record.setdefault("created_at", datetime.now().isoformat() + "Z")
+        record.setdefault("slides_count", 0)
+        record.setdefault("status", "draft")
+        record.setdefault("template_id", None)
+        record.setdefault("content", {
+            "summary": f"New presentation: {title}",
+            "key_topics": [],
+            "audience": "General audience"
+        })
+        return record
+    
+    def update_presentation(self, presentation_id: str, **changes: Any) -> Mapping[str, Any]:
+        """Update top-level fields of a presentation."""
+        record = self._store.update(presentation_id, changes)
+        if any(field in changes for field in SEARCHABLE_FIELDS) and not self._search_logged:
+            self._index_search(record, self._store.get_slides(presentation_id))
+        return record
+    
+    def delete_presentation(self, presentation_id: str) -> Mapping[str, Any]:
+        """Delete a presentation."""
+        record = self._store.delete(presentation_id)
+        if not self._search_logged:
+            with self._search_lock:
+                self._search.remove(presentation_id)
+        return record
+    
+    def attach_slides(
+        self,
+        presentation_id: str,
+        slides: List[Dict[str, Any]],
+        key_topics: Optional[List[str]] = None,
+        status: Optional[str] = None,
+    ) -> Mapping[str, Any]:
+        """Attach generated slides to a presentation.
+
+        Updates ``slides_count`` and, when given, ``content.key_topics`` and
+        ``status``.
+        """
+        presentation = self.get_presentation_by_id(presentation_id)
+        changes: Dict[str, Any] = {"slides_count": len(slides)}
+        if key_topics is not None:
+            changes["content"] = {**presentation["content"], "key_topics": list(key_topics)}
+        if status is not None:
+            changes["status"] = status
+        self._store.set_slides(presentation_id, slides)
+        record = self._store.update(presentation_id, changes)
+        self._index_search(record, slides)
+        return record
+    
+    def search_presentations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search titles, summaries, key topics and slides, best match first.
+
+        Returns ``{"score": ..., "presentation": ...}`` hits ranked by BM25.
+        """
+        with self._search_lock:
+            self._catch_up_search()
+            matches = self._search.search(query, limit)
+        hits = []
+        for presentation_id, score in matches:
+            record = self._store.get(presentation_id)
+            if record is not None:
+                hits.append({"score": score, "presentation": record})
+        return hits
+
+    def _index_search(
+        self, record: Mapping[str, Any], slides: Sequence[Dict[str, Any]] = ()
+    ) -> None:
+        """Index a record this wrapper wrote, unless the change log covers it."""
+        if not self._search_logged:
+            with self._search_lock:
+                self._search.index(record, slides)
+
+    def _catch_up_search(self) -> None:
+        """Re-index the records written since the last catch-up, by any worker.
+
+        Records are re-read from the store, so the index always holds their
+        latest version, and the caught-up version is the one the change log
+        was read at.
+        """
+        changes = self._store.changes(self._search_version)
+        if changes is None:
+            return
+        version, presentation_ids = changes
+        for presentation_id in presentation_ids:
+            record = self._store.get(presentation_id)
+            if record is None:
+                self._search.remove(presentation_id)
+                continue
+            try:
+                slides = self._store.get_slides(presentation_id)
+            except ValueError:
+                self._search.remove(presentation_id)
+                continue
+            self._search.index(record, slides)
+        self._search_version = version
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Get document, term and posting counts of the search index."""
+        with self._search_lock:
+            return self._search.stats()
+    
+    def get_slides(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Get the generated slides attached to a presentation."""
+        return self._store.get_slides(presentation_id)
+    
+    def export_pptx(self, presentation_id: str) -> bytes:
+        """Render a presentation and its generated slides as ``.pptx`` file contents.
+
+        Slides are laid out in the order of the presentation template's
+        ``slides_included``.
+        """
+        from ppt_wrapper.pptx import build_pptx
+
+        presentation = self.get_presentation_by_id(presentation_id)
+        return build_pptx(
+            presentation, self.get_slides(presentation_id), self.find_template(presentation)
+        )
+    
+    def find_template(self, presentation: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the template a presentation was created from, if it still exists."""
+        template = self._templates_by_id.get(presentation.get("template_id"))
+        return template.copy() if template is not None else None
     
     def get_templates(self) -> List[Dict[str, Any]]:
         """Get all available templates."""
@@ -112,10 +324,10 @@ class PPTWrapper:
     
     def get_template_by_id(self, template_id: str) -> Dict[str, Any]:
         """Get a specific template by ID."""
-        for template in self._mock_templates:
-            if template["id"] == template_id:
-                return template.copy()
-        raise ValueError(f"Template with ID {template_id} not found")
+        template = self._templates_by_id.get(template_id)
+        if template is None:
+            raise ValueError(f"Template with ID {template_id} not found")
+        return template.copy()
     
     def generate_slide_content(self, topic: str, slide_type: str = "content") -> Dict[str, Any]:
         """Generate mock slide content for a given topic."""
@@ -139,17 +351,32 @@ class PPTWrapper:
         }
         return mock_content
     
-    def get_presentation_stats(self) -> Dict[str, Any]:
-        """Get statistics about presentations."""
-        total_presentations = len(self._mock_presentations)
-        completed_presentations = len([p for p in self._mock_presentations if p["status"] == "completed"])
-        total_slides = sum(p["slides_count"] for p in self._mock_presentations)
+    def get_presentation_stats(self, author: Optional[str] = None) -> Dict[str, Any]:
+        """Get statistics about presentations.
+
+        All figures come from counters the store maintains on every write, so
+        this does not scan the catalogue. Passing ``author`` adds that
+        author's presentation count.
+        """
+        total_presentations = len(self._store)
+        completed_presentations = self._store.count("status", "completed")
+        total_slides = self._store.total_slides()
+        by_template = {
+            template_id: count
+            for template_id, count in self._store.counts("template_id").items()
+            if template_id is not None
+        }
         
-        return {
+        stats = {
             "total_presentations": total_presentations,
             "completed_presentations": completed_presentations,
             "in_progress_presentations": total_presentations - completed_presentations,
             "total_slides": total_slides,
             "average_slides_per_presentation": total_slides / total_presentations if total_presentations > 0 else 0,
-            "available_templates": len(self._mock_templates)
+            "available_templates": len(self._mock_templates),
+            "by_status": self._store.counts("status"),
+            "by_template": by_template,
         }
+        if author is not None:
+            stats["author_presentations"] = self._store.count("author", author)
+        return stats
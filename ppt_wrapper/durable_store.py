@@ -0,0 +1,405 @@
+"""Durable in-memory presentation store backed by a write-ahead log and snapshots."""
+
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ppt_wrapper.records import PresentationRecord
+from ppt_wrapper.store import InMemoryPresentationStore
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is absent
+    msgpack = None
+
+SNAPSHOT_MAGIC = b"PPTSNAP1"
+SNAPSHOT_NAME = "snapshot.bin"
+SYNC_MODES = ("batch", "always", "none")
+# Each frame is a little-endian payload length and CRC-32, then the payload.
+_FRAME = struct.Struct("<II")
+_SNAPSHOT_CHUNK = 1000
+
+
+class Codec:
+    """Binary encoding of log entries and snapshot chunks."""
+
+    def __init__(
+        self,
+        name: str,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[memoryview], Any],
+    ):
+        """Wrap a pair of encode and decode functions under a name."""
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+
+def _json_codec() -> Codec:
+    return Codec(
+        "json",
+        lambda value: json.dumps(value, separators=(",", ":")).encode(),
+        lambda data: json.loads(bytes(data)),
+    )
+
+
+def _msgpack_codec() -> Codec:
+    return Codec(
+        "msgpack",
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Return the named codec, or msgpack when installed and JSON otherwise."""
+    if name is None:
+        name = "msgpack" if msgpack is not None else "json"
+    if name == "json":
+        return _json_codec()
+    if name == "msgpack":
+        if msgpack is None:
+            raise ValueError("The msgpack codec requires the msgpack package")
+        return _msgpack_codec()
+    raise ValueError(f"Unknown codec: {name}")
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_frames(buffer: Any, offset: int = 0) -> Iterator[Tuple[memoryview, int]]:
+    """Yield ``(payload, end_offset)`` for each intact frame, stopping at a torn one."""
+    view = memoryview(buffer)
+    size = len(view)
+    while offset + _FRAME.size <= size:
+        length, checksum = _FRAME.unpack_from(view, offset)
+        start = offset + _FRAME.size
+        end = start + length
+        if end > size:
+            return
+        payload = view[start:end]
+        if zlib.crc32(payload) != checksum:
+            return
+        yield payload, end
+        offset = end
+
+
+class DurablePresentationStore(InMemoryPresentationStore):
+    """Indexed in-memory store made durable by a log and compact snapshots.
+
+    Every mutation is appended to a write-ahead log segment in ``directory``
+    after it has been applied in memory. With ``sync="batch"`` a background
+    thread fsyncs the log at most every ``fsync_interval`` seconds, so a
+    crash loses at most that window of writes. ``"always"`` fsyncs every
+    write; ``"none"`` leaves flushing to the operating system.
+
+    After ``snapshot_every`` logged mutations the background thread writes
+    the whole store to a snapshot, starts a new log segment and deletes
+    older segments. Writers only pause while the snapshot's rows are
+    captured; records are immutable, so encoding and writing them happens
+    outside the lock. Startup memory-maps the snapshot, decodes it in chunks and
+    replays only the log segments written after it. A torn final log entry
+    from a crash is detected by its checksum and truncated. ``add_many``
+    logs its whole batch as one entry, so a batch is recovered entirely or
+    not at all.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sync: str = "batch",
+        fsync_interval: float = 0.05,
+        snapshot_every: int = 100_000,
+        codec: Optional[str] = None,
+        id_prefix: str = "ppt_",
+    ):
+        """Open the store in ``directory``, recovering any existing state."""
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode: {sync}")
+        super().__init__(id_prefix=id_prefix)
+        self.directory = directory
+        self.sync = sync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.codec = get_codec(codec)
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._dirty = False
+        self._snapshot_due = False
+        self._closed = False
+        self._logged_since_snapshot = 0
+        self._batch: Optional[List[List[Any]]] = None
+        os.makedirs(directory, exist_ok=True)
+
+        self._replaying = True
+        start_segment = self._load_snapshot()
+        segments = [s for s in self._segments() if s >= start_segment]
+        for segment in segments:
+            self._replay(segment)
+        self._replaying = False
+        self._segment = segments[-1] if segments else start_segment
+        self._log = open(self._segment_path(self._segment), "ab")
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if sync == "batch" or snapshot_every:
+            self._flusher = threading.Thread(
+                target=self._run_background, name="ppt-wal-flush", daemon=True
+            )
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def add(self, record: Dict[str, Any]) -> PresentationRecord:
+        """Insert a new record. The record must carry a unique ``id``."""
+        with self._lock:
+            stored = super().add(record)
+            self._append(["add", record])
+        return stored
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert several records, logged together as one entry."""
+        with self._lock:
+            self._batch = []
+            try:
+                errors = super().add_many(records)
+            finally:
+                entries, self._batch = self._batch, None
+                if entries:
+                    self._append(["batch", entries])
+        return errors
+
+    def update(self, presentation_id: str, changes: Dict[str, Any]) -> PresentationRecord:
+        """Apply top-level field changes to a record and return it."""
+        with self._lock:
+            record = super().update(presentation_id, changes)
+            self._append(["update", presentation_id, changes])
+        return record
+
+    def delete(self, presentation_id: str) -> PresentationRecord:
+        """Remove a record and return it."""
+        with self._lock:
+            record = super().delete(presentation_id)
+            self._append(["delete", presentation_id])
+        return record
+
+    def set_slides(self, presentation_id: str, slides: List[Dict[str, Any]]) -> None:
+        """Replace the generated slides attached to a record."""
+        with self._lock:
+            super().set_slides(presentation_id, slides)
+            self._append(["slides", presentation_id, slides])
+
+    def flush(self) -> None:
+        """Write buffered log entries and fsync them to disk."""
+        with self._lock:
+            if self._closed:
+                return
+            self._log.flush()
+            if self.sync != "none":
+                os.fsync(self._log.fileno())
+            self._dirty = False
+
+    def snapshot(self) -> None:
+        """Write a snapshot of the whole store and drop the log it covers."""
+        with self._snapshot_lock:
+            with self._lock:
+                self.flush()
+                self._log.close()
+                covered = self._segment
+                self._segment += 1
+                self._log = open(self._segment_path(self._segment), "ab")
+                meta, rows = self._capture(self._segment)
+                self._logged_since_snapshot = 0
+                self._snapshot_due = False
+            self._write_snapshot(meta, rows)
+            for segment in self._segments():
+                if segment <= covered:
+                    os.unlink(self._segment_path(segment))
+
+    def close(self) -> None:
+        """Stop the background thread, take any due snapshot and flush the log."""
+        if self._closed:
+            return
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        if self._snapshot_due:
+            self.snapshot()
+        with self._lock:
+            self.flush()
+            self._log.close()
+            self._closed = True
+        atexit.unregister(self.close)
+
+    def _append(self, entry: List[Any]) -> None:
+        if self._replaying:
+            return
+        if self._batch is not None:
+            self._batch.append(entry)
+            return
+        self._log.write(_frame(self.codec.encode(entry)))
+        self._dirty = True
+        if self.sync == "always":
+            self.flush()
+        self._logged_since_snapshot += 1
+        if (
+            self.snapshot_every
+            and not self._snapshot_due
+            and self._logged_since_snapshot >= self.snapshot_every
+        ):
+            self._snapshot_due = True
+            self._wake.set()
+
+    def _run_background(self) -> None:
+        """Fsync the log every ``fsync_interval`` (batch mode) and take due snapshots."""
+        interval = self.fsync_interval if self.sync == "batch" else None
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            if self._snapshot_due:
+                self.snapshot()
+            elif self._dirty and self.sync == "batch":
+                self.flush()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"wal-{segment:08d}.log")
+
+    def _segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith("wal-") and name.endswith(".log"):
+                segments.append(int(name[4:-4]))
+        return sorted(segments)
+
+    def _replay(self, segment: int) -> None:
+        path = self._segment_path(segment)
+        good = 0
+        with open(path, "rb") as handle:
+            data = handle.read()
+        for payload, end in _read_frames(data):
+            self._apply(self.codec.decode(payload))
+            good = end
+            self._logged_since_snapshot += 1
+        if good < len(data):
+            with open(path, "r+b") as handle:
+                handle.truncate(good)
+
+    def _apply(self, entry: List[Any]) -> None:
+        op, *args = entry
+        if op == "add":
+            super().add(args[0])
+        elif op == "update":
+            super().update(args[0], args[1])
+        elif op == "delete":
+            super().delete(args[0])
+        elif op == "slides":
+            super().set_slides(args[0], args[1])
+        elif op == "batch":
+            for batched in args[0]:
+                self._apply(batched)
+
+    def _capture(
+        self, segment: int
+    ) -> Tuple[Dict[str, Any], Iterator[Tuple[PresentationRecord, Optional[List[Any]]]]]:
+        """Take the snapshot metadata and a consistent copy of the store.
+
+        Called under the lock, so it only copies the row list, the numeric
+        columns and the slide mapping. Rows are never modified in place
+        and ``set_slides`` replaces a record's slide list, so the returned
+        iterator can be consumed after the lock is released.
+        """
+        meta = {
+            "segment": segment,
+            "revision": self._revision,
+            "next_number": self._next_number,
+            "count": len(self),
+        }
+        rows = list(self._rows)
+        slides_counts = self._slides_counts[:]
+        revisions = self._revisions[:]
+        order = self._order[:]
+        slides = dict(self._slides)
+
+        def records() -> Iterator[Tuple[PresentationRecord, Optional[List[Any]]]]:
+            for seq in order:
+                row = rows[seq]
+                if row is not None:
+                    record = PresentationRecord(row, slides_counts[seq], revisions[seq])
+                    yield record, slides.get(row.field("id"))
+
+        return meta, records()
+
+    def _write_snapshot(
+        self,
+        meta: Dict[str, Any],
+        rows: Iterator[Tuple[PresentationRecord, Optional[List[Any]]]],
+    ) -> None:
+        path = os.path.join(self.directory, SNAPSHOT_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as handle:
+            name = self.codec.name.encode()
+            handle.write(SNAPSHOT_MAGIC + bytes([len(name)]) + name)
+            handle.write(_frame(self.codec.encode(meta)))
+            chunk: List[Any] = []
+            for record, slides in rows:
+                chunk.append([record.to_dict(), slides])
+                if len(chunk) == _SNAPSHOT_CHUNK:
+                    handle.write(_frame(self.codec.encode(chunk)))
+                    chunk = []
+            if chunk:
+                handle.write(_frame(self.codec.encode(chunk)))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+        self._fsync_directory()
+
+    def _load_snapshot(self) -> int:
+        """Load the snapshot, if any, and return the first log segment to replay."""
+        path = os.path.join(self.directory, SNAPSHOT_NAME)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                    raise ValueError(f"Not a presentation snapshot: {path}")
+                name_length = mapped[len(SNAPSHOT_MAGIC)]
+                offset = len(SNAPSHOT_MAGIC) + 1
+                codec = get_codec(mapped[offset : offset + name_length].decode())
+                frames = _read_frames(mapped, offset + name_length)
+                meta = None
+                for payload, _ in frames:
+                    decoded = codec.decode(payload)
+                    payload.release()
+                    if meta is None:
+                        meta = decoded
+                        continue
+                    for record, slides in decoded:
+                        self._insert(record)
+                        if slides is not None:
+                            self._slides[record["id"]] = slides
+        if meta is None or len(self) != meta["count"]:
+            raise ValueError(f"Truncated presentation snapshot: {path}")
+        self._revision = meta["revision"]
+        self._next_number = max(self._next_number, meta["next_number"])
+        return meta["segment"]
+
+    def _fsync_directory(self) -> None:
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
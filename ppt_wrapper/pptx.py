@@ -0,0 +1,402 @@
+"""Office Open XML (``.pptx``) rendering of presentations."""
+
+import hashlib
+import json
+import re
+import zipfile
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+TITLE_LAYOUT = "title"
+CONTENT_LAYOUT = "content"
+# Layout part numbers, in the order the slide master lists them.
+LAYOUTS = {TITLE_LAYOUT: 1, CONTENT_LAYOUT: 2}
+
+# Fixed entry timestamps keep identical exports byte-for-byte identical.
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+)
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CT = "application/vnd.openxmlformats-officedocument.presentationml"
+
+# Slide size is 16:9, in EMU.
+_WIDTH, _HEIGHT = 12192000, 6858000
+_FRAMES = {
+    "title": (838200, 365125, 10515600, 1325563),
+    "body": (838200, 1825625, 10515600, 4351338),
+    "ctrTitle": (1524000, 1122363, 9144000, 2387600),
+    "subTitle": (1524000, 3602038, 9144000, 1655762),
+}
+_PLACEHOLDERS = {
+    "title": '<p:ph type="title"/>',
+    "body": '<p:ph idx="1"/>',
+    "ctrTitle": '<p:ph type="ctrTitle"/>',
+    "subTitle": '<p:ph type="subTitle" idx="1"/>',
+}
+_GROUP = (
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+)
+
+
+def slide_specs(
+    presentation: Mapping[str, Any],
+    slides: Sequence[Mapping[str, Any]],
+    template: Optional[Mapping[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Lay out a presentation as a list of slide specs, one per slide.
+
+    The deck opens with a cover built from the presentation's title,
+    author and summary. With a template, one slide follows for each entry
+    of ``slides_included``: the next generated slide of that type, or a
+    section heading when none was generated. Generated slides of types the
+    template does not list come last. A spec holds everything a slide's
+    XML depends on, so equal specs render to equal parts.
+    """
+    content = presentation.get("content") or {}
+    cover = {
+        "layout": TITLE_LAYOUT,
+        "title": presentation.get("title") or "",
+        "lines": [
+            line for line in (presentation.get("author"), content.get("summary")) if line
+        ],
+    }
+    remaining = list(slides)
+    ordered: List[Dict[str, Any]] = []
+    for slide_type in (template or {}).get("slides_included") or ():
+        for index, slide in enumerate(remaining):
+            if slide.get("slide_type") == slide_type:
+                ordered.append(_slide_spec(remaining.pop(index)))
+                break
+        else:
+            heading = slide_type.replace("_", " ").title()
+            ordered.append({"layout": CONTENT_LAYOUT, "title": heading, "lines": []})
+    ordered.extend(_slide_spec(slide) for slide in remaining)
+    return [cover] + ordered
+
+
+def _slide_spec(slide: Mapping[str, Any]) -> Dict[str, Any]:
+    bullets = list((slide.get("content") or {}).get("bullet_points") or ())
+    layout = TITLE_LAYOUT if slide.get("slide_type") == "title" else CONTENT_LAYOUT
+    return {"layout": layout, "title": slide.get("title") or "", "lines": bullets}
+
+
+def spec_key(spec: Mapping[str, Any]) -> str:
+    """Return a content hash identifying the part rendered from ``spec``."""
+    encoded = json.dumps(spec, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def render_slide(spec: Mapping[str, Any]) -> bytes:
+    """Render one slide spec as the XML of a slide part."""
+    if spec["layout"] == TITLE_LAYOUT:
+        title_kind, body_kind = "ctrTitle", "subTitle"
+    else:
+        title_kind, body_kind = "title", "body"
+    shapes = _shape(2, "Title 1", title_kind, [spec["title"]], frame=False) + _shape(
+        3, "Content 2", body_kind, spec["lines"], frame=False
+    )
+    return (
+        f"{_XML}<p:sld {_NS}><p:cSld><p:spTree>{_GROUP}{shapes}</p:spTree></p:cSld>"
+        "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+    ).encode()
+
+
+def slide_part_name(number: int) -> str:
+    """Return the zip entry name of the ``number``-th slide (from 1)."""
+    return f"ppt/slides/slide{number}.xml"
+
+
+def package_parts(
+    presentation: Mapping[str, Any], specs: Sequence[Mapping[str, Any]]
+) -> List[Tuple[str, bytes]]:
+    """Return every part of the package except the slide XML itself.
+
+    ``[Content_Types].xml`` comes first, as some readers expect.
+    """
+    count = len(specs)
+    slide_types = "".join(
+        f'<Override PartName="/{slide_part_name(n)}" ContentType="{_CT}.slide+xml"/>'
+        for n in range(1, count + 1)
+    )
+    layout_types = "".join(
+        f'<Override PartName="/ppt/slideLayouts/slideLayout{n}.xml" '
+        f'ContentType="{_CT}.slideLayout+xml"/>'
+        for n in LAYOUTS.values()
+    )
+    content_types = (
+        f'{_XML}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        f'<Override PartName="/ppt/presentation.xml" ContentType="{_CT}.presentation.main+xml"/>'
+        '<Override PartName="/ppt/slideMasters/slideMaster1.xml" '
+        f'ContentType="{_CT}.slideMaster+xml"/>{layout_types}'
+        '<Override PartName="/ppt/theme/theme1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/>'
+        f"{slide_types}"
+        '<Override PartName="/docProps/core.xml" '
+        'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+        '<Override PartName="/docProps/app.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+        "</Types>"
+    )
+    root_rels = _relationships(
+        [
+            (f"{_REL}/officeDocument", "ppt/presentation.xml"),
+            (
+                "http://schemas.openxmlformats.org/package/2006/relationships/"
+                "metadata/core-properties",
+                "docProps/core.xml",
+            ),
+            (f"{_REL}/extended-properties", "docProps/app.xml"),
+        ]
+    )
+    slide_ids = "".join(
+        f'<p:sldId id="{255 + n}" r:id="rId{n + 2}"/>' for n in range(1, count + 1)
+    )
+    presentation_xml = (
+        f'{_XML}<p:presentation {_NS} saveSubsetFonts="1">'
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        f"<p:sldIdLst>{slide_ids}</p:sldIdLst>"
+        f'<p:sldSz cx="{_WIDTH}" cy="{_HEIGHT}"/><p:notesSz cx="6858000" cy="9144000"/>'
+        "</p:presentation>"
+    )
+    presentation_rels = _relationships(
+        [
+            (f"{_REL}/slideMaster", "slideMasters/slideMaster1.xml"),
+            (f"{_REL}/theme", "theme/theme1.xml"),
+        ]
+        + [(f"{_REL}/slide", f"slides/slide{n}.xml") for n in range(1, count + 1)]
+    )
+    parts = [
+        ("[Content_Types].xml", content_types.encode()),
+        ("_rels/.rels", root_rels),
+        ("docProps/core.xml", _core_properties(presentation)),
+        ("docProps/app.xml", _app_properties(count)),
+        ("ppt/presentation.xml", presentation_xml.encode()),
+        ("ppt/_rels/presentation.xml.rels", presentation_rels),
+        ("ppt/slideMasters/slideMaster1.xml", _MASTER),
+        ("ppt/slideMasters/_rels/slideMaster1.xml.rels", _MASTER_RELS),
+        ("ppt/theme/theme1.xml", _THEME),
+    ]
+    for layout, number in LAYOUTS.items():
+        parts.append((f"ppt/slideLayouts/slideLayout{number}.xml", _LAYOUT_PARTS[layout]))
+        parts.append((f"ppt/slideLayouts/_rels/slideLayout{number}.xml.rels", _LAYOUT_RELS))
+    for number, spec in enumerate(specs, 1):
+        layout = LAYOUTS[spec["layout"]]
+        rels = _relationships(
+            [(f"{_REL}/slideLayout", f"../slideLayouts/slideLayout{layout}.xml")]
+        )
+        parts.append((f"ppt/slides/_rels/slide{number}.xml.rels", rels))
+    return parts
+
+
+def build_pptx(
+    presentation: Mapping[str, Any],
+    slides: Sequence[Mapping[str, Any]],
+    template: Optional[Mapping[str, Any]] = None,
+) -> bytes:
+    """Render a whole presentation as ``.pptx`` file contents."""
+    specs = slide_specs(presentation, slides, template)
+    stream = ZipStream()
+    chunks = [stream.add(name, data) for name, data in package_parts(presentation, specs)]
+    for number, spec in enumerate(specs, 1):
+        chunks.append(stream.add(slide_part_name(number), render_slide(spec)))
+    chunks.append(stream.close())
+    return b"".join(chunks)
+
+
+class ZipStream:
+    """Builds a zip archive entry by entry, handing back bytes as they are written.
+
+    The archive is never held in memory as a whole: ``add`` returns the
+    bytes of one compressed entry and ``close`` the central directory.
+    Entry sizes follow each entry in a data descriptor, as when writing to
+    any unseekable stream.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        """Start an empty archive."""
+        self.compression = compression
+        self._chunks: List[bytes] = []
+        self._zip = zipfile.ZipFile(self, "w", compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """Compress one entry and return the archive bytes it produced."""
+        info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+        info.compress_type = self.compression
+        self._zip.writestr(info, data)
+        return self._drain()
+
+    def close(self) -> bytes:
+        """Finish the archive and return its remaining bytes."""
+        self._zip.close()
+        return self._drain()
+
+    def write(self, data: bytes) -> int:
+        """Collect bytes written by ``zipfile``."""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush; bytes are handed out by ``add`` and ``close``."""
+
+    def _drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _text(value: Any) -> str:
+    return escape(_INVALID_XML_CHARS.sub("", str(value)))
+
+
+def _paragraphs(lines: Iterable[str]) -> str:
+    paragraphs = "".join(
+        f'<a:p><a:r><a:rPr lang="en-US" dirty="0"/><a:t>{_text(line)}</a:t></a:r></a:p>'
+        for line in lines
+    )
+    return paragraphs or '<a:p><a:endParaRPr lang="en-US" dirty="0"/></a:p>'
+
+
+def _shape(shape_id: int, name: str, kind: str, lines: Iterable[str], frame: bool) -> str:
+    xfrm = ""
+    if frame:
+        x, y, cx, cy = _FRAMES[kind]
+        xfrm = f'<a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+        f"<p:nvPr>{_PLACEHOLDERS[kind]}</p:nvPr></p:nvSpPr><p:spPr>{xfrm}</p:spPr>"
+        f"<p:txBody><a:bodyPr/><a:lstStyle/>{_paragraphs(lines)}</p:txBody></p:sp>"
+    )
+
+
+def _relationships(targets: Sequence[Tuple[str, str]]) -> bytes:
+    entries = "".join(
+        f'<Relationship Id="rId{n}" Type="{kind}" Target="{target}"/>'
+        for n, (kind, target) in enumerate(targets, 1)
+    )
+    return (
+        f"{_XML}<Relationships "
+        f'xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f"{entries}</Relationships>"
+    ).encode()
+
+
+def _core_properties(presentation: Mapping[str, Any]) -> bytes:
+    created = ""
+    if presentation.get("created_at"):
+        created = (
+            '<dcterms:created xsi:type="dcterms:W3CDTF">'
+            f"{_text(presentation['created_at'])}</dcterms:created>"
+        )
+    return (
+        f"{_XML}<cp:coreProperties "
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<dc:title>{_text(presentation.get('title') or '')}</dc:title>"
+        f"<dc:creator>{_text(presentation.get('author') or '')}</dc:creator>"
+        f"{created}</cp:coreProperties>"
+    ).encode()
+
+
+def _app_properties(slide_count: int) -> bytes:
+    return (
+        f"{_XML}<Properties "
+        'xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+        f"<Application>Gen AI Gateway</Application><Slides>{slide_count}</Slides>"
+        "</Properties>"
+    ).encode()
+
+
+def _layout(kind: str, name: str, title: str, body: str) -> bytes:
+    shapes = _shape(2, "Title 1", title, [], frame=True) + _shape(
+        3, "Content 2", body, [], frame=True
+    )
+    return (
+        f'{_XML}<p:sldLayout {_NS} type="{kind}" preserve="1">'
+        f'<p:cSld name="{name}"><p:spTree>{_GROUP}{shapes}</p:spTree></p:cSld>'
+        "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>"
+    ).encode()
+
+
+def _level_style(size: int, bullet: bool) -> str:
+    bullet_xml = (
+        '<a:buFont typeface="Arial"/><a:buChar char="&#8226;"/>' if bullet else "<a:buNone/>"
+    )
+    margin = ' marL="228600" indent="-228600"' if bullet else ""
+    return (
+        f'<a:lvl1pPr{margin} algn="l">{bullet_xml}'
+        f'<a:defRPr sz="{size}"><a:solidFill><a:schemeClr val="tx1"/></a:solidFill>'
+        "</a:defRPr></a:lvl1pPr>"
+    )
+
+
+_LAYOUT_PARTS = {
+    TITLE_LAYOUT: _layout("title", "Title Slide", "ctrTitle", "subTitle"),
+    CONTENT_LAYOUT: _layout("obj", "Title and Content", "title", "body"),
+}
+_LAYOUT_RELS = _relationships([(f"{_REL}/slideMaster", "../slideMasters/slideMaster1.xml")])
+_MASTER = (
+    f"{_XML}<p:sldMaster {_NS}><p:cSld>"
+    '<p:bg><p:bgRef idx="1001"><a:schemeClr val="bg1"/></p:bgRef></p:bg>'
+    f'<p:spTree>{_GROUP}{_shape(2, "Title 1", "title", [], frame=True)}'
+    f'{_shape(3, "Content 2", "body", [], frame=True)}</p:spTree></p:cSld>'
+    '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" '
+    'accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" '
+    'accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+    "<p:sldLayoutIdLst>"
+    + "".join(
+        f'<p:sldLayoutId id="{2147483648 + n}" r:id="rId{n}"/>' for n in LAYOUTS.values()
+    )
+    + "</p:sldLayoutIdLst><p:txStyles>"
+    f"<p:titleStyle>{_level_style(4400, False)}</p:titleStyle>"
+    f"<p:bodyStyle>{_level_style(2800, True)}</p:bodyStyle>"
+    f"<p:otherStyle>{_level_style(1800, False)}</p:otherStyle>"
+    "</p:txStyles></p:sldMaster>"
+).encode()
+_MASTER_RELS = _relationships(
+    [(f"{_REL}/slideLayout", f"../slideLayouts/slideLayout{n}.xml") for n in LAYOUTS.values()]
+    + [(f"{_REL}/theme", "../theme/theme1.xml")]
+)
+_SCHEME_FILL = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+_SCHEME_LINE = f'<a:ln w="6350">{_SCHEME_FILL}</a:ln>'
+_THEME = (
+    f'{_XML}<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'name="Gateway"><a:themeElements><a:clrScheme name="Gateway">'
+    '<a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>'
+    '<a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>'
+    '<a:dk2><a:srgbClr val="1F2937"/></a:dk2><a:lt2><a:srgbClr val="F3F4F6"/></a:lt2>'
+    + "".join(
+        f'<a:accent{n}><a:srgbClr val="{color}"/></a:accent{n}>'
+        for n, color in enumerate(
+            ("2563EB", "059669", "D97706", "DC2626", "7C3AED", "0891B2"), 1
+        )
+    )
+    + '<a:hlink><a:srgbClr val="2563EB"/></a:hlink>'
+    '<a:folHlink><a:srgbClr val="7C3AED"/></a:folHlink></a:clrScheme>'
+    '<a:fontScheme name="Gateway">'
+    '<a:majorFont><a:latin typeface="Calibri Light"/><a:ea typeface=""/>'
+    '<a:cs typeface=""/></a:majorFont>'
+    '<a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/>'
+    '<a:cs typeface=""/></a:minorFont></a:fontScheme>'
+    '<a:fmtScheme name="Gateway">'
+    f"<a:fillStyleLst>{_SCHEME_FILL * 3}</a:fillStyleLst>"
+    f"<a:lnStyleLst>{_SCHEME_LINE * 3}</a:lnStyleLst>"
+    f"<a:effectStyleLst>{'<a:effectStyle><a:effectLst/></a:effectStyle>' * 3}"
+    "</a:effectStyleLst>"
+    f"<a:bgFillStyleLst>{_SCHEME_FILL * 3}</a:bgFillStyleLst>"
+    "</a:fmtScheme></a:themeElements></a:theme>"
+).encode()
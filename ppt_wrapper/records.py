@@ -0,0 +1,146 @@
+"""Compact, immutable presentation records for the in-memory store."""
+
+import copy
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Top-level fields with dedicated slots, in the order views list them.
+RECORD_FIELDS: Tuple[str, ...] = (
+    "id",
+    "title",
+    "author",
+    "created_at",
+    "slides_count",
+    "status",
+    "template_id",
+    "content",
+    "revision",
+)
+CONTENT_FIELDS = frozenset(("summary", "key_topics", "audience"))
+_ROW_FIELDS = ("id", "title", "author", "created_at", "status", "template_id")
+# Fields whose values repeat across the catalogue and are interned.
+_INTERNED_FIELDS = frozenset(("author", "status", "template_id"))
+_MISSING: Any = object()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class PresentationRow:
+    """The string and nested fields of one stored presentation version.
+
+    ``slides_count`` and ``revision`` are kept in the store's numeric
+    columns instead. Repeated values (author, status, template, audience,
+    key topics) are interned, and standard ``content`` is flattened into a
+    tuple. Rows are never modified; an update stores a new row.
+    """
+
+    __slots__ = _ROW_FIELDS + ("content", "extra")
+
+    def __init__(self, record: Mapping[str, Any]):
+        """Pack a record's fields, copying anything mutable."""
+        for field in _ROW_FIELDS:
+            value = record.get(field, _MISSING)
+            setattr(self, field, _intern(value) if field in _INTERNED_FIELDS else value)
+        self.content = _pack_content(record.get("content", _MISSING))
+        extra = {
+            key: copy.deepcopy(value)
+            for key, value in record.items()
+            if key not in RECORD_FIELDS
+        }
+        self.extra: Optional[Dict[str, Any]] = extra or None
+
+    def field(self, name: str) -> Any:
+        """Return an indexed field's value, or ``None`` when it is absent."""
+        value = getattr(self, name)
+        return None if value is _MISSING else value
+
+
+def _pack_content(content: Any) -> Any:
+    if type(content) is dict and content.keys() == CONTENT_FIELDS:
+        topics = content["key_topics"]
+        if type(topics) is list and all(type(topic) is str for topic in topics):
+            return (
+                content["summary"],
+                tuple(sys.intern(topic) for topic in topics),
+                _intern(content["audience"]),
+            )
+    if content is _MISSING or content is None:
+        return content
+    return copy.deepcopy(content)
+
+
+def _unpack_content(content: Any) -> Any:
+    if type(content) is tuple:
+        summary, topics, audience = content
+        return {"summary": summary, "key_topics": list(topics), "audience": audience}
+    return copy.deepcopy(content)
+
+
+class PresentationRecord(Mapping):
+    """Read-only mapping view of one version of a stored presentation.
+
+    Views are cheap to create and never change: an update stores a new
+    row, so a view keeps showing the version it was created from. Nested
+    values such as ``content`` are returned as fresh copies, so callers
+    cannot modify the store through them. ``to_dict`` makes a mutable copy.
+    """
+
+    __slots__ = ("_row", "_slides_count", "_revision")
+
+    def __init__(self, row: PresentationRow, slides_count: int, revision: int):
+        """Wrap a row with its numeric column values."""
+        self._row = row
+        self._slides_count = slides_count
+        self._revision = revision
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field's value."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field's value, or ``default`` when it is absent."""
+        row = self._row
+        if key in _ROW_FIELDS:
+            value = getattr(row, key)
+        elif key == "slides_count":
+            return self._slides_count
+        elif key == "revision":
+            return self._revision
+        elif key == "content":
+            value = row.content
+            if value is not _MISSING:
+                value = _unpack_content(value)
+        elif row.extra is not None and key in row.extra:
+            return copy.deepcopy(row.extra[key])
+        else:
+            return default
+        return default if value is _MISSING else value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields present, in a fixed order."""
+        row = self._row
+        for field in RECORD_FIELDS:
+            if field in ("slides_count", "revision"):
+                yield field
+            elif getattr(row, field) is not _MISSING:
+                yield field
+        if row.extra is not None:
+            yield from row.extra
+
+    def __len__(self) -> int:
+        """Return the number of fields present."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Show the record like a dict."""
+        return f"PresentationRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a mutable copy of the record as a plain dict."""
+        return {key: self.get(key) for key in self}
@@ -0,0 +1,247 @@
+"""Full-text search over presentations for the PPT wrapper."""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or that the this to "
+    "with".split()
+)
+# Title terms count this many times, so title matches outrank body matches.
+TITLE_WEIGHT = 2
+# Term frequencies are stored as unsigned 16-bit integers.
+_MAX_TF = 0xFFFF
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case alphanumeric terms, dropping stopwords."""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS
+    ]
+
+
+def presentation_terms(
+    record: Mapping[str, Any], slides: Iterable[Mapping[str, Any]] = ()
+) -> List[str]:
+    """Return the searchable terms of a presentation and its generated slides.
+
+    Covers the title, ``content.summary`` and ``content.key_topics``, plus
+    each slide's title, topic and bullet points.
+    """
+    terms = tokenize(record.get("title") or "") * TITLE_WEIGHT
+    content = record.get("content") or {}
+    terms += tokenize(content.get("summary") or "")
+    for topic in content.get("key_topics") or ():
+        terms += tokenize(topic)
+    for slide in slides:
+        terms += tokenize(slide.get("title") or "")
+        terms += tokenize(slide.get("topic") or "")
+        for point in (slide.get("content") or {}).get("bullet_points") or ():
+            terms += tokenize(point)
+    return terms
+
+
+class SearchIndex:
+    """Inverted index over presentations, ranked with BM25.
+
+    Each indexed version of a presentation gets a document number, in
+    increasing order, and each term maps to a pair of compact arrays: the
+    numbers of the documents containing it and the term's frequency in
+    each. Re-indexing a presentation appends a new document and leaves a
+    tombstone for the old one; once tombstones outnumber live documents the
+    postings are rewritten without them.
+
+    Query terms are scored rarest first, and at most ``max_candidates``
+    documents are ranked. A term whose documents fit in the remaining room
+    adds all of them; a more common term only adds to the scores of
+    documents already matched, and, while fewer than ``limit`` have
+    matched, fills the room with its most recently indexed documents. A
+    query therefore costs about as much as its rarest terms, whatever the
+    size of the catalogue.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_candidates: int = 5_000):
+        """Initialize an empty index with BM25 parameters ``k1`` and ``b``."""
+        self.k1 = k1
+        self.b = b
+        self.max_candidates = max_candidates
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_lengths = array("I")
+        self._docno_by_id: Dict[str, int] = {}
+        self._total_length = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed presentations."""
+        return len(self._docno_by_id)
+
+    def __contains__(self, presentation_id: object) -> bool:
+        """Return whether a presentation is indexed."""
+        return presentation_id in self._docno_by_id
+
+    def index(
+        self, record: Mapping[str, Any], slides: Iterable[Mapping[str, Any]] = ()
+    ) -> None:
+        """Index a presentation, replacing any previously indexed version."""
+        presentation_id = record["id"]
+        self._remove(presentation_id)
+        terms = presentation_terms(record, slides)
+        docno = len(self._doc_ids)
+        self._doc_ids.append(presentation_id)
+        self._doc_lengths.append(len(terms))
+        self._docno_by_id[presentation_id] = docno
+        self._total_length += len(terms)
+        for term, frequency in Counter(terms).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(docno)
+            postings[1].append(min(frequency, _MAX_TF))
+        self._maybe_compact()
+
+    def remove(self, presentation_id: str) -> None:
+        """Drop a presentation from the index, if present."""
+        self._remove(presentation_id)
+        self._maybe_compact()
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(presentation_id, score)`` pairs, best first."""
+        live = len(self._docno_by_id)
+        if not live or limit < 1:
+            return []
+        terms = []
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                terms.append(postings)
+        terms.sort(key=lambda postings: len(postings[0]))
+
+        average = self._total_length / live
+        scores: Dict[int, float] = {}
+        for docs, frequencies in terms:
+            df = min(len(docs), live)
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+            room = max(self.max_candidates, limit) - len(scores)
+            if len(docs) <= room:
+                self._accumulate(scores, docs, frequencies, idf, average, 0)
+                continue
+            if scores:
+                self._rescore(scores, docs, frequencies, idf, average)
+            if len(scores) < limit:
+                start = len(docs) - room
+                self._accumulate(scores, docs, frequencies, idf, average, start, False)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(self._doc_ids[docno], score) for docno, score in best]
+
+    def _accumulate(
+        self,
+        scores: Dict[int, float],
+        docs: array,
+        frequencies: array,
+        idf: float,
+        average: float,
+        start: int,
+        update: bool = True,
+    ) -> None:
+        """Add a term's scores for postings from ``start`` on.
+
+        With ``update`` false, documents already scored are skipped.
+        """
+        k1, b = self.k1, self.b
+        lengths = self._doc_lengths
+        for position in range(start, len(docs)):
+            docno = docs[position]
+            length = lengths[docno]
+            if not length or (not update and docno in scores):
+                continue
+            tf = frequencies[position]
+            norm = k1 * (1 - b + b * length / average)
+            scores[docno] = scores.get(docno, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+    def _rescore(
+        self,
+        scores: Dict[int, float],
+        docs: array,
+        frequencies: array,
+        idf: float,
+        average: float,
+    ) -> None:
+        """Add a term's scores to documents that are already candidates."""
+        k1, b = self.k1, self.b
+        lengths = self._doc_lengths
+        size = len(docs)
+        if size <= 8 * len(scores):
+            matches = (
+                (position, docno)
+                for position, docno in enumerate(docs)
+                if docno in scores
+            )
+        else:
+            matches = []
+            for docno in scores:
+                position = bisect_left(docs, docno)
+                if position < size and docs[position] == docno:
+                    matches.append((position, docno))
+        for position, docno in matches:
+            tf = frequencies[position]
+            norm = k1 * (1 - b + b * lengths[docno] / average)
+            scores[docno] += idf * tf * (k1 + 1) / (tf + norm)
+
+    def compact(self) -> None:
+        """Rewrite postings without tombstoned documents and renumber the rest."""
+        renumbered = array("i", [-1]) * len(self._doc_ids)
+        doc_ids: List[Optional[str]] = []
+        lengths = array("I")
+        for docno, presentation_id in enumerate(self._doc_ids):
+            if presentation_id is not None:
+                renumbered[docno] = len(doc_ids)
+                doc_ids.append(presentation_id)
+                lengths.append(self._doc_lengths[docno])
+        postings: Dict[str, Tuple[array, array]] = {}
+        for term, (docs, frequencies) in self._postings.items():
+            kept_docs, kept_frequencies = array("I"), array("H")
+            for docno, frequency in zip(docs, frequencies):
+                new = renumbered[docno]
+                if new >= 0:
+                    kept_docs.append(new)
+                    kept_frequencies.append(frequency)
+            if kept_docs:
+                postings[term] = (kept_docs, kept_frequencies)
+        self._postings = postings
+        self._doc_ids = doc_ids
+        self._doc_lengths = lengths
+        self._docno_by_id = {
+            presentation_id: docno for docno, presentation_id in enumerate(doc_ids)
+        }
+        self._dead = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return document, term and posting counts."""
+        postings = sum(len(docs) for docs, _ in self._postings.values())
+        return {
+            "documents": len(self._docno_by_id),
+            "tombstones": self._dead,
+            "terms": len(self._postings),
+            "postings": postings,
+            "posting_bytes": postings * 6,
+        }
+
+    def _remove(self, presentation_id: str) -> None:
+        docno = self._docno_by_id.pop(presentation_id, None)
+        if docno is None:
+            return
+        self._doc_ids[docno] = None
+        self._total_length -= self._doc_lengths[docno]
+        self._doc_lengths[docno] = 0
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        if self._dead > 1000 and self._dead > len(self._docno_by_id):
+            self.compact()
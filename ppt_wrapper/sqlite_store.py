@@ -0,0 +1,419 @@
+"""SQLite presentation store shared by several worker processes."""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ppt_wrapper.store import INDEXED_FIELDS, PresentationStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presentations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    author TEXT,
+    status TEXT,
+    template_id TEXT,
+    slides_count INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presentations_author ON presentations (author, seq);
+CREATE INDEX IF NOT EXISTS presentations_status ON presentations (status, seq);
+CREATE INDEX IF NOT EXISTS presentations_template_id ON presentations (template_id, seq);
+
+CREATE TABLE IF NOT EXISTS slides (
+    presentation_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS changes (
+    id TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_revision ON changes (revision);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES
+    ('presentations', 0), ('total_slides', 0), ('next_number', 1), ('seeded', 0),
+    ('revision', 0);
+
+CREATE TABLE IF NOT EXISTS value_counts (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (field, value)
+);
+"""
+
+# Value counts key NULL as 'n' and any other value v as 's:' || v.
+_COUNT_KEY = "COALESCE('s:' || {row}.{field}, 'n')"
+
+_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS presentations_counted_insert
+AFTER INSERT ON presentations BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'presentations';
+    UPDATE counters SET value = value + NEW.slides_count WHERE name = 'total_slides';
+    {insert_counts}
+END;
+CREATE TRIGGER IF NOT EXISTS presentations_counted_delete
+AFTER DELETE ON presentations BEGIN
+    UPDATE counters SET value = value - 1 WHERE name = 'presentations';
+    UPDATE counters SET value = value - OLD.slides_count WHERE name = 'total_slides';
+    {delete_counts}
+    {prune_counts}
+    DELETE FROM slides WHERE presentation_id = OLD.id;
+END;
+CREATE TRIGGER IF NOT EXISTS presentations_counted_update
+AFTER UPDATE ON presentations BEGIN
+    UPDATE counters SET value = value - OLD.slides_count + NEW.slides_count
+        WHERE name = 'total_slides';
+    {delete_counts}
+    {insert_counts}
+    {prune_counts}
+END;
+"""
+
+
+def _count_statements(row: str, delta: str) -> str:
+    statements = []
+    for field in INDEXED_FIELDS:
+        key = _COUNT_KEY.format(row=row, field=field)
+        statements.append(
+            f"INSERT INTO value_counts (field, value, count) VALUES ('{field}', {key}, {delta}) "
+            f"ON CONFLICT (field, value) DO UPDATE SET count = count + {delta};"
+        )
+    return "\n    ".join(statements)
+
+
+def _prune_statements(row: str) -> str:
+    return "\n    ".join(
+        f"DELETE FROM value_counts WHERE field = '{field}' "
+        f"AND value = {_COUNT_KEY.format(row=row, field=field)} AND count = 0;"
+        for field in INDEXED_FIELDS
+    )
+
+
+TRIGGERS = _TRIGGERS.format(
+    insert_counts=_count_statements("NEW", "1"),
+    delete_counts=_count_statements("OLD", "-1"),
+    prune_counts=_prune_statements("OLD"),
+)
+
+
+class SQLiteConnectionPool:
+    """Per-thread SQLite connections to one database in WAL mode.
+
+    WAL lets readers in every worker proceed while one writer commits.
+    Connections run in autocommit mode; use ``transaction`` for atomic
+    read-modify-write sequences.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """Initialize the pool for the database at ``path``."""
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in an immediate (write-locking) transaction."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+class SQLitePresentationStore(PresentationStore):
+    """Presentation store in a SQLite database shared by all workers.
+
+    Records are kept as JSON with the indexed fields mirrored into indexed
+    columns. Triggers maintain the record, slide and per-value counters in
+    the same transaction as each write, so aggregates stay O(1) and
+    consistent across processes. IDs come from a counter row incremented
+    under the write lock, so concurrent workers never allocate the same ID.
+    Each write also records the revision it produced against the record's
+    ID, so ``changes`` can tell other workers what to catch up on.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, id_prefix: str = "ppt_"):
+        """Open (and create if needed) the database at ``path``."""
+        self._id_prefix = id_prefix
+        self.pool = SQLiteConnectionPool(path)
+        conn = self.pool.connection()
+        conn.executescript(SCHEMA)
+        conn.executescript(TRIGGERS)
+
+    def seed(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert seed records once per database, whichever worker gets there first."""
+        with self.pool.transaction() as conn:
+            if self._counter(conn, "seeded"):
+                return
+            for record in records:
+                if not conn.execute(
+                    "SELECT 1 FROM presentations WHERE id = ?", (record["id"],)
+                ).fetchone():
+                    self._insert(conn, record)
+            conn.execute("UPDATE counters SET value = 1 WHERE name = 'seeded'")
+
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a new record. The record must carry a unique ``id``."""
+        try:
+            with self.pool.transaction() as conn:
+                self._insert(conn, record)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Presentation with ID {record['id']} already exists") from None
+        return record
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert several records in one transaction.
+
+        IDs are allocated for records whose ``id`` is ``None``; records with
+        an ID that already exists are skipped and reported.
+        """
+        errors: List[Optional[str]] = []
+        with self.pool.transaction() as conn:
+            for record in records:
+                if record.get("id") is None:
+                    record["id"] = self._allocate_id(conn)
+                elif self._exists(conn, record["id"]):
+                    errors.append(f"Presentation with ID {record['id']} already exists")
+                    continue
+                self._insert(conn, record)
+                errors.append(None)
+        return errors
+
+    def get(self, presentation_id: str) -> Optional[Dict[str, Any]]:
+        """Return the record with the given ID, or ``None``."""
+        row = self.pool.connection().execute(
+            "SELECT data FROM presentations WHERE id = ?", (presentation_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, presentation_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply top-level field changes to a record and return it."""
+        if "id" in changes and changes["id"] != presentation_id:
+            raise ValueError("Presentation ID cannot be changed")
+        with self.pool.transaction() as conn:
+            record = self._require(conn, presentation_id)
+            record.update(changes)
+            record["revision"] = self._next_revision(conn, presentation_id)
+            conn.execute(
+                "UPDATE presentations SET author = ?, status = ?, template_id = ?, "
+                "slides_count = ?, data = ? WHERE id = ?",
+                (*self._columns(record), presentation_id),
+            )
+        return record
+
+    def delete(self, presentation_id: str) -> Dict[str, Any]:
+        """Remove a record and return it."""
+        with self.pool.transaction() as conn:
+            record = self._require(conn, presentation_id)
+            conn.execute("DELETE FROM presentations WHERE id = ?", (presentation_id,))
+            self._next_revision(conn, presentation_id)
+        return record
+
+    def find(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Return records matching all given indexed field values."""
+        where, params = self._where(filters)
+        rows = self.pool.connection().execute(
+            f"SELECT data FROM presentations {where} ORDER BY seq", params
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def get_slides(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Return the generated slides attached to a record."""
+        conn = self.pool.connection()
+        self._require(conn, presentation_id)
+        row = conn.execute(
+            "SELECT data FROM slides WHERE presentation_id = ?", (presentation_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def set_slides(self, presentation_id: str, slides: List[Dict[str, Any]]) -> None:
+        """Replace the generated slides attached to a record."""
+        with self.pool.transaction() as conn:
+            self._require(conn, presentation_id)
+            conn.execute(
+                "INSERT OR REPLACE INTO slides (presentation_id, data) VALUES (?, ?)",
+                (presentation_id, json.dumps(slides)),
+            )
+            self._next_revision(conn, presentation_id)
+
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return up to ``limit`` matching records positioned after ``after``.
+
+        Positions are the table's ``seq`` column, so each page is one range
+        scan over the matching index.
+        """
+        where, params = self._where(filters, after)
+        rows = self.pool.connection().execute(
+            f"SELECT seq, data FROM presentations {where} ORDER BY seq LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        records = [json.loads(data) for _, data in rows[:limit]]
+        last = rows[limit - 1][0] if len(rows) > limit else None
+        return records, last
+
+    def count(self, field: str, value: Any) -> int:
+        """Return how many records have ``value`` in the indexed ``field``."""
+        row = self.pool.connection().execute(
+            "SELECT count FROM value_counts WHERE field = ? AND value = ?",
+            (field, "n" if value is None else f"s:{value}"),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Return record counts for every value of the indexed ``field``."""
+        rows = self.pool.connection().execute(
+            "SELECT value, count FROM value_counts WHERE field = ?", (field,)
+        )
+        return {(None if key == "n" else key[2:]): count for key, count in rows}
+
+    def total_slides(self) -> int:
+        """Return the sum of ``slides_count`` over all records."""
+        return self._counter(self.pool.connection(), "total_slides")
+
+    def next_id(self) -> str:
+        """Allocate a new, unused presentation ID."""
+        with self.pool.transaction() as conn:
+            return self._allocate_id(conn)
+
+    def version(self) -> int:
+        """Return the latest revision, which changes on every write."""
+        return self._counter(self.pool.connection(), "revision")
+
+    def changes(self, since: int) -> Optional[Tuple[int, List[str]]]:
+        """Return the current version and the IDs of records written after ``since``."""
+        conn = self.pool.connection()
+        version = self._counter(conn, "revision")
+        if version == since:
+            return version, []
+        rows = conn.execute("SELECT id FROM changes WHERE revision > ?", (since,))
+        return version, [presentation_id for (presentation_id,) in rows]
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return self._counter(self.pool.connection(), "presentations")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over records in insertion order, one page at a time."""
+        after = None
+        while True:
+            records, after = self.page(1000, after)
+            yield from records
+            if after is None:
+                return
+
+    def __contains__(self, presentation_id: object) -> bool:
+        """Return whether a record with the given ID exists."""
+        return self.pool.connection().execute(
+            "SELECT 1 FROM presentations WHERE id = ?", (presentation_id,)
+        ).fetchone() is not None
+
+    def _insert(self, conn: sqlite3.Connection, record: Dict[str, Any]) -> None:
+        record["revision"] = self._next_revision(conn, record["id"])
+        conn.execute(
+            "INSERT INTO presentations (author, status, template_id, slides_count, data, id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*self._columns(record), record["id"]),
+        )
+        suffix = record["id"][len(self._id_prefix):]
+        if record["id"].startswith(self._id_prefix) and suffix.isdigit():
+            conn.execute(
+                "UPDATE counters SET value = MAX(value, ?) WHERE name = 'next_number'",
+                (int(suffix) + 1,),
+            )
+
+    def _allocate_id(self, conn: sqlite3.Connection) -> str:
+        while True:
+            number = self._counter(conn, "next_number")
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'next_number'")
+            presentation_id = f"{self._id_prefix}{number:03d}"
+            if not self._exists(conn, presentation_id):
+                return presentation_id
+
+    @staticmethod
+    def _exists(conn: sqlite3.Connection, presentation_id: str) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM presentations WHERE id = ?", (presentation_id,)
+        ).fetchone() is not None
+
+    def _require(self, conn: sqlite3.Connection, presentation_id: str) -> Dict[str, Any]:
+        row = conn.execute(
+            "SELECT data FROM presentations WHERE id = ?", (presentation_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Presentation with ID {presentation_id} not found")
+        return json.loads(row[0])
+
+    @staticmethod
+    def _columns(record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            record.get("author"),
+            record.get("status"),
+            record.get("template_id"),
+            record.get("slides_count", 0),
+            json.dumps(record),
+        )
+
+    @staticmethod
+    def _where(
+        filters: Dict[str, Any], after: Optional[int] = None
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on non-indexed fields: {sorted(unknown)}")
+        clauses = []
+        params: List[Any] = []
+        for field, value in filters.items():
+            if value is None:
+                clauses.append(f"{field} IS NULL")
+            else:
+                clauses.append(f"{field} = ?")
+                params.append(value)
+        if after is not None:
+            clauses.append("seq > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    @staticmethod
+    def _next_revision(conn: sqlite3.Connection, presentation_id: str) -> int:
+        conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'revision'")
+        revision = SQLitePresentationStore._counter(conn, "revision")
+        conn.execute(
+            "INSERT OR REPLACE INTO changes (id, revision) VALUES (?, ?)",
+            (presentation_id, revision),
+        )
+        return revision
+
+    @staticmethod
+    def _counter(conn: sqlite3.Connection, name: str) -> int:
+        return conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
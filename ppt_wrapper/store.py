@@ -0,0 +1,349 @@
+"""Presentation storage backends for the PPT wrapper."""
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ppt_wrapper.records import PresentationRecord, PresentationRow
+
+INDEXED_FIELDS: Tuple[str, ...] = ("author", "status", "template_id")
+
+
+class PresentationStore(ABC):
+    """Interface for presentation storage backends used by ``PPTWrapper``.
+
+    Every write stamps the record's ``revision`` field with a store-wide,
+    strictly increasing number, so ``(id, revision)`` identifies one version
+    of a record and is never reused, even after a delete. Returned records
+    are read-only mappings; callers must not modify them.
+    """
+
+    # Whether calls block on I/O or locks and should run off the event loop.
+    blocking = False
+
+    def seed(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert initial records if the store is empty."""
+        if len(self) == 0:
+            for record in records:
+                self.add(record)
+
+    @abstractmethod
+    def add(self, record: Dict[str, Any]) -> Mapping[str, Any]:
+        """Insert a new record. The record must carry a unique ``id``."""
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert several records, allocating IDs for those whose ``id`` is ``None``.
+
+        A record that cannot be inserted does not stop the others. Returns
+        one entry per record: ``None`` on success, or the error message.
+        """
+        errors: List[Optional[str]] = []
+        for record in records:
+            try:
+                if record.get("id") is None:
+                    record["id"] = self.next_id()
+                self.add(record)
+            except ValueError as e:
+                errors.append(str(e))
+            else:
+                errors.append(None)
+        return errors
+
+    @abstractmethod
+    def get(self, presentation_id: str) -> Optional[Mapping[str, Any]]:
+        """Return the record with the given ID, or ``None``."""
+
+    @abstractmethod
+    def update(self, presentation_id: str, changes: Dict[str, Any]) -> Mapping[str, Any]:
+        """Apply top-level field changes to a record and return it."""
+
+    @abstractmethod
+    def delete(self, presentation_id: str) -> Mapping[str, Any]:
+        """Remove a record and return it."""
+
+    @abstractmethod
+    def find(self, **filters: Any) -> List[Mapping[str, Any]]:
+        """Return records matching all given indexed field values."""
+
+    @abstractmethod
+    def get_slides(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Return the generated slides attached to a record."""
+
+    @abstractmethod
+    def set_slides(self, presentation_id: str, slides: List[Dict[str, Any]]) -> None:
+        """Replace the generated slides attached to a record."""
+
+    @abstractmethod
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[Mapping[str, Any]], Optional[int]]:
+        """Return up to ``limit`` matching records positioned after ``after``.
+
+        Positions are opaque, monotonically increasing integers. The second
+        element of the result is the position to resume from, or ``None``
+        when no further matching records exist.
+        """
+
+    @abstractmethod
+    def count(self, field: str, value: Any) -> int:
+        """Return how many records have ``value`` in the indexed ``field``."""
+
+    @abstractmethod
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Return record counts for every value of the indexed ``field``."""
+
+    @abstractmethod
+    def total_slides(self) -> int:
+        """Return the sum of ``slides_count`` over all records."""
+
+    @abstractmethod
+    def next_id(self) -> str:
+        """Allocate a new, unused presentation ID."""
+
+    @abstractmethod
+    def version(self) -> int:
+        """Return the latest revision, which changes on every write."""
+
+    def changes(self, since: int) -> Optional[Tuple[int, List[str]]]:
+        """Return the current version and the IDs of records written after ``since``.
+
+        IDs of records deleted since then are included. Stores that only
+        the owning process writes keep no change log and return ``None``.
+        """
+        return None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        """Iterate over records in insertion order."""
+
+
+class InMemoryPresentationStore(PresentationStore):
+    """Compact in-memory store with a hash index on ``id`` and secondary indexes.
+
+    Every record is assigned a monotonically increasing sequence number.
+    Records are packed into slotted ``PresentationRow`` objects held in a
+    list by sequence number, with ``slides_count`` and ``revision`` in
+    numeric arrays alongside. Reads return immutable ``PresentationRecord``
+    views instead of copies; an update stores a new row, so earlier views
+    keep the version they were read at.
+
+    Secondary indexes map each value of an indexed field to a sorted array
+    of sequence numbers, so filtered listings only visit matching records
+    and keep insertion order. Index bucket sizes double as per-value
+    counters and a running ``slides_count`` total is kept, so aggregates
+    never scan.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Dict[str, Any]] = (),
+        id_prefix: str = "ppt_",
+    ):
+        """Initialize the store, optionally seeding it with records."""
+        self._id_prefix = id_prefix
+        self._seq_by_id: Dict[str, int] = {}
+        self._rows: List[Optional[PresentationRow]] = []
+        self._slides_counts = array("i")
+        self._revisions = array("Q")
+        self._order = array("q")
+        self._next_number = 1
+        self._revision = 0
+        self._total_slides = 0
+        self._slides: Dict[str, List[Dict[str, Any]]] = {}
+        self._indexes: Dict[str, Dict[Any, array]] = {field: {} for field in INDEXED_FIELDS}
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]) -> PresentationRecord:
+        """Insert a new record. The record must carry a unique ``id``."""
+        if record["id"] in self._seq_by_id:
+            raise ValueError(f"Presentation with ID {record['id']} already exists")
+        self._stamp(record)
+        return self._view(self._insert(record))
+
+    def get(self, presentation_id: str) -> Optional[PresentationRecord]:
+        """Return the record with the given ID, or ``None``."""
+        seq = self._seq_by_id.get(presentation_id)
+        return None if seq is None else self._view(seq)
+
+    def update(self, presentation_id: str, changes: Dict[str, Any]) -> PresentationRecord:
+        """Apply top-level field changes to a record and return it."""
+        seq = self._require(presentation_id)
+        if "id" in changes and changes["id"] != presentation_id:
+            raise ValueError("Presentation ID cannot be changed")
+        row = self._rows[seq]
+        for field in INDEXED_FIELDS:
+            if field in changes and changes[field] != row.field(field):
+                self._index_remove(field, row.field(field), seq)
+                self._index_add(field, changes[field], seq)
+        record = self._view(seq).to_dict()
+        record.update(changes)
+        if "slides_count" in changes:
+            self._total_slides += changes["slides_count"] - self._slides_counts[seq]
+            self._slides_counts[seq] = changes["slides_count"]
+        self._rows[seq] = PresentationRow(record)
+        self._stamp(record)
+        self._revisions[seq] = self._revision
+        return self._view(seq)
+
+    def delete(self, presentation_id: str) -> PresentationRecord:
+        """Remove a record and return it."""
+        seq = self._require(presentation_id)
+        record = self._view(seq)
+        del self._seq_by_id[presentation_id]
+        del self._order[bisect_left(self._order, seq)]
+        self._slides.pop(presentation_id, None)
+        for field in INDEXED_FIELDS:
+            self._index_remove(field, self._rows[seq].field(field), seq)
+        self._rows[seq] = None
+        self._total_slides -= self._slides_counts[seq]
+        self._revision += 1
+        return record
+
+    def find(self, **filters: Any) -> List[PresentationRecord]:
+        """Return records matching all given indexed field values.
+
+        The smallest matching index bucket drives the scan; any remaining
+        filters are checked against the candidate records only.
+        """
+        if not filters:
+            return list(self)
+        return self.page(len(self._seq_by_id), **filters)[0]
+
+    def get_slides(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Return the generated slides attached to a record."""
+        self._require(presentation_id)
+        return list(self._slides.get(presentation_id, ()))
+
+    def set_slides(self, presentation_id: str, slides: List[Dict[str, Any]]) -> None:
+        """Replace the generated slides attached to a record."""
+        self._require(presentation_id)
+        self._slides[presentation_id] = list(slides)
+
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[PresentationRecord], Optional[int]]:
+        """Return up to ``limit`` matching records positioned after ``after``.
+
+        The driving index bucket is entered by binary search on ``after``, so
+        only the requested page (plus non-matching candidates when filtering
+        on several fields) is visited.
+        """
+        driver, rest = self._plan(filters)
+        start = 0 if after is None else bisect_right(driver, after)
+        results: List[PresentationRecord] = []
+        last = None
+        for position in range(start, len(driver)):
+            seq = driver[position]
+            row = self._rows[seq]
+            if all(row.field(field) == value for field, value in rest):
+                if len(results) == limit:
+                    return results, last
+                results.append(self._view(seq))
+                last = seq
+        return results, None
+
+    def count(self, field: str, value: Any) -> int:
+        """Return how many records have ``value`` in the indexed ``field``."""
+        return len(self._indexes[field].get(value, ()))
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Return record counts for every value of the indexed ``field``."""
+        return {value: len(bucket) for value, bucket in self._indexes[field].items()}
+
+    def total_slides(self) -> int:
+        """Return the sum of ``slides_count`` over all records."""
+        return self._total_slides
+
+    def next_id(self) -> str:
+        """Allocate a new, unused presentation ID."""
+        while True:
+            presentation_id = f"{self._id_prefix}{self._next_number:03d}"
+            self._next_number += 1
+            if presentation_id not in self._seq_by_id:
+                return presentation_id
+
+    def version(self) -> int:
+        """Return the latest revision, which changes on every write."""
+        return self._revision
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return len(self._seq_by_id)
+
+    def __iter__(self) -> Iterator[PresentationRecord]:
+        """Iterate over records in insertion order."""
+        for seq in list(self._order):
+            if self._rows[seq] is not None:
+                yield self._view(seq)
+
+    def __contains__(self, presentation_id: object) -> bool:
+        """Return whether a record with the given ID exists."""
+        return presentation_id in self._seq_by_id
+
+    def _insert(self, record: Dict[str, Any]) -> int:
+        """Pack and index a record that already carries its ``revision``."""
+        seq = len(self._rows)
+        slides_count = record.get("slides_count", 0)
+        self._rows.append(PresentationRow(record))
+        self._slides_counts.append(slides_count)
+        self._revisions.append(record["revision"])
+        self._seq_by_id[record["id"]] = seq
+        self._order.append(seq)
+        for field in INDEXED_FIELDS:
+            self._index_add(field, record.get(field), seq)
+        self._total_slides += slides_count
+        self._reserve_number(record["id"])
+        return seq
+
+    def _view(self, seq: int) -> PresentationRecord:
+        return PresentationRecord(self._rows[seq], self._slides_counts[seq], self._revisions[seq])
+
+    def _require(self, presentation_id: str) -> int:
+        seq = self._seq_by_id.get(presentation_id)
+        if seq is None:
+            raise ValueError(f"Presentation with ID {presentation_id} not found")
+        return seq
+
+    def _plan(self, filters: Dict[str, Any]) -> Tuple[array, List[Tuple[str, Any]]]:
+        """Pick the smallest index bucket to drive a filtered scan."""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on non-indexed fields: {sorted(unknown)}")
+        if not filters:
+            return self._order, []
+        driver_field = min(filters, key=lambda f: self.count(f, filters[f]))
+        driver = self._indexes[driver_field].get(filters[driver_field], array("q"))
+        rest = [(f, v) for f, v in filters.items() if f != driver_field]
+        return driver, rest
+
+    def _index_add(self, field: str, value: Any, seq: int) -> None:
+        bucket = self._indexes[field].get(value)
+        if bucket is None:
+            bucket = self._indexes[field][value] = array("q")
+        if not bucket or bucket[-1] < seq:
+            bucket.append(seq)
+        else:
+            insort(bucket, seq)
+
+    def _index_remove(self, field: str, value: Any, seq: int) -> None:
+        index = self._indexes[field]
+        bucket = index[value]
+        del bucket[bisect_left(bucket, seq)]
+        if not bucket:
+            del index[value]
+
+    def _stamp(self, record: Dict[str, Any]) -> None:
+        self._revision += 1
+        record["revision"] = self._revision
+
+    def _reserve_number(self, presentation_id: str) -> None:
+        # Keep generated IDs ahead of any seeded "<prefix><number>" IDs.
+        suffix = presentation_id[len(self._id_prefix):]
+        if presentation_id.startswith(self._id_prefix) and suffix.isdigit():
+            self._next_number = max(self._next_number, int(suffix) + 1)
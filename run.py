@@ -1,33 +1,63 @@
 #!/usr/bin/env python3
 """
 Simple script to run the Gen AI Gateway application.
+
+By default the development server runs with ``--reload``. ``--production``
+runs without the reloader (which re-imports the app in a watcher process)
+and with ``--workers`` worker processes, each of which loads the
+presentation catalogue in the background after it starts listening.
 """
 
+import argparse
 import sys
 import subprocess
 from pathlib import Path
 
 
+def uvicorn_command(production: bool, workers: int, host: str, port: int):
+    """Return the uvicorn command line for the chosen mode."""
+    command = [
+        sys.executable, "-m", "uvicorn",
+        "gen_ai_gateway.apps.main:app",
+        "--host", host,
+        "--port", str(port),
+    ]
+    if production:
+        command += ["--workers", str(workers), "--no-access-log"]
+    else:
+        command.append("--reload")
+    return command
+
+
 def main():
     """Main function to run the application."""
+    parser = argparse.ArgumentParser(description="Run the Gen AI Gateway.")
+    parser.add_argument(
+        "--production", action="store_true", help="run without --reload"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="worker processes in production mode"
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
     project_root = Path(__file__).parent
     
-    print("🚀 Starting Gen AI Gateway...")
+    mode = "production" if args.production else "development"
+    print(f"🚀 Starting Gen AI Gateway ({mode})...")
     print(f"📁 Project root: {project_root}")
-    print("🌐 Server will be available at: http://localhost:8000")
-    print("📚 API docs will be available at: http://localhost:8000/docs")
-    print("📖 ReDoc will be available at: http://localhost:8000/redoc")
+    print(f"🌐 Server will be available at: http://localhost:{args.port}")
+    print(f"📚 API docs will be available at: http://localhost:{args.port}/docs")
+    print(f"📖 ReDoc will be available at: http://localhost:{args.port}/redoc")
     print("\n" + "="*50 + "\n")
     
     try:
         # Run the uvicorn server
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "gen_ai_gateway.apps.main:app",
-            "--reload",
-            "--host", "0.0.0.0",
-            "--port", "8000"
-        ], cwd=project_root, check=True)
+        subprocess.run(
+            uvicorn_command(args.production, args.workers, args.host, args.port),
+            cwd=project_root,
+            check=True,
+        )
     except KeyboardInterrupt:
         print("\n\n👋 Shutting down Gen AI Gateway...")
     except subprocess.CalledProcessError as e: